@@ -5,13 +5,16 @@ AIbase 消息源适配器
 
 import json
 import re
-from typing import List, Optional
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Tuple
 from bs4 import BeautifulSoup
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
 from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
 
 from adapters.base import BaseAdapter
 from core.models import Article, SourceType, ArticleStatus
+from utils.dates import parse_publication_date
 
 
 class AIBaseAdapter(BaseAdapter):
@@ -19,6 +22,9 @@ class AIBaseAdapter(BaseAdapter):
 
     BASE_URL = "https://www.aibase.com/zh/news/"
 
+    # 文章编号可能不连续（删除、下线），探测时最多向前跳过的编号数
+    MAX_NUMBER_GAP = 20
+
     def __init__(self):
         super().__init__(source_type=SourceType.AIBASE)
         self.extraction_schema = {
@@ -132,3 +138,105 @@ class AIBaseAdapter(BaseAdapter):
     async def validate_url(self, url: str) -> bool:
         """验证URL是否为AIbase链接"""
         return "aibase.com/zh/news/" in url
+
+    @staticmethod
+    def article_number(url: str) -> Optional[int]:
+        """从文章URL中解析编号"""
+        match = re.search(r'/zh/news/(\d+)', url or "")
+        return int(match.group(1)) if match else None
+
+    async def _fetch_number(self, number: int, fetched: Dict[int, Optional[Article]]) -> Optional[Article]:
+        """抓取指定编号的文章（结果缓存在 fetched 中，失败记为 None）"""
+        if number not in fetched:
+            try:
+                fetched[number] = await self.fetch_article(f"{self.BASE_URL}{number}")
+            except Exception as e:
+                print(f"    ⚠️ 抓取文章 {number} 失败: {e}")
+                fetched[number] = None
+        return fetched[number]
+
+    async def _probe(self, number: int, fetched: Dict[int, Optional[Article]]) -> Optional[Tuple[int, str]]:
+        """从编号 number 向前查找第一篇能解析出发布日期的文章，返回 (编号, 日期)"""
+        for candidate in range(number, max(number - self.MAX_NUMBER_GAP, 0), -1):
+            article = await self._fetch_number(candidate, fetched)
+            date = parse_publication_date(article.publication_date) if article else None
+            if date:
+                return candidate, date
+        return None
+
+    async def _first_number_on_or_after(self, date: str, low: int, high: int,
+                                        fetched: Dict[int, Optional[Article]]) -> int:
+        """
+        二分查找第一篇发布日期不早于 date 的文章编号（编号随发布时间递增）
+
+        在 [low, high] 内查找，high 为哨兵（表示不存在）
+        """
+        while low < high:
+            mid = (low + high) // 2
+            probed = await self._probe(mid, fetched)
+            if probed is None or probed[1] < date:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    async def discover_articles_by_date(
+        self,
+        start_date: str,
+        end_date: str,
+        watermarks: Optional[List[dict]] = None,
+        concurrency: int = 5
+    ) -> Dict[str, List[Article]]:
+        """
+        按发布日期发现历史文章
+
+        AIbase 的文章编号随发布时间递增：先用数据库中已有文章的编号和日期（水位线）确定搜索范围，
+        再二分查找日期区间对应的编号区间，最后并发抓取区间内的全部文章并按发布日期分组
+        """
+        latest_urls = await self.fetch_article_list(1)
+        latest = self.article_number(latest_urls[0]) if latest_urls else None
+        if not latest:
+            print("    ❌ 无法获取最新文章编号")
+            return {}
+
+        # 水位线：已知编号对应的发布日期
+        known: List[Tuple[int, str]] = []
+        for mark in watermarks or []:
+            number = self.article_number(mark.get("source_url"))
+            created_at = mark.get("created_at")
+            if isinstance(created_at, str):
+                created_at = datetime.fromisoformat(created_at)
+            date = parse_publication_date(mark.get("publication_date"), now=created_at)
+            if number and date and number <= latest:
+                known.append((number, date))
+
+        day_after_end = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+        def bounds(date: str, low: int) -> Tuple[int, int]:
+            before = [n for n, d in known if d < date]
+            after = [n for n, d in known if d >= date]
+            return max(before + [low - 1]) + 1, min(after + [latest + 1])
+
+        fetched: Dict[int, Optional[Article]] = {}
+        first = await self._first_number_on_or_after(start_date, *bounds(start_date, 1), fetched)
+        low, high = bounds(day_after_end, first)
+        last = await self._first_number_on_or_after(day_after_end, max(low, first), max(high, first), fetched) - 1
+        if last < first:
+            print(f"    ⚠️ {start_date} ~ {end_date} 没有找到文章")
+            return {}
+        print(f"    🔍 {start_date} ~ {end_date} 对应文章编号 {first} ~ {last}（二分探测 {len(fetched)} 次）")
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(number: int) -> Optional[Article]:
+            async with semaphore:
+                return await self._fetch_number(number, fetched)
+
+        articles = await asyncio.gather(*(fetch(number) for number in range(last, first - 1, -1)))
+
+        grouped: Dict[str, List[Article]] = {}
+        for article in articles:
+            date = parse_publication_date(article.publication_date) if article else None
+            if date and start_date <= date <= end_date:
+                grouped.setdefault(date, []).append(article)
+        return grouped
@@ -4,7 +4,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict
 from core.models import Article, SourceType
 
 
@@ -52,3 +52,24 @@ class BaseAdapter(ABC):
             bool: 是否有效
         """
         pass
+
+    async def discover_articles_by_date(
+        self,
+        start_date: str,
+        end_date: str,
+        watermarks: Optional[List[dict]] = None,
+        concurrency: int = 5
+    ) -> Dict[str, List[Article]]:
+        """
+        按发布日期发现并抓取历史文章（用于回填），不支持的消息源无需实现
+
+        Args:
+            start_date: 开始日期（YYYY-MM-DD，含）
+            end_date: 结束日期（YYYY-MM-DD，含）
+            watermarks: 数据库中已有文章的 {source_url, publication_date, created_at}，用于缩小搜索范围
+            concurrency: 最大并发抓取数
+
+        Returns:
+            Dict[str, List[Article]]: {日期: 当天发布的文章（按发布时间倒序）}
+        """
+        raise NotImplementedError(f"消息源 {self.source_type.value} 不支持按日期回填")
@@ -78,8 +78,10 @@ def create_app(config_name: str = None) -> Flask:
     # 注册蓝图
     from api.routes.news import news_bp
     from api.routes.health import health_bp
+    from api.routes.metrics import metrics_bp
 
     app.register_blueprint(news_bp, url_prefix='/api/v1')
+    app.register_blueprint(metrics_bp, url_prefix='/api/v1')
     app.register_blueprint(health_bp)
 
     # 对健康检查路由应用豁免
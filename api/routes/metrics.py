@@ -0,0 +1,111 @@
+"""
+监控指标路由
+"""
+from flask import Blueprint, request, jsonify
+import logging
+
+from api.middleware.error_handler import APIError
+from api.middleware.auth import require_api_key
+from repositories.news_repository import NewsRepository
+from services.llm_metrics import merge_usage, merge_provider_usage, percentile
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics/llm', methods=['GET'])
+@require_api_key
+def get_llm_metrics():
+    """
+    大模型调用统计：每份早报的 token 用量、费用、延迟分位数，以及合并后的延迟直方图
+
+    默认只统计早报生成（task_name=daily_briefing），传空的 task_name 返回全部任务的记录
+    """
+    try:
+        news_repo = NewsRepository()
+        limit = request.args.get('limit', 30, type=int)
+        task_name = request.args.get('task_name', 'daily_briefing')
+
+        # 限制范围
+        limit = min(max(1, limit), 365)
+
+        logs = news_repo.get_llm_usage_logs(task_name=task_name, limit=limit)
+
+        return jsonify({
+            "code": 200,
+            "message": "success",
+            "data": {
+                "task_name": task_name or None,
+                "briefings": logs,
+                "count": len(logs),
+                "aggregate": merge_usage(logs),
+                # 按提供商合并，便于发现某个提供商的延迟或错误率劣化
+                "providers": merge_provider_usage(logs)
+            }
+        })
+    except Exception as e:
+        logger.exception(f"Error getting LLM metrics: {e}")
+        raise APIError(f"服务器错误: {str(e)}", 500)
+
+
+def _phase_trends(logs: list) -> dict:
+    """
+    按阶段统计最近若干次运行的耗时趋势（logs 按时间倒序）
+
+    latest_ms 为最近一次的耗时，change 为其相对中位数的变化比例，便于发现某个阶段变慢
+    """
+    series = {}
+    for log in reversed(logs):
+        for name, stats in ((log.get("metrics") or {}).get("phases") or {}).items():
+            series.setdefault(name, []).append(stats.get("ms") or 0.0)
+
+    trends = {}
+    for name, values in series.items():
+        median = percentile(values, 50)
+        trends[name] = {
+            "runs": len(values),
+            "avg_ms": round(sum(values) / len(values), 1),
+            "p50_ms": round(median, 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "max_ms": round(max(values), 1),
+            "latest_ms": round(values[-1], 1),
+            "change": round(values[-1] / median - 1, 4) if median else None,
+            "history": [round(v, 1) for v in values]
+        }
+    return trends
+
+
+@metrics_bp.route('/metrics/tasks', methods=['GET'])
+@require_api_key
+def get_task_metrics():
+    """任务分阶段耗时：最近 N 次运行的各阶段耗时、计数与失败原因，以及按阶段的趋势"""
+    try:
+        news_repo = NewsRepository()
+        limit = request.args.get('limit', 30, type=int)
+        task_name = request.args.get('task_name', 'daily_briefing')
+
+        # 限制范围
+        limit = min(max(1, limit), 365)
+
+        logs = [log for log in news_repo.get_task_logs(task_name=task_name, limit=limit) if log.get("metrics")]
+        runs = [{
+            "id": log["id"],
+            "status": log["status"],
+            "start_time": log["start_time"],
+            "duration": log["duration"],
+            "metrics": log["metrics"]
+        } for log in logs]
+
+        return jsonify({
+            "code": 200,
+            "message": "success",
+            "data": {
+                "task_name": task_name,
+                "runs": runs,
+                "count": len(runs),
+                "phases": _phase_trends(logs)
+            }
+        })
+    except Exception as e:
+        logger.exception(f"Error getting task metrics: {e}")
+        raise APIError(f"服务器错误: {str(e)}", 500)
@@ -1,9 +1,11 @@
 """
 新闻API路由
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 import asyncio
+import json
 import logging
+import time
 from datetime import datetime
 
 from api.middleware.error_handler import NotFoundError, APIError
@@ -11,10 +13,10 @@ from api.middleware.auth import require_api_key
 from api.schemas.news_schemas import ApiResponse
 from services.news_service import NewsService
 from services.ai_summary_service import AISummaryService
-from repositories.news_repository import NewsRepository
+from repositories.news_repository import NewsRepository, BRIEFING_EXTRA_FIELDS
 from cache.cache_repository import CacheRepository
 from cache.redis_client import RedisClient
-from config.settings import get_settings, get_ai_settings
+from config.settings import get_settings
 from utils.validation import validate_date_format
 
 logger = logging.getLogger(__name__)
@@ -62,24 +64,35 @@ def _get_cache_repo():
     return _thread_local.cache_repo
 
 
+def _get_event_loop():
+    """获取或创建当前线程的事件循环"""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_closed():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """格式化一条 Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 def get_news_service():
     """获取新闻服务实例"""
     settings = get_settings()
 
-    # 获取 AI 配置
+    # 获取 AI 配置（支持多提供商池）
     try:
-        api_key, base_url, model = get_ai_settings()
+        ai_service = AISummaryService.from_settings(settings)
     except ValueError as e:
         logger.error(f"AI 配置错误: {e}")
         raise APIError(f"AI 配置错误: {str(e)}", 500)
 
-    ai_service = AISummaryService(
-        api_key=api_key,
-        base_url=base_url,
-        model=model,
-        max_concurrent=settings.AI_SUMMARY_CONCURRENT
-    )
-
     news_repo = None
     try:
         news_repo = NewsRepository()
@@ -179,6 +192,70 @@ def get_briefing_by_date(date: str):
         raise APIError(f"服务器错误: {str(e)}", 500)
 
 
+@news_bp.route('/briefing/<date>/summary/stream', methods=['GET'])
+@require_api_key
+def stream_daily_summary(date: str):
+    """
+    以 Server-Sent Events 推送每日总结（生成过程中边生成边推送）
+
+    事件类型：
+        delta  - 新增文本 {"text": "..."}
+        reset  - 文本被整体替换（如流式失败后重试）{"text": "完整文本"}
+        done   - 生成完成 {"text": "完整总结"}
+        failed - 生成失败
+        timeout - 等待超时
+    """
+    if not validate_date_format(date):
+        return jsonify({
+            "code": 400,
+            "message": "日期格式错误，应为 YYYY-MM-DD"
+        }), 400
+
+    cache_repo = _get_cache_repo()
+    loop = _get_event_loop()
+    timeout = request.args.get('timeout', 120, type=int)
+    timeout = min(max(1, timeout), 600)
+
+    state = loop.run_until_complete(cache_repo.get_summary_stream(date)) if cache_repo else None
+    if state is None:
+        # 没有进行中的生成：若早报已存在则直接返回完整总结
+        briefing = loop.run_until_complete(get_news_service().get_briefing_by_date(date))
+        if not briefing:
+            raise NotFoundError(f"暂无 {date} 的早报或正在生成的每日总结")
+        state = {"status": "done", "text": briefing.ai_summary or ""}
+
+    def generate(state):
+        sent = ""
+        deadline = time.monotonic() + timeout
+        while True:
+            text = state.get("text") or ""
+            if text.startswith(sent):
+                if len(text) > len(sent):
+                    yield _sse_event("delta", {"text": text[len(sent):]})
+            else:
+                yield _sse_event("reset", {"text": text})
+            sent = text
+
+            if state.get("status") in ("done", "failed"):
+                yield _sse_event(state["status"], {"text": text})
+                return
+            if time.monotonic() >= deadline:
+                yield _sse_event("timeout", {"text": text})
+                return
+
+            time.sleep(0.2)
+            state = loop.run_until_complete(cache_repo.get_summary_stream(date)) or state
+
+    return Response(
+        generate(state),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',  # 关闭 Nginx 缓冲
+        }
+    )
+
+
 @news_bp.route('/briefing/generate', methods=['POST'])
 @require_api_key
 def generate_briefing():
@@ -236,16 +313,36 @@ def generate_briefing():
 @news_bp.route('/briefing/list', methods=['GET'])
 @require_api_key
 def list_briefings():
-    """分页查询早报列表"""
+    """
+    分页查询早报列表
+
+    默认只返回 id/date/title/total_count/ai_summary，fields 可追加 article_ids/full_text/created_at；
+    翻页时传入上一页返回的 next_cursor（按日期定位），offset 仅为兼容保留
+    """
     try:
         news_repo = NewsRepository()
         limit = request.args.get('limit', 10, type=int)
         offset = request.args.get('offset', 0, type=int)
+        cursor = request.args.get('cursor') or None
+        fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
 
         # 限制范围
         limit = min(max(1, limit), 100)
+        offset = max(0, offset)
+
+        if cursor and not validate_date_format(cursor):
+            return jsonify({
+                "code": 400,
+                "message": "cursor 格式错误，应为 YYYY-MM-DD"
+            }), 400
+        unknown = [f for f in fields if f not in BRIEFING_EXTRA_FIELDS]
+        if unknown:
+            return jsonify({
+                "code": 400,
+                "message": f"不支持的字段: {', '.join(unknown)}（可选: {', '.join(BRIEFING_EXTRA_FIELDS)}）"
+            }), 400
 
-        briefings = news_repo.list_briefings(limit=limit, offset=offset)
+        briefings = news_repo.list_briefings(limit=limit, offset=offset, before=cursor, fields=fields)
 
         return jsonify({
             "code": 200,
@@ -254,9 +351,50 @@ def list_briefings():
                 "briefings": briefings,
                 "count": len(briefings),
                 "limit": limit,
-                "offset": offset
+                "offset": 0 if cursor else offset,
+                # 不足一页说明已到最后一页
+                "next_cursor": briefings[-1]["date"] if len(briefings) == limit else None
             }
         })
     except Exception as e:
         logger.exception(f"Error listing briefings: {e}")
         raise APIError(f"服务器错误: {str(e)}", 500)
+
+
+@news_bp.route('/articles/search', methods=['GET'])
+@require_api_key
+def search_articles():
+    """全文检索历史文章（标题、总结、正文，支持中文），按相关度排序"""
+    try:
+        query = (request.args.get('q') or '').strip()
+        limit = request.args.get('limit', 20, type=int)
+        offset = request.args.get('offset', 0, type=int)
+
+        if not query:
+            return jsonify({
+                "code": 400,
+                "message": "缺少检索词 q"
+            }), 400
+
+        # 限制范围
+        limit = min(max(1, limit), 100)
+        offset = max(0, offset)
+
+        start = time.perf_counter()
+        articles = NewsRepository().search_articles(query, limit=limit, offset=offset)
+
+        return jsonify({
+            "code": 200,
+            "message": "success",
+            "data": {
+                "query": query,
+                "articles": articles,
+                "count": len(articles),
+                "limit": limit,
+                "offset": offset,
+                "took_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
+        })
+    except Exception as e:
+        logger.exception(f"Error searching articles: {e}")
+        raise APIError(f"服务器错误: {str(e)}", 500)
@@ -18,9 +18,21 @@ class CacheKeys:
     # 最新早报缓存（15分钟）
     LATEST_BRIEFING = "morning_news:latest"  # TTL: 900
 
+    # 每日总结流式生成进度（边生成边发布，24小时）
+    DAILY_SUMMARY_STREAM = "morning_news:daily_summary:stream:{date}"  # TTL: 86400
+
+    # 每日总结增量状态（各文章的贡献指纹 + 上次总结，24小时）
+    DAILY_SUMMARY_STATE = "morning_news:daily_summary:state:{date}"  # TTL: 86400
+
     # 任务锁（防止重复执行）
     TASK_LOCK = "morning_news:lock:task:{task_name}:{date}"  # TTL: 3600
 
+    # 文章总结结果（按内容哈希，7天）
+    SUMMARY = "morning_news:summary:{key}"  # TTL: 604800
+
+    # 文章总结 single-flight 锁（防止相同内容并发重复总结）
+    SUMMARY_LOCK = "morning_news:lock:summary:{key}"  # TTL: 300
+
     # API限流
     RATE_LIMIT = "morning_news:rate_limit:{user_id}:{endpoint}"  # TTL: 60
 
@@ -39,11 +51,31 @@ class CacheKeys:
         """获取文章列表缓存键"""
         return CacheKeys.ARTICLE_LIST.format(date=date)
 
+    @staticmethod
+    def daily_summary_stream(date: str) -> str:
+        """获取每日总结流式生成进度缓存键"""
+        return CacheKeys.DAILY_SUMMARY_STREAM.format(date=date)
+
+    @staticmethod
+    def daily_summary_state(date: str) -> str:
+        """获取每日总结增量状态缓存键"""
+        return CacheKeys.DAILY_SUMMARY_STATE.format(date=date)
+
     @staticmethod
     def task_lock(task_name: str, date: str) -> str:
         """获取任务锁缓存键"""
         return CacheKeys.TASK_LOCK.format(task_name=task_name, date=date)
 
+    @staticmethod
+    def summary(key: str) -> str:
+        """获取文章总结缓存键"""
+        return CacheKeys.SUMMARY.format(key=key)
+
+    @staticmethod
+    def summary_lock(key: str) -> str:
+        """获取文章总结锁缓存键"""
+        return CacheKeys.SUMMARY_LOCK.format(key=key)
+
     @staticmethod
     def rate_limit(user_id: str, endpoint: str) -> str:
         """获取限流缓存键"""
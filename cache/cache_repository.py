@@ -10,7 +10,9 @@ from core.constants import (
     CACHE_TTL_DAILY_BRIEFING,
     CACHE_TTL_ARTICLE,
     CACHE_TTL_LATEST,
-    CACHE_TTL_TASK_LOCK
+    CACHE_TTL_TASK_LOCK,
+    CACHE_TTL_SUMMARY,
+    CACHE_TTL_SUMMARY_LOCK
 )
 
 
@@ -58,6 +60,26 @@ class CacheRepository:
         """设置最新早报缓存"""
         await self.redis.set_json(CacheKeys.LATEST_BRIEFING, data, ex=CACHE_TTL_LATEST)
 
+    async def get_summary_stream(self, date: str) -> Optional[dict]:
+        """获取每日总结流式生成进度 {"status": streaming/done/failed, "text": 已生成文本}"""
+        key = CacheKeys.daily_summary_stream(date)
+        return await self.redis.get_json(key)
+
+    async def set_summary_stream(self, date: str, status: str, text: str = ""):
+        """写入每日总结流式生成进度"""
+        key = CacheKeys.daily_summary_stream(date)
+        await self.redis.set_json(key, {"status": status, "text": text}, ex=CACHE_TTL_DAILY_BRIEFING)
+
+    async def get_daily_summary_state(self, date: str) -> Optional[dict]:
+        """获取每日总结增量状态 {"items": [{"key", "title", "summary"}], "summary": 上次总结}"""
+        key = CacheKeys.daily_summary_state(date)
+        return await self.redis.get_json(key)
+
+    async def set_daily_summary_state(self, date: str, state: dict):
+        """写入每日总结增量状态"""
+        key = CacheKeys.daily_summary_state(date)
+        await self.redis.set_json(key, state, ex=CACHE_TTL_DAILY_BRIEFING)
+
     async def acquire_task_lock(self, task_name: str, date: str) -> bool:
         """获取任务锁"""
         key = CacheKeys.task_lock(task_name, date)
@@ -68,6 +90,26 @@ class CacheRepository:
         key = CacheKeys.task_lock(task_name, date)
         await self.redis.release_lock(key)
 
+    async def get_summary(self, key: str) -> Optional[str]:
+        """获取文章总结缓存（按内容哈希）"""
+        return await self.redis.get(CacheKeys.summary(key))
+
+    async def set_summary(self, key: str, summary: str):
+        """设置文章总结缓存（按内容哈希）"""
+        await self.redis.set(CacheKeys.summary(key), summary, ex=CACHE_TTL_SUMMARY)
+
+    async def acquire_summary_lock(self, key: str, timeout: int = CACHE_TTL_SUMMARY_LOCK) -> bool:
+        """获取文章总结锁"""
+        return await self.redis.acquire_lock(CacheKeys.summary_lock(key), timeout=timeout)
+
+    async def release_summary_lock(self, key: str):
+        """释放文章总结锁"""
+        await self.redis.release_lock(CacheKeys.summary_lock(key))
+
+    async def summary_lock_exists(self, key: str) -> bool:
+        """检查文章总结锁是否存在"""
+        return await self.redis.exists(CacheKeys.summary_lock(key))
+
     async def delete_daily_briefing(self, date: str):
         """删除早报缓存"""
         key = CacheKeys.daily_briefing(date)
@@ -1,6 +1,10 @@
 """
 Celery 配置
 """
+import json
+from datetime import timedelta
+from typing import Dict, Any
+
 from celery import Celery
 from celery.schedules import crontab
 from config.settings import get_settings
@@ -36,43 +40,187 @@ class CeleryConfig:
     # 任务路由
     task_routes = {
         'tasks.daily_generation.generate_daily_briefing_task': {'queue': 'briefing'},
+        'tasks.bulk_summarization.bulk_summarize_articles_task': {'queue': 'bulk'},
+        'tasks.bulk_summarization.poll_bulk_summary_task': {'queue': 'bulk'},
+        'tasks.backfill.backfill_briefings_task': {'queue': 'bulk'},
+        'tasks.ingestion.ingest_articles_task': {'queue': 'crawl'},
+        # 发布任务链：持久化、写缓存、推送使用独立队列，慢速推送目标不占用生成任务的 Worker
+        'tasks.publishing.persist_briefing_task': {'queue': 'persist'},
+        'tasks.publishing.warm_briefing_cache_task': {'queue': 'cache'},
+        'tasks.publishing.push_briefing_task': {'queue': 'push'},
+        'tasks.publishing.push_channel_task': {'queue': 'push'},
+        # 分布式模式：抓取与总结使用独立队列，可分别扩容 Worker
+        'tasks.distributed_generation.generate_daily_briefing_distributed_task': {'queue': 'briefing'},
+        'tasks.distributed_generation.dispatch_articles_task': {'queue': 'briefing'},
+        'tasks.distributed_generation.assemble_briefing_task': {'queue': 'briefing'},
+        'tasks.distributed_generation.list_source_articles_task': {'queue': 'crawl'},
+        'tasks.distributed_generation.fetch_article_task': {'queue': 'crawl'},
+        'tasks.distributed_generation.summarize_article_task': {'queue': 'summarize'},
     }
 
 
-def get_beat_schedule():
-    """根据配置生成定时任务调度表"""
-    settings = get_settings()
+# 调度表中各类条目对应的任务、默认队列和默认过期时间（秒）
+SCHEDULE_ENTRY_TYPES = {
+    'ingest': {'task': 'tasks.ingestion.ingest_articles_task', 'queue': 'crawl', 'expires': None},
+    'briefing': {'task': 'tasks.daily_generation.generate_daily_briefing_task', 'queue': 'briefing', 'expires': 3600},
+    'push': {'task': 'tasks.publishing.push_channel_task', 'queue': 'push', 'expires': 3600},
+}
 
-    if not settings.SCHEDULE_CRONTAB:
-        return {}  # 未配置定时任务
 
-    # 解析 crontab 表达式: "分 时 日 月 周"
-    # 例如: "0 8 * * *" = 每天 8:00
-    parts = settings.SCHEDULE_CRONTAB.strip().split()
+def parse_crontab(expression: str) -> crontab:
+    """
+    解析 crontab 表达式: "分 时 日 月 周"
+    例如: "0 8 * * *" = 每天 8:00
 
+    Raises:
+        ValueError: 格式错误
+    """
+    parts = expression.strip().split()
     if len(parts) != 5:
-        print(f"警告: SCHEDULE_CRONTAB 格式错误: {settings.SCHEDULE_CRONTAB}")
-        print("正确格式: \"分 时 日 月 周\"，例如: \"0 8 * * *\"")
-        return {}
+        raise ValueError(f"crontab 格式错误: {expression}（正确格式: \"分 时 日 月 周\"，例如: \"0 8 * * *\"）")
 
     minute, hour, day, month, day_of_week = parts
+    return crontab(
+        minute=minute,
+        hour=hour,
+        day_of_month=day,
+        month_of_year=month,
+        day_of_week=day_of_week
+    )
 
-    return {
-        'generate-daily-briefing': {
-            'task': 'tasks.daily_generation.generate_daily_briefing_task',
-            'schedule': crontab(
-                minute=minute,
-                hour=hour,
-                day_of_month=day,
-                month_of_year=month,
-                day_of_week=day_of_week
-            ),
+
+def _briefing_task(settings) -> str:
+    """定时生成早报使用的任务"""
+    # 分布式模式下由多个 Worker 并行抓取和总结（持续采集模式下文章已处理完毕，只需挑选排序）
+    if settings.BRIEFING_DISTRIBUTED and not settings.INGESTION_ENABLED:
+        return 'tasks.distributed_generation.generate_daily_briefing_distributed_task'
+    return 'tasks.daily_generation.generate_daily_briefing_task'
+
+
+def _positive_number(value) -> bool:
+    """是否为正数（JSON 中的 true/false 不算）"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def parse_schedule_table(settings) -> Dict[str, Dict[str, Any]]:
+    """
+    解析 SCHEDULE_TABLE（JSON 数组），每项为一个独立的调度条目：
+
+    - ingest：按消息源轮询，sources/limit 传给采集任务，变化快的消息源可以单独配置更短的间隔
+    - briefing：生成早报
+    - push：把当天的早报推送到 webhook_url（每个推送渠道可以有自己的发布时间）
+
+    每项用 crontab（"分 时 日 月 周"）或 interval（秒）指定时间，可选 queue、expires（秒）覆盖默认值
+
+    Raises:
+        ValueError: 配置格式错误
+    """
+    try:
+        entries = json.loads(settings.SCHEDULE_TABLE)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"SCHEDULE_TABLE 不是合法的 JSON: {e}")
+    if not isinstance(entries, list):
+        raise ValueError("SCHEDULE_TABLE 必须是 JSON 数组")
+
+    schedule = {}
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"第 {i + 1} 项必须是 JSON 对象: {entry!r}")
+        entry_type = entry.get('type')
+        if entry_type not in SCHEDULE_ENTRY_TYPES:
+            raise ValueError(f"第 {i + 1} 项的 type 必须是 {'/'.join(SCHEDULE_ENTRY_TYPES)} 之一: {entry_type}")
+        defaults = SCHEDULE_ENTRY_TYPES[entry_type]
+        name = entry.get('name') or f"{entry_type}-{i + 1}"
+        if name in schedule:
+            raise ValueError(f"调度条目名称重复: {name}")
+
+        if entry.get('crontab'):
+            if not isinstance(entry['crontab'], str):
+                raise ValueError(f"调度条目 {name} 的 crontab 必须是字符串: {entry['crontab']!r}")
+            when = parse_crontab(entry['crontab'])
+        elif entry.get('interval') is not None:
+            if not _positive_number(entry['interval']):
+                raise ValueError(f"调度条目 {name} 的 interval 必须是正数（秒）: {entry['interval']!r}")
+            when = timedelta(seconds=entry['interval'])
+        else:
+            raise ValueError(f"调度条目 {name} 需要配置 crontab 或 interval")
+        if entry.get('expires') is not None and not _positive_number(entry['expires']):
+            raise ValueError(f"调度条目 {name} 的 expires 必须是正数（秒）: {entry['expires']!r}")
+
+        kwargs = {}
+        if entry_type == 'ingest':
+            task = defaults['task']
+            sources = entry.get('sources')
+            if sources is not None and not (isinstance(sources, list) and all(isinstance(x, str) for x in sources)):
+                raise ValueError(f"采集条目 {name} 的 sources 必须是字符串数组: {sources!r}")
+            limit = entry.get('limit')
+            if limit is not None and not (isinstance(limit, int) and not isinstance(limit, bool) and limit > 0):
+                raise ValueError(f"采集条目 {name} 的 limit 必须是正整数: {limit!r}")
+            kwargs = {key: entry[key] for key in ('sources', 'limit') if entry.get(key)}
+        elif entry_type == 'briefing':
+            task = _briefing_task(settings)
+        else:
+            if not entry.get('webhook_url'):
+                raise ValueError(f"推送条目 {name} 需要配置 webhook_url")
+            task = defaults['task']
+            kwargs = {'webhook_url': entry['webhook_url']}
+
+        # 轮询默认以间隔作为过期时间：积压的轮询直接丢弃，由下一轮补上
+        expires = entry.get('expires', defaults['expires'] or entry.get('interval'))
+        options = {'queue': entry.get('queue', defaults['queue'])}
+        if expires:
+            options['expires'] = expires
+
+        schedule[name] = {'task': task, 'schedule': when, 'kwargs': kwargs, 'options': options}
+    return schedule
+
+
+def get_beat_schedule():
+    """
+    根据配置生成定时任务调度表
+
+    配置了 SCHEDULE_TABLE 时使用调度表，否则由 INGESTION_INTERVAL 和 SCHEDULE_CRONTAB 生成默认调度；
+    调度表配置错误时退回默认调度（不因一处笔误停掉包括定时生成早报在内的全部调度）
+    """
+    settings = get_settings()
+
+    if settings.SCHEDULE_TABLE:
+        try:
+            return parse_schedule_table(settings)
+        except ValueError as e:
+            print(f"❌ SCHEDULE_TABLE 配置错误，改用 SCHEDULE_CRONTAB / INGESTION_INTERVAL 生成的默认调度: {e}")
+
+    schedule = {}
+
+    # 持续采集：全天按固定间隔轮询消息源
+    if settings.INGESTION_ENABLED:
+        schedule['ingest-articles'] = {
+            'task': 'tasks.ingestion.ingest_articles_task',
+            'schedule': timedelta(seconds=settings.INGESTION_INTERVAL),
             'options': {
-                'queue': 'briefing',  # 明确指定队列
-                'expires': 3600  # 任务1小时后过期
+                'queue': 'crawl',
+                'expires': settings.INGESTION_INTERVAL  # 积压的轮询直接丢弃，由下一轮补上
             }
         }
+
+    if not settings.SCHEDULE_CRONTAB:
+        return schedule  # 未配置定时生成早报
+
+    try:
+        when = parse_crontab(settings.SCHEDULE_CRONTAB)
+    except ValueError as e:
+        print(f"警告: SCHEDULE_CRONTAB {e}")
+        return schedule
+
+    schedule['generate-daily-briefing'] = {
+        'task': _briefing_task(settings),
+        'schedule': when,
+        'options': {
+            'queue': 'briefing',  # 明确指定队列
+            'expires': 3600  # 任务1小时后过期
+        }
     }
+    return schedule
 
 
 def create_celery(app=None):
@@ -4,7 +4,8 @@
 """
 
 import os
-from typing import Optional
+import json
+from typing import Optional, List, Dict, Any
 from pydantic_settings import BaseSettings
 
 
@@ -25,6 +26,59 @@ def get_ai_config(settings: 'Settings') -> tuple[str, str, str]:
     )
 
 
+def get_ai_providers_config(settings: 'Settings') -> List[Dict[str, Any]]:
+    """
+    获取大模型提供商池配置
+
+    优先使用 AI_PROVIDERS（JSON 数组），未配置时退化为 AI_API_KEY / AI_BASE_URL / AI_MODEL 单提供商
+
+    Returns:
+        提供商配置列表，每项包含 name/api_key/base_url/model/weight/max_concurrent
+
+    Raises:
+        ValueError: 未配置任何提供商或配置格式错误
+    """
+    if settings.AI_PROVIDERS:
+        try:
+            providers = json.loads(settings.AI_PROVIDERS)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"AI_PROVIDERS 不是合法的 JSON: {e}")
+        if not isinstance(providers, list) or not providers:
+            raise ValueError("AI_PROVIDERS 必须是非空的 JSON 数组")
+
+        configs = []
+        for i, provider in enumerate(providers):
+            if not isinstance(provider, dict):
+                raise ValueError(f"AI_PROVIDERS 第 {i + 1} 项必须是 JSON 对象")
+            config = dict(provider)
+            config.setdefault("name", f"provider-{i + 1}")
+            config.setdefault("api_key", settings.AI_API_KEY)
+            config.setdefault("base_url", settings.AI_BASE_URL)
+            config.setdefault("model", settings.AI_MODEL)
+            config.setdefault("weight", 1.0)
+            config.setdefault("max_concurrent", settings.AI_SUMMARY_CONCURRENT)
+            config.setdefault("max_concurrent_limit", settings.AI_SUMMARY_MAX_CONCURRENT)
+            config.setdefault("input_price", settings.AI_INPUT_PRICE)
+            config.setdefault("output_price", settings.AI_OUTPUT_PRICE)
+            if not config["api_key"]:
+                raise ValueError(f"提供商 {config['name']} 未配置 api_key")
+            configs.append(config)
+        return configs
+
+    api_key, base_url, model = get_ai_config(settings)
+    return [{
+        "name": "default",
+        "api_key": api_key,
+        "base_url": base_url,
+        "model": model,
+        "weight": 1.0,
+        "max_concurrent": settings.AI_SUMMARY_CONCURRENT,
+        "max_concurrent_limit": settings.AI_SUMMARY_MAX_CONCURRENT,
+        "input_price": settings.AI_INPUT_PRICE,
+        "output_price": settings.AI_OUTPUT_PRICE,
+    }]
+
+
 class Settings(BaseSettings):
     """应用配置"""
 
@@ -43,6 +97,9 @@ class Settings(BaseSettings):
 
     # 数据库配置
     DATABASE_URL: Optional[str] = None
+    # 异步数据访问：生成早报的异步流程改用 SQLAlchemy asyncio，等待数据库时不阻塞事件循环
+    DATABASE_ASYNC: bool = False
+    DATABASE_ASYNC_URL: Optional[str] = None  # 异步连接地址（默认由 DATABASE_URL 推导，如 mysql+aiomysql://）
 
     # Redis 配置
     REDIS_HOST: str = "localhost"
@@ -51,10 +108,19 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
 
     # AI 大模型配置（支持 OpenAI 格式）
-    AI_API_KEY: str  # API 密钥（必填）
+    AI_API_KEY: Optional[str] = None  # API 密钥（未配置 AI_PROVIDERS 时必填）
     AI_BASE_URL: str = "https://api.openai.com/v1"  # API 基础 URL
     AI_MODEL: str = "gpt-3.5-turbo"  # 模型名称
 
+    # 多提供商池（JSON 数组，配置后优先于上面的单提供商配置），例如：
+    # [{"name": "deepseek", "api_key": "sk-xxx", "base_url": "https://api.deepseek.com/v1",
+    #   "model": "deepseek-chat", "weight": 2, "max_concurrent": 10}, ...]
+    AI_PROVIDERS: Optional[str] = None
+
+    # 模型单价（每百万 token，用于统计每份早报的费用；AI_PROVIDERS 中可用 input_price/output_price 单独配置）
+    AI_INPUT_PRICE: float = 0.0
+    AI_OUTPUT_PRICE: float = 0.0
+
     # Celery 配置
     CELERY_BROKER_URL: Optional[str] = None
     CELERY_RESULT_BACKEND: Optional[str] = None
@@ -65,7 +131,54 @@ class Settings(BaseSettings):
     CRAWLER_DELAY: float = 1.0
 
     # AI 总结并发数
-    AI_SUMMARY_CONCURRENT: int = 10  # 同时请求AI的数量
+    AI_SUMMARY_CONCURRENT: int = 10  # 同时请求AI的数量（初始值，运行时按 AIMD 自适应调整）
+    AI_SUMMARY_MAX_CONCURRENT: int = 40  # 自适应并发上限
+    AI_MAX_RETRIES: int = 3  # 429/超时/5xx 时的最大重试次数
+    AI_REQUEST_TIMEOUT: float = 60.0  # 单次AI请求超时（秒）
+
+    # 请求对冲：请求超过近期延迟分位数仍未返回时，向备用提供商发出副本，取先返回者
+    AI_HEDGE_ENABLED: bool = False  # 是否启用对冲
+    AI_HEDGE_PERCENTILE: float = 95.0  # 触发对冲的延迟分位数
+    AI_HEDGE_BUDGET: float = 0.1  # 对冲预算（对冲请求最多占总请求数的比例）
+
+    # 本地抽取式摘要（无需网络，毫秒级）
+    AI_EXTRACTIVE_FALLBACK: bool = True  # 大模型失败或超过截止时间时使用本地摘要兜底
+    AI_SUMMARY_MAX_INPUT_TOKENS: int = 4000  # 超过该长度的文章先抽取压缩再送入大模型（0 表示不压缩）
+    AI_SUMMARY_DEADLINE: float = 0  # 批量总结截止时间（秒），超时的文章使用本地摘要（0 表示不限制）
+
+    # 离线批量总结（OpenAI Batch API 格式，用于历史回填、修改提示词后重新总结）
+    AI_BATCH_BACKEND: str = "openai"  # openai（Batch API）/ local（本地逐条调用普通接口）
+    AI_BATCH_BASE_URL: Optional[str] = None  # Batch API 地址（默认同 AI_BASE_URL）
+    AI_BATCH_API_KEY: Optional[str] = None  # Batch API 密钥（默认同 AI_API_KEY）
+    AI_BATCH_MODEL: Optional[str] = None  # 批处理使用的模型（默认同 AI_MODEL）
+    AI_BATCH_COMPLETION_WINDOW: str = "24h"  # 批处理完成时间窗口
+    AI_BATCH_POLL_INTERVAL: int = 60  # 轮询间隔（秒）
+    AI_BATCH_MAX_WAIT: int = 86400  # 最长等待时间（秒），超时后取消任务
+    AI_BATCH_WORK_DIR: str = "data/batches"  # JSONL 文件目录
+
+    # 分布式生成：按消息源和文章拆分为 Celery group/chord，由多个 Worker 并行抓取和总结（需要数据库）
+    BRIEFING_DISTRIBUTED: bool = False
+
+    # 早报生成断点恢复（Worker 崩溃后从检查点继续，不重新抓取已保存的文章）
+    BRIEFING_RESUME_STALE_SECONDS: int = 300  # 检查点超过该时间未更新视为执行者已崩溃
+    BRIEFING_RESUME_MAX_ATTEMPTS: int = 3  # 同一天的早报最多自动执行次数
+
+    # 历史早报回填（按发布日期发现历史文章，补生成缺少的早报）
+    BACKFILL_MAX_CONCURRENT_DATES: int = 2  # 同时生成早报的日期数
+    BACKFILL_FETCH_CONCURRENCY: int = 5  # 发现历史文章时的最大并发抓取数
+    BACKFILL_MAX_DAYS: int = 31  # 单次回填最多覆盖的天数
+
+    # 持续采集：全天轮询消息源，新文章到达后立即抓取和总结；定时任务只挑选排序已处理的文章并生成整体总结
+    INGESTION_ENABLED: bool = False
+    INGESTION_INTERVAL: int = 600  # 轮询间隔（秒）
+    INGESTION_MAX_ARTICLES: int = 30  # 每次轮询检查的最新文章数
+    INGESTION_FETCH_CONCURRENCY: int = 5  # 最大并发抓取数
+    INGESTION_MAX_SUMMARY_ATTEMPTS: int = 3  # 总结失败的文章最多重新总结的次数，超过后不再重试
+    INGESTION_WINDOW_HOURS: float = 24.0  # 生成早报时从最近多少小时内的文章中挑选
+    INGESTION_RANK_HALF_LIFE_HOURS: float = 12.0  # 排序时的时间衰减半衰期（小时）
+
+    # 每日总结增量生成：文章未变化时复用上次总结，少量变化时只发送增量
+    DAILY_SUMMARY_DELTA_MAX_CHANGES: int = 3  # 新增+移除的文章数不超过该值时使用增量提示词（0 表示总是全量重新生成）
 
     # 速率限制配置
     RATE_LIMIT_ENABLED: bool = True  # 是否启用速率限制
@@ -74,6 +187,13 @@ class Settings(BaseSettings):
     # 定时任务配置（crontab 表达式）
     SCHEDULE_CRONTAB: str = "0 8 * * *"  # 每天 8:00 (分 时 日 月 周)
 
+    # 调度表（JSON 数组，配置后替代 SCHEDULE_CRONTAB 和 INGESTION_INTERVAL 生成的默认调度），例如：
+    # [{"name": "poll-aibase", "type": "ingest", "sources": ["aibase"], "interval": 300},
+    #  {"name": "briefing", "type": "briefing", "crontab": "0 8 * * *"},
+    #  {"name": "push-team", "type": "push", "crontab": "30 9 * * 1-5", "webhook_url": "https://..."}]
+    # 每项可选 queue、expires（秒）覆盖默认的队列和过期时间
+    SCHEDULE_TABLE: Optional[str] = None
+
     # Webhook 推送配置
     WEBHOOK_URL: Optional[str] = None  # 推送地址，多个用逗号、分号或空格分隔
     WEBHOOK_ENABLED: bool = True  # 是否启用 Webhook 推送
@@ -108,3 +228,14 @@ def get_ai_settings() -> tuple[str, str, str]:
     """
     settings = get_settings()
     return get_ai_config(settings)
+
+
+def get_ai_providers() -> List[Dict[str, Any]]:
+    """
+    获取大模型提供商池配置的便捷函数
+
+    Raises:
+        ValueError: 如果未配置任何提供商
+    """
+    settings = get_settings()
+    return get_ai_providers_config(settings)
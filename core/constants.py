@@ -30,3 +30,5 @@ CACHE_TTL_DAILY_BRIEFING = 86400  # 24小时
 CACHE_TTL_ARTICLE = 604800  # 7天
 CACHE_TTL_LATEST = 900  # 15分钟
 CACHE_TTL_TASK_LOCK = 3600  # 1小时
+CACHE_TTL_SUMMARY = 604800  # 7天
+CACHE_TTL_SUMMARY_LOCK = 300  # 5分钟
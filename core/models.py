@@ -25,6 +25,15 @@ class ArticleStatus(str, Enum):
     FAILED = "failed"
 
 
+class BriefingStage(str, Enum):
+    """早报生成阶段（检查点）"""
+    CRAWLING = "crawling"
+    SUMMARIZING = "summarizing"
+    DAILY_SUMMARY = "daily_summary"
+    SAVING = "saving"
+    COMPLETED = "completed"
+
+
 class Article(BaseModel):
     """文章数据模型"""
     id: Optional[str] = None
@@ -38,6 +47,7 @@ class Article(BaseModel):
     status: ArticleStatus = ArticleStatus.PENDING
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: Optional[datetime] = None
+    rank_score: Optional[float] = None  # 早报排序分数（持续采集模式下挑选文章时计算）
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
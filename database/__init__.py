@@ -3,13 +3,21 @@
 """
 
 from .base import init_db, get_db_session, get_db_manager, DBSessionManager
-from .models import Base, ArticleDB, DailyBriefingDB, TaskLog
+from .models import (
+    Base, ArticleDB, DailyBriefingDB, BriefingArticle, BriefingCheckpoint, TaskLog, LLMUsageLog, SchemaMigration
+)
+from .migrations import run_migrations
 
 __all__ = [
     "Base",
     "ArticleDB",
     "DailyBriefingDB",
+    "BriefingArticle",
+    "BriefingCheckpoint",
     "TaskLog",
+    "LLMUsageLog",
+    "SchemaMigration",
+    "run_migrations",
     "init_db",
     "get_db_session",
     "get_db_manager",
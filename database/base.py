@@ -1,12 +1,14 @@
 """
 数据库连接管理
 """
-from contextlib import contextmanager
-from typing import Generator, Optional
+from contextlib import contextmanager, asynccontextmanager
+from typing import Generator, AsyncGenerator, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
 from config.settings import get_settings
 from database.models import Base
+from database.migrations import run_migrations
 
 
 class DBSessionManager:
@@ -74,9 +76,10 @@ def get_db_manager() -> DBSessionManager:
 
 
 def init_db():
-    """初始化数据库"""
+    """初始化数据库（创建缺少的表并执行尚未执行过的迁移）"""
     db_manager = get_db_manager()
     db_manager.init_tables()
+    return run_migrations(db_manager.engine)
 
 
 def drop_db():
@@ -97,3 +100,76 @@ def session_scope() -> Generator[Session, None, None]:
     db_manager = get_db_manager()
     with db_manager.get_session() as session:
         yield session
+
+
+# 同步驱动对应的异步驱动（DATABASE_ASYNC 启用时由 DATABASE_URL 推导异步连接地址）
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """把同步连接地址转换为异步驱动的地址，如 mysql+pymysql:// → mysql+aiomysql://"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"不支持异步访问的数据库: {backend}，请配置 DATABASE_ASYNC_URL")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+class AsyncDBSessionManager:
+    """异步数据库会话管理器（SQLAlchemy asyncio，连接绑定在创建它的事件循环上）"""
+
+    def __init__(self, database_url: Optional[str] = None):
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        settings = get_settings()
+        self.database_url = database_url or settings.DATABASE_ASYNC_URL
+        if not self.database_url:
+            if not settings.DATABASE_URL:
+                raise ValueError("DATABASE_URL 环境变量未设置")
+            self.database_url = to_async_url(settings.DATABASE_URL)
+
+        self.engine = create_async_engine(
+            self.database_url,
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=True,
+            echo=settings.DEBUG
+        )
+        self.SessionLocal = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session(self):
+        """获取异步会话（上下文管理器，退出时提交）"""
+        async with self.SessionLocal() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def dispose(self):
+        """关闭连接池"""
+        await self.engine.dispose()
+
+
+_async_db_manager: Optional[AsyncDBSessionManager] = None
+
+
+def get_async_db_manager() -> AsyncDBSessionManager:
+    """获取异步数据库管理器单例"""
+    global _async_db_manager
+    if _async_db_manager is None:
+        _async_db_manager = AsyncDBSessionManager()
+    return _async_db_manager
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncGenerator:
+    """异步会话作用域上下文管理器"""
+    async with get_async_db_manager().get_session() as session:
+        yield session
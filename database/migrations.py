@@ -0,0 +1,122 @@
+"""
+数据库迁移
+create_all 只会创建缺少的表，不会修改已有的表。已有数据库的结构变更按版本登记在 MIGRATIONS 中，
+init_db 时依次执行尚未执行过的迁移，执行记录保存在 schema_migrations 表中。
+每个迁移先检查目标结构是否已存在，因此新建的数据库（create_all 已包含最新结构）和重复执行都是安全的
+"""
+import json
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from database.models import SchemaMigration, DailyBriefingDB, BriefingArticle
+from database.search import create_search_index
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    """表中是否已有该列"""
+    return column in {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def has_index(conn: Connection, table: str, name: str) -> bool:
+    """表中是否已有该索引"""
+    return name in {i["name"] for i in inspect(conn).get_indexes(table)}
+
+
+def add_column(conn: Connection, table: str, column: str, ddl_type: str):
+    """添加列（已存在时跳过）"""
+    if not has_column(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def create_index(conn: Connection, table: str, name: str, columns: List[str]):
+    """创建索引（已存在时跳过）"""
+    if not has_index(conn, table, name):
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+
+
+def _0001_task_log_metrics(conn: Connection):
+    add_column(conn, "task_logs", "metrics", "JSON")
+
+
+def _0002_briefing_articles(conn: Connection):
+    """创建 briefing_articles 表，并按 daily_briefings.article_ids 中的顺序回填"""
+    BriefingArticle.__table__.create(bind=conn, checkfirst=True)
+    briefings = DailyBriefingDB.__table__
+    links = BriefingArticle.__table__
+    linked = {row.briefing_id for row in conn.execute(links.select().with_only_columns(links.c.briefing_id).distinct())}
+    rows = []
+    for briefing in conn.execute(briefings.select().with_only_columns(briefings.c.id, briefings.c.article_ids)):
+        if briefing.id in linked or not briefing.article_ids:
+            continue
+        article_ids = briefing.article_ids
+        if isinstance(article_ids, str):
+            article_ids = json.loads(article_ids)
+        rows.extend(
+            {"briefing_id": briefing.id, "position": position, "article_id": article_id}
+            for position, article_id in enumerate(article_ids)
+        )
+    if rows:
+        conn.execute(links.insert(), rows)
+
+
+def _0003_query_indexes(conn: Connection):
+    """按常用查询的过滤与排序列建索引（与模型 __table_args__ 中的定义一致）"""
+    create_index(conn, "articles", "ix_articles_created_at", ["created_at"])
+    create_index(conn, "articles", "ix_articles_status_created_at", ["status", "created_at"])
+    create_index(conn, "articles", "ix_articles_source_type_created_at", ["source_type", "created_at"])
+    create_index(conn, "articles", "ix_articles_publication_date", ["publication_date"])
+    create_index(conn, "task_logs", "ix_task_logs_task_name_created_at", ["task_name", "created_at"])
+    create_index(conn, "task_logs", "ix_task_logs_created_at", ["created_at"])
+    create_index(conn, "llm_usage_logs", "ix_llm_usage_logs_task_name_created_at", ["task_name", "created_at"])
+    create_index(conn, "llm_usage_logs", "ix_llm_usage_logs_created_at", ["created_at"])
+
+
+def _0004_article_search(conn: Connection):
+    """创建文章全文检索索引（SQLite 为 FTS5 虚拟表并回填，MySQL 为 ngram FULLTEXT 索引）"""
+    create_search_index(conn)
+
+
+def _0005_article_summary_attempts(conn: Connection):
+    """articles 增加 summary_attempts 列（持续采集重新总结的失败次数）"""
+    add_column(conn, "articles", "summary_attempts", "INTEGER NOT NULL DEFAULT 0")
+
+
+# (版本, 说明, 迁移函数)，按顺序执行，已发布的迁移不要修改
+MIGRATIONS: List[Tuple[str, str, Callable[[Connection], None]]] = [
+    ("0001_task_log_metrics", "task_logs 增加分阶段耗时 metrics 列", _0001_task_log_metrics),
+    ("0002_briefing_articles", "新增 briefing_articles 关联表并从 article_ids 回填", _0002_briefing_articles),
+    ("0003_query_indexes", "articles / task_logs / llm_usage_logs 增加查询索引", _0003_query_indexes),
+    ("0004_article_search", "新增文章全文检索索引", _0004_article_search),
+    ("0005_article_summary_attempts", "articles 增加总结失败次数 summary_attempts 列", _0005_article_summary_attempts),
+]
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """
+    执行尚未执行过的迁移
+
+    Returns:
+        本次执行的迁移版本
+    """
+    SchemaMigration.__table__.create(bind=engine, checkfirst=True)
+    table = SchemaMigration.__table__
+
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        try:
+            with engine.begin() as conn:
+                if conn.execute(table.select().where(table.c.version == version)).first():
+                    continue
+                migrate(conn)
+                conn.execute(table.insert().values(
+                    version=version, description=description, applied_at=datetime.now()
+                ))
+        except IntegrityError:
+            # 其他进程同时执行了该迁移
+            continue
+        applied.append(version)
+    return applied
@@ -6,7 +6,7 @@ import json
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Enum as SQLEnum, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -28,9 +28,24 @@ class ArticleStatusEnum(str, enum.Enum):
     FAILED = "failed"
 
 
+class BriefingStageEnum(str, enum.Enum):
+    """早报生成阶段枚举"""
+    CRAWLING = "crawling"
+    SUMMARIZING = "summarizing"
+    DAILY_SUMMARY = "daily_summary"
+    SAVING = "saving"
+    COMPLETED = "completed"
+
+
 class ArticleDB(Base):
     """文章表"""
     __tablename__ = 'articles'
+    __table_args__ = (
+        Index('ix_articles_created_at', 'created_at'),
+        Index('ix_articles_status_created_at', 'status', 'created_at'),
+        Index('ix_articles_source_type_created_at', 'source_type', 'created_at'),
+        Index('ix_articles_publication_date', 'publication_date'),
+    )
 
     id = Column(String(64), primary_key=True, comment="文章ID（MD5）")
     title = Column(String(500), nullable=False, comment="标题")
@@ -41,24 +56,28 @@ class ArticleDB(Base):
     source_type = Column(SQLEnum(SourceTypeEnum), nullable=False, comment="来源类型")
     summary = Column(Text, comment="AI生成的总结")
     status = Column(SQLEnum(ArticleStatusEnum), default=ArticleStatusEnum.PENDING, comment="状态")
+    summary_attempts = Column(Integer, nullable=False, default=0, server_default="0", comment="总结失败次数")
     created_at = Column(DateTime, default=datetime.now, comment="创建时间")
     updated_at = Column(DateTime, onupdate=datetime.now, comment="更新时间")
 
-    def to_dict(self) -> dict:
-        """转换为字典"""
-        return {
+    def to_dict(self, include_content: bool = True) -> dict:
+        """转换为字典（include_content 为 False 时不含正文，查询时 defer 该列可避免读取）"""
+        result = {
             "id": self.id,
             "title": self.title,
-            "content": self.content,
             "author": self.author,
             "publication_date": self.publication_date,
             "source_url": self.source_url,
             "source_type": self.source_type.value if self.source_type else None,
             "summary": self.summary,
             "status": self.status.value if self.status else None,
+            "summary_attempts": self.summary_attempts or 0,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+        if include_content:
+            result["content"] = self.content
+        return result
 
     def __repr__(self):
         return f"<ArticleDB(id={self.id}, title={self.title[:20]}...)>"
@@ -71,7 +90,7 @@ class DailyBriefingDB(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(String(10), unique=True, nullable=False, index=True, comment="日期 YYYY-MM-DD")
     title = Column(String(200), nullable=False, comment="早报标题")
-    article_ids = Column(JSON, comment="文章ID列表")
+    article_ids = Column(JSON, comment="文章ID列表（与 briefing_articles 同步写入，读取以 briefing_articles 为准）")
     total_count = Column(Integer, default=0, comment="文章总数")
     ai_summary = Column(Text, comment="AI生成的整体总结")
     full_text = Column(Text, comment="完整的格式化早报文本（可直接发送）")
@@ -94,9 +113,65 @@ class DailyBriefingDB(Base):
         return f"<DailyBriefingDB(id={self.id}, date={self.date})>"
 
 
+class BriefingArticle(Base):
+    """早报与文章的关联（按早报中的顺序，可按文章反查包含它的早报）"""
+    __tablename__ = 'briefing_articles'
+    __table_args__ = (
+        Index('ix_briefing_articles_article_id', 'article_id', 'briefing_id'),
+    )
+
+    briefing_id = Column(Integer, primary_key=True, comment="早报ID")
+    position = Column(Integer, primary_key=True, comment="文章在早报中的位置（从 0 开始）")
+    article_id = Column(String(64), nullable=False, comment="文章ID")
+    rank_score = Column(Float, comment="挑选文章时的排序得分")
+
+    def __repr__(self):
+        return f"<BriefingArticle(briefing_id={self.briefing_id}, position={self.position}, article_id={self.article_id})>"
+
+
+class BriefingCheckpoint(Base):
+    """早报生成检查点（每个日期一条，Worker 崩溃后从中断的阶段恢复）"""
+    __tablename__ = 'briefing_checkpoints'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    date = Column(String(10), unique=True, nullable=False, index=True, comment="日期 YYYY-MM-DD")
+    stage = Column(SQLEnum(BriefingStageEnum), nullable=False, comment="当前阶段")
+    sources = Column(JSON, comment="消息源列表")
+    article_urls = Column(JSON, comment="待抓取的文章 [{source, url}]（按早报顺序）")
+    article_ids = Column(JSON, comment="已抓取并保存的文章ID列表")
+    ai_summary = Column(Text, comment="已生成的整体总结")
+    attempts = Column(Integer, default=1, comment="执行次数（首次执行为 1，每次恢复加 1）")
+    error_message = Column(Text, comment="最近一次错误信息")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment="更新时间")
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        return {
+            "id": self.id,
+            "date": self.date,
+            "stage": self.stage.value if self.stage else None,
+            "sources": self.sources,
+            "article_urls": self.article_urls,
+            "article_ids": self.article_ids,
+            "ai_summary": self.ai_summary,
+            "attempts": self.attempts,
+            "error_message": self.error_message,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<BriefingCheckpoint(date={self.date}, stage={self.stage})>"
+
+
 class TaskLog(Base):
     """任务执行日志"""
     __tablename__ = 'task_logs'
+    __table_args__ = (
+        Index('ix_task_logs_task_name_created_at', 'task_name', 'created_at'),
+        Index('ix_task_logs_created_at', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     task_name = Column(String(100), nullable=False, comment="任务名称")
@@ -106,6 +181,7 @@ class TaskLog(Base):
     duration = Column(Integer, comment="执行时长（秒）")
     result = Column(Text, comment="执行结果")
     error_message = Column(Text, comment="错误信息")
+    metrics = Column(JSON, comment="分阶段耗时（毫秒）、计数与失败原因")
     created_at = Column(DateTime, default=datetime.now, comment="记录时间")
 
     def to_dict(self) -> dict:
@@ -119,8 +195,81 @@ class TaskLog(Base):
             "duration": self.duration,
             "result": self.result,
             "error_message": self.error_message,
+            "metrics": self.metrics,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
     def __repr__(self):
         return f"<TaskLog(id={self.id}, task_name={self.task_name}, status={self.status})>"
+
+
+class LLMUsageLog(Base):
+    """大模型调用统计（每次早报生成一条，与 TaskLog 关联）"""
+    __tablename__ = 'llm_usage_logs'
+    __table_args__ = (
+        Index('ix_llm_usage_logs_task_name_created_at', 'task_name', 'created_at'),
+        Index('ix_llm_usage_logs_created_at', 'created_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_log_id = Column(Integer, index=True, comment="关联的任务日志ID")
+    task_name = Column(String(100), nullable=False, comment="任务名称")
+    briefing_date = Column(String(10), index=True, comment="早报日期 YYYY-MM-DD")
+    calls = Column(Integer, default=0, comment="调用次数（含重试与对冲）")
+    failed_calls = Column(Integer, default=0, comment="失败次数")
+    retries = Column(Integer, default=0, comment="重试/切换次数")
+    hedges = Column(Integer, default=0, comment="对冲请求数")
+    prompt_tokens = Column(Integer, default=0, comment="输入 token 数")
+    completion_tokens = Column(Integer, default=0, comment="输出 token 数")
+    total_tokens = Column(Integer, default=0, comment="总 token 数")
+    cost = Column(Float, default=0.0, comment="费用")
+    latency_avg_ms = Column(Float, comment="平均延迟（毫秒）")
+    latency_p50_ms = Column(Float, comment="P50 延迟（毫秒）")
+    latency_p95_ms = Column(Float, comment="P95 延迟（毫秒）")
+    latency_p99_ms = Column(Float, comment="P99 延迟（毫秒）")
+    latency_max_ms = Column(Float, comment="最大延迟（毫秒）")
+    latency_histogram = Column(JSON, comment="延迟直方图 {桶上界: 次数}")
+    outcomes = Column(JSON, comment="各调用结果的次数")
+    providers = Column(JSON, comment="按提供商的明细")
+    created_at = Column(DateTime, default=datetime.now, comment="记录时间")
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        return {
+            "id": self.id,
+            "task_log_id": self.task_log_id,
+            "task_name": self.task_name,
+            "briefing_date": self.briefing_date,
+            "calls": self.calls,
+            "failed_calls": self.failed_calls,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cost": self.cost,
+            "latency_avg_ms": self.latency_avg_ms,
+            "latency_p50_ms": self.latency_p50_ms,
+            "latency_p95_ms": self.latency_p95_ms,
+            "latency_p99_ms": self.latency_p99_ms,
+            "latency_max_ms": self.latency_max_ms,
+            "latency_histogram": self.latency_histogram,
+            "outcomes": self.outcomes,
+            "providers": self.providers,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+    def __repr__(self):
+        return f"<LLMUsageLog(id={self.id}, briefing_date={self.briefing_date}, calls={self.calls})>"
+
+
+class SchemaMigration(Base):
+    """已执行的数据库迁移（见 database/migrations.py）"""
+    __tablename__ = 'schema_migrations'
+
+    version = Column(String(50), primary_key=True, comment="迁移版本")
+    description = Column(String(200), comment="迁移说明")
+    applied_at = Column(DateTime, default=datetime.now, comment="执行时间")
+
+    def __repr__(self):
+        return f"<SchemaMigration(version={self.version})>"
@@ -0,0 +1,193 @@
+"""
+文章全文检索
+按数据库方言维护标题、总结、正文的倒排索引：
+
+- SQLite：FTS5 虚拟表 articles_fts，写入 utils.text.tokenize 切分后的词（中文为重叠的二元组，英文为小写单词），
+  由仓储层在文章写入的同一事务中同步
+- MySQL：articles(title, summary, content) 上使用 ngram 分词器的 FULLTEXT 索引，由 MySQL 自动维护
+
+索引由迁移创建；未创建（或 SQLite 未编译 FTS5）时退化为对标题、总结的 LIKE 查询
+"""
+import re
+from typing import List, Tuple
+
+from sqlalchemy import inspect, or_, and_, text, bindparam
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from database.models import ArticleDB
+from utils.text import tokenize
+
+SEARCH_TABLE = "articles_fts"
+FULLTEXT_INDEX = "ft_articles_text"
+# 相关度（bm25）中标题、总结、正文的权重
+COLUMN_WEIGHTS = (3.0, 2.0, 1.0)
+# 每次同步 / 回填的文章数
+SYNC_BATCH_SIZE = 500
+
+# MySQL 布尔模式的运算符
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+# 已确认存在检索索引的数据库（只缓存存在的结果，迁移执行后无需重启即可生效）
+_indexed_databases = set()
+
+
+def _rowid(article_id: str) -> int:
+    """FTS5 行号：取文章ID（MD5）的前 15 位十六进制，按行号删除无需扫描索引"""
+    return int(article_id[:15], 16)
+
+
+def _indexed_text(value: str) -> str:
+    """写入 FTS5 的文本：切分后的词以空格连接"""
+    return " ".join(tokenize(value))
+
+
+def has_search_index(conn: Connection) -> bool:
+    """当前数据库是否已创建检索索引"""
+    key = str(conn.engine.url)
+    if key in _indexed_databases:
+        return True
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        exists = inspect(conn).has_table(SEARCH_TABLE)
+    elif dialect == "mysql":
+        exists = FULLTEXT_INDEX in {i["name"] for i in inspect(conn).get_indexes("articles")}
+    else:
+        exists = False
+    if exists:
+        _indexed_databases.add(key)
+    return exists
+
+
+def _write_sqlite_rows(conn: Connection, rows):
+    rows = list(rows)
+    if not rows:
+        return
+    conn.execute(
+        text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN :rowids").bindparams(bindparam("rowids", expanding=True)),
+        {"rowids": [_rowid(row.id) for row in rows]}
+    )
+    conn.execute(
+        text(f"INSERT INTO {SEARCH_TABLE} (rowid, article_id, title, summary, content) "
+             f"VALUES (:rowid, :article_id, :title, :summary, :content)"),
+        [
+            {
+                "rowid": _rowid(row.id),
+                "article_id": row.id,
+                "title": _indexed_text(row.title),
+                "summary": _indexed_text(row.summary),
+                "content": _indexed_text(row.content),
+            }
+            for row in rows
+        ]
+    )
+
+
+def create_search_index(conn: Connection):
+    """创建检索索引（已存在时跳过），SQLite 同时回填已有文章"""
+    if has_search_index(conn):
+        return
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        conn.execute(text(
+            f"ALTER TABLE articles ADD FULLTEXT INDEX {FULLTEXT_INDEX} (title, summary, content) WITH PARSER ngram"
+        ))
+    elif dialect == "sqlite":
+        try:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+                f"article_id UNINDEXED, title, summary, content, tokenize='unicode61')"
+            ))
+        except OperationalError as e:
+            print(f"⚠️  SQLite 不支持 FTS5，文章检索将使用 LIKE 查询: {e}")
+            return
+        articles = ArticleDB.__table__
+        query = articles.select().with_only_columns(
+            articles.c.id, articles.c.title, articles.c.summary, articles.c.content
+        ).order_by(articles.c.id)
+        last_id = ""
+        while True:
+            rows = conn.execute(query.where(articles.c.id > last_id).limit(SYNC_BATCH_SIZE)).fetchall()
+            if not rows:
+                break
+            _write_sqlite_rows(conn, rows)
+            last_id = rows[-1].id
+
+
+def sync_search_index(session: Session, article_ids: List[str]):
+    """在当前事务中按文章的最新内容重建其检索索引（只有 SQLite 需要，MySQL 的 FULLTEXT 索引自动维护）"""
+    if not article_ids or session.get_bind().dialect.name != "sqlite":
+        return
+    session.flush()
+    conn = session.connection()
+    if not has_search_index(conn):
+        return
+    for i in range(0, len(article_ids), SYNC_BATCH_SIZE):
+        rows = session.query(ArticleDB.id, ArticleDB.title, ArticleDB.summary, ArticleDB.content).filter(
+            ArticleDB.id.in_(article_ids[i:i + SYNC_BATCH_SIZE])
+        ).all()
+        _write_sqlite_rows(conn, rows)
+
+
+def _terms(query: str) -> List[str]:
+    """按空白切分检索词（各词之间为 AND）"""
+    return [term for term in (query or "").split() if tokenize(term)]
+
+
+def _fts5_query(terms: List[str]) -> str:
+    """
+    FTS5 查询：每个检索词切分为与索引相同的词后作为短语匹配（二元组相邻即原文连续出现），
+    单个汉字的检索词按前缀匹配
+    """
+    phrases = []
+    for term in terms:
+        tokens = tokenize(term)
+        if len(tokens) == 1 and len(tokens[0]) == 1 and not tokens[0].isascii():
+            phrases.append(f'"{tokens[0]}"*')
+        else:
+            phrases.append('"' + " ".join(tokens) + '"')
+    return " ".join(phrases)
+
+
+def _boolean_query(terms: List[str]) -> str:
+    """MySQL 布尔模式查询：每个检索词作为必须出现的短语"""
+    phrases = [_BOOLEAN_OPERATORS.sub(" ", term).strip() for term in terms]
+    return " ".join(f'+"{phrase}"' for phrase in phrases if phrase)
+
+
+def search_article_ids(session: Session, query: str, limit: int = 20, offset: int = 0) -> List[Tuple[str, float]]:
+    """
+    检索文章，按相关度从高到低返回 [(文章ID, 得分)]
+
+    检索词之间用空白分隔，文章需包含全部检索词；LIKE 退化查询按入库时间倒序，得分为 None
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    conn = session.connection()
+    dialect = conn.dialect.name
+    if has_search_index(conn):
+        if dialect == "sqlite":
+            weights = ", ".join(str(w) for w in COLUMN_WEIGHTS)
+            rows = conn.execute(text(
+                f"SELECT article_id, bm25({SEARCH_TABLE}, 0.0, {weights}) AS rank FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH :query ORDER BY rank LIMIT :limit OFFSET :offset"
+            ), {"query": _fts5_query(terms), "limit": limit, "offset": offset}).fetchall()
+            return [(row.article_id, round(-row.rank, 4)) for row in rows]
+        if dialect == "mysql":
+            rows = conn.execute(text(
+                "SELECT id, MATCH(title, summary, content) AGAINST (:query IN BOOLEAN MODE) AS score "
+                "FROM articles WHERE MATCH(title, summary, content) AGAINST (:query IN BOOLEAN MODE) "
+                "ORDER BY score DESC LIMIT :limit OFFSET :offset"
+            ), {"query": _boolean_query(terms), "limit": limit, "offset": offset}).fetchall()
+            return [(row.id, round(float(row.score), 4)) for row in rows]
+
+    conditions = [
+        or_(ArticleDB.title.ilike(f"%{term}%"), ArticleDB.summary.ilike(f"%{term}%"))
+        for term in terms
+    ]
+    rows = session.query(ArticleDB.id).filter(and_(*conditions)).order_by(
+        ArticleDB.created_at.desc()
+    ).limit(limit).offset(offset).all()
+    return [(row.id, None) for row in rows]
@@ -3,5 +3,6 @@
 """
 
 from .news_repository import NewsRepository
+from .async_news_repository import AsyncNewsRepository
 
-__all__ = ["NewsRepository"]
+__all__ = ["NewsRepository", "AsyncNewsRepository"]
@@ -0,0 +1,33 @@
+"""
+异步新闻数据访问层
+基于 SQLAlchemy asyncio（aiomysql / aiosqlite 驱动），方法与 NewsRepository 一一对应、参数相同，
+区别只在于需要 await：等待数据库时不阻塞事件循环，抓取和大模型请求可以继续进行。
+每次调用使用独立的异步会话和事务，查询逻辑通过 run_sync 复用 NewsRepository 的实现
+"""
+import functools
+
+from database.base import async_session_scope
+from repositories.news_repository import NewsRepository
+
+
+class AsyncNewsRepository:
+    """异步新闻数据访问层（由 DATABASE_ASYNC 启用）"""
+
+    async def _run(self, name: str, *args, **kwargs):
+        async with async_session_scope() as session:
+            return await session.run_sync(
+                lambda sync_session: getattr(NewsRepository(sync_session), name)(*args, **kwargs)
+            )
+
+
+def _async_method(name: str):
+    @functools.wraps(getattr(NewsRepository, name))
+    async def method(self, *args, **kwargs):
+        return await self._run(name, *args, **kwargs)
+    return method
+
+
+# 与 NewsRepository 的公开方法保持一致
+for _name, _member in vars(NewsRepository).items():
+    if not _name.startswith("_") and callable(_member):
+        setattr(AsyncNewsRepository, _name, _async_method(_name))
@@ -2,70 +2,271 @@
 新闻数据访问层
 """
 import hashlib
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import List, Optional, Dict, Generator
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from sqlalchemy import desc
 
-from database.models import ArticleDB, DailyBriefingDB, TaskLog, SourceTypeEnum, ArticleStatusEnum
+from database.models import (
+    ArticleDB, DailyBriefingDB, BriefingArticle, BriefingCheckpoint, TaskLog, LLMUsageLog,
+    SourceTypeEnum, ArticleStatusEnum, BriefingStageEnum
+)
 from database.base import session_scope
+from database.search import search_article_ids, sync_search_index
 from core.models import Article, DailyBriefing, SourceType, ArticleStatus
 
+# 已存在的文章被更新的字段（来源与创建时间保持不变）
+UPSERT_FIELDS = ("title", "content", "author", "publication_date", "summary", "status")
+# 每条 upsert 语句最多包含的文章数
+UPSERT_BATCH_SIZE = 500
+# 早报列表默认返回的字段，及可按需追加的字段
+BRIEFING_LIST_FIELDS = ("id", "date", "title", "total_count", "ai_summary")
+BRIEFING_EXTRA_FIELDS = ("article_ids", "full_text", "created_at")
+
 
 class NewsRepository:
     """新闻数据访问层"""
 
+    def __init__(self, session: Optional[Session] = None):
+        # 传入 session 时所有操作都在该会话中执行、由调用方提交（AsyncNewsRepository 借此复用查询逻辑）
+        self._session = session
+
+    @contextmanager
+    def _scope(self) -> Generator[Session, None, None]:
+        """获取会话：使用传入的会话，或新开一个会话作用域（退出时提交）"""
+        if self._session is not None:
+            yield self._session
+        else:
+            with session_scope() as session:
+                yield session
+
     @staticmethod
     def _generate_article_id(url: str) -> str:
         """生成文章ID（MD5）"""
         return hashlib.md5(url.encode()).hexdigest()
 
-    def save_article(self, article: Article) -> str:
-        """保存单篇文章"""
-        article_id = self._generate_article_id(article.source_url)
+    @staticmethod
+    def _article_row(article_id: str, article: Article, now: datetime) -> dict:
+        return {
+            "id": article_id,
+            "title": article.title,
+            "content": article.content,
+            "author": article.author,
+            "publication_date": article.publication_date,
+            "source_url": article.source_url,
+            "source_type": SourceTypeEnum(article.source_type.value),
+            "summary": article.summary,
+            "status": ArticleStatusEnum(article.status.value),
+            "created_at": now,
+        }
 
-        with session_scope() as session:
-            # 检查是否已存在
-            existing = session.query(ArticleDB).filter_by(id=article_id).first()
-            if existing:
-                # 更新
-                existing.title = article.title
-                existing.content = article.content
-                existing.author = article.author
-                existing.publication_date = article.publication_date
-                existing.summary = article.summary
-                existing.status = ArticleStatusEnum(article.status.value)
-                existing.updated_at = datetime.now()
+    @staticmethod
+    def _merge_article(session: Session, row: dict, now: datetime):
+        """先查询再插入或更新（不支持 upsert 语法的数据库）"""
+        existing = session.query(ArticleDB).filter_by(id=row["id"]).first()
+        if existing:
+            for field in UPSERT_FIELDS:
+                setattr(existing, field, row[field])
+            existing.updated_at = now
+        else:
+            session.add(ArticleDB(**row))
+
+    def _upsert_articles(self, session: Session, articles: List[Article]) -> List[str]:
+        """
+        在当前事务中批量插入或更新文章，返回文章ID（与传入顺序一致）
+
+        MySQL 使用 INSERT ... ON DUPLICATE KEY UPDATE，SQLite / PostgreSQL 使用 INSERT ... ON CONFLICT，
+        每批一条语句；其他数据库逐条查询后插入或更新
+        """
+        if not articles:
+            return []
+        now = datetime.now()
+        article_ids = [self._generate_article_id(article.source_url) for article in articles]
+        # 同一批中重复的文章只保留最后一次（ON CONFLICT 不允许同一条语句两次更新同一行）
+        rows = list({
+            article_id: self._article_row(article_id, article, now)
+            for article_id, article in zip(article_ids, articles)
+        }.values())
+
+        dialect = session.get_bind().dialect.name
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for row in rows:
+                self._merge_article(session, row, now)
+            sync_search_index(session, [row["id"] for row in rows])
+            return article_ids
+
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            stmt = insert(ArticleDB).values(rows[i:i + UPSERT_BATCH_SIZE])
+            if dialect == "mysql":
+                stmt = stmt.on_duplicate_key_update(
+                    **{field: stmt.inserted[field] for field in UPSERT_FIELDS}, updated_at=now
+                )
             else:
-                # 新增
-                article_db = ArticleDB(
-                    id=article_id,
-                    title=article.title,
-                    content=article.content,
-                    author=article.author,
-                    publication_date=article.publication_date,
-                    source_url=article.source_url,
-                    source_type=SourceTypeEnum(article.source_type.value),
-                    summary=article.summary,
-                    status=ArticleStatusEnum(article.status.value),
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ArticleDB.id],
+                    set_={**{field: stmt.excluded[field] for field in UPSERT_FIELDS}, "updated_at": now}
                 )
-                session.add(article_db)
+            session.execute(stmt)
+        sync_search_index(session, [row["id"] for row in rows])
+        return article_ids
 
-        return article_id
+    def save_article(self, article: Article) -> str:
+        """保存单篇文章（已存在时更新）"""
+        return self.save_articles([article])[0]
 
     def save_articles(self, articles: List[Article]) -> List[str]:
-        """批量保存文章"""
-        article_ids = []
-        for article in articles:
-            article_id = self.save_article(article)
-            article_ids.append(article_id)
-        return article_ids
+        """批量保存文章（单个事务，已存在的文章更新），返回文章ID"""
+        if not articles:
+            return []
+        with self._scope() as session:
+            return self._upsert_articles(session, articles)
+
+    def get_articles_for_summarization(self, statuses: Optional[List[str]] = None,
+                                       since: Optional[str] = None,
+                                       limit: Optional[int] = None) -> List[dict]:
+        """
+        获取待批量总结的文章（只返回 id/title/content）
+
+        Args:
+            statuses: 文章状态列表，默认为 pending/failed
+            since: 只返回该日期（YYYY-MM-DD）及之后创建的文章
+            limit: 最多返回的数量
+        """
+        statuses = statuses or [ArticleStatus.PENDING.value, ArticleStatus.FAILED.value]
+        with self._scope() as session:
+            query = session.query(ArticleDB.id, ArticleDB.title, ArticleDB.content).filter(
+                ArticleDB.status.in_([ArticleStatusEnum(status) for status in statuses])
+            )
+            if since:
+                query = query.filter(ArticleDB.created_at >= datetime.strptime(since, "%Y-%m-%d"))
+            query = query.order_by(ArticleDB.created_at)
+            if limit:
+                query = query.limit(limit)
+            return [{"id": row.id, "title": row.title, "content": row.content} for row in query.all()]
+
+    def bulk_apply_summaries(self, summaries: Dict[str, str], failed_ids: Optional[List[str]] = None) -> int:
+        """
+        批量写回总结结果（单个事务）
+
+        Args:
+            summaries: {文章ID: 总结}，状态置为 completed
+            failed_ids: 总结失败的文章ID，原状态为 pending/failed 的置为 failed（保留原有总结）；
+                已完成的文章（如修改提示词后重新总结）保持 completed 和原有总结
+
+        Returns:
+            更新的文章数
+        """
+        now = datetime.now()
+        mappings = [
+            {"id": article_id, "summary": summary, "status": ArticleStatusEnum.COMPLETED, "updated_at": now}
+            for article_id, summary in summaries.items()
+        ]
+        if not mappings and not failed_ids:
+            return 0
+        with self._scope() as session:
+            updated = len(mappings)
+            if mappings:
+                session.bulk_update_mappings(ArticleDB, mappings)
+                sync_search_index(session, list(summaries))
+            if failed_ids:
+                updated += session.query(ArticleDB).filter(
+                    ArticleDB.id.in_(failed_ids),
+                    ArticleDB.status.in_([ArticleStatusEnum.PENDING, ArticleStatusEnum.FAILED])
+                ).update(
+                    {ArticleDB.status: ArticleStatusEnum.FAILED, ArticleDB.updated_at: now},
+                    synchronize_session=False
+                )
+        return updated
+
+    def record_summary_failures(self, article_ids: List[str]) -> int:
+        """总结失败的文章状态置为 failed，失败次数加一（单个事务）"""
+        if not article_ids:
+            return 0
+        with self._scope() as session:
+            return session.query(ArticleDB).filter(ArticleDB.id.in_(article_ids)).update({
+                ArticleDB.status: ArticleStatusEnum.FAILED,
+                ArticleDB.summary_attempts: ArticleDB.summary_attempts + 1,
+                ArticleDB.updated_at: datetime.now(),
+            }, synchronize_session=False)
+
+    @staticmethod
+    def _load_articles(session: Session, article_ids: List[str], include_content: bool = True) -> List[dict]:
+        """用一条 IN 查询获取文章（保持传入顺序，不存在的ID被忽略）"""
+        if not article_ids:
+            return []
+        query = session.query(ArticleDB).filter(ArticleDB.id.in_(article_ids))
+        if not include_content:
+            query = query.options(defer(ArticleDB.content))
+        by_id = {article.id: article.to_dict(include_content) for article in query.all()}
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+
+    def get_articles_by_ids(self, article_ids: List[str], include_content: bool = True) -> List[dict]:
+        """按ID批量获取文章（保持传入顺序，不存在的ID被忽略；include_content 为 False 时不读取正文）"""
+        if not article_ids:
+            return []
+        with self._scope() as session:
+            return self._load_articles(session, article_ids, include_content)
+
+    def get_articles_by_urls(self, urls: List[str], include_content: bool = True) -> List[dict]:
+        """按URL批量获取文章（保持传入顺序，不存在的URL被忽略；include_content 为 False 时不读取正文）"""
+        return self.get_articles_by_ids([self._generate_article_id(url) for url in urls], include_content)
+
+    def search_articles(self, query: str, limit: int = 20, offset: int = 0) -> List[dict]:
+        """
+        全文检索文章（标题、总结、正文），按相关度排序
+
+        Args:
+            query: 检索词，多个词用空白分隔，文章需包含全部检索词
+            limit: 数量
+            offset: 偏移量
+
+        Returns:
+            文章列表（不含正文），score 为相关度得分（未创建检索索引时为 None）
+        """
+        with self._scope() as session:
+            hits = search_article_ids(session, query, limit, offset)
+            scores = dict(hits)
+            articles = self._load_articles(session, [article_id for article_id, _ in hits], include_content=False)
+            for article in articles:
+                article["score"] = scores[article["id"]]
+            return articles
+
+    def get_processed_articles(self, since: datetime, limit: Optional[int] = None) -> List[dict]:
+        """获取 since 之后入库且已完成总结的文章（按入库时间倒序）"""
+        with self._scope() as session:
+            query = session.query(ArticleDB).filter(
+                ArticleDB.status == ArticleStatusEnum.COMPLETED,
+                ArticleDB.summary.isnot(None),
+                ArticleDB.created_at >= since
+            ).order_by(desc(ArticleDB.created_at))
+            if limit:
+                query = query.limit(limit)
+            return [article.to_dict() for article in query.all()]
+
+    def update_articles_status(self, article_ids: List[str], status: str) -> int:
+        """批量更新文章状态"""
+        if not article_ids:
+            return 0
+        now = datetime.now()
+        with self._scope() as session:
+            session.bulk_update_mappings(ArticleDB, [
+                {"id": article_id, "status": ArticleStatusEnum(status), "updated_at": now}
+                for article_id in article_ids
+            ])
+        return len(article_ids)
 
     def get_article_by_url(self, url: str) -> Optional[dict]:
         """根据URL获取文章"""
         article_id = self._generate_article_id(url)
-        with session_scope() as session:
+        with self._scope() as session:
             article = session.query(ArticleDB).filter_by(id=article_id).first()
             if article:
                 return article.to_dict()
@@ -73,22 +274,22 @@ class NewsRepository:
 
     def get_article_by_id(self, article_id: str) -> Optional[dict]:
         """根据ID获取文章"""
-        with session_scope() as session:
+        with self._scope() as session:
             article = session.query(ArticleDB).filter_by(id=article_id).first()
             if article:
                 return article.to_dict()
         return None
 
     def save_daily_briefing(self, briefing: DailyBriefing) -> int:
-        """保存每日早报"""
-        # 先保存所有文章
-        article_ids = self.save_articles(briefing.articles)
-
+        """保存每日早报（文章与早报在同一个事务中写入）"""
         # 生成完整格式化文本
         if not briefing.full_text:
             briefing.generate_full_text()
 
-        with session_scope() as session:
+        with self._scope() as session:
+            # 先保存所有文章
+            article_ids = self._upsert_articles(session, briefing.articles)
+
             # 检查是否已存在
             existing = session.query(DailyBriefingDB).filter_by(date=briefing.date).first()
             if existing:
@@ -99,6 +300,7 @@ class NewsRepository:
                 existing.ai_summary = briefing.ai_summary
                 existing.full_text = briefing.full_text
                 briefing_id = existing.id
+                session.query(BriefingArticle).filter_by(briefing_id=briefing_id).delete()
             else:
                 # 新增
                 briefing_db = DailyBriefingDB(
@@ -113,57 +315,161 @@ class NewsRepository:
                 session.flush()
                 briefing_id = briefing_db.id
 
+            # 文章顺序与排序得分
+            session.add_all([
+                BriefingArticle(briefing_id=briefing_id, position=position, article_id=article_id,
+                                rank_score=article.rank_score)
+                for position, (article_id, article) in enumerate(zip(article_ids, briefing.articles))
+            ])
+
         return briefing_id
 
-    def get_daily_briefing(self, date: str) -> Optional[dict]:
-        """获取指定日期的早报"""
-        with session_scope() as session:
+    def _briefing_with_articles(self, session: Session, briefing: Optional[DailyBriefingDB],
+                                include_content: bool) -> Optional[dict]:
+        """早报及其文章详情（通过 briefing_articles 关联一次查出，按早报中的顺序排列）"""
+        if not briefing:
+            return None
+        result = briefing.to_dict()
+        query = session.query(ArticleDB, BriefingArticle.rank_score).join(
+            BriefingArticle, BriefingArticle.article_id == ArticleDB.id
+        ).filter(BriefingArticle.briefing_id == briefing.id).order_by(BriefingArticle.position)
+        if not include_content:
+            query = query.options(defer(ArticleDB.content))
+        result['articles'] = [
+            {**article.to_dict(include_content), "rank_score": rank_score}
+            for article, rank_score in query.all()
+        ]
+        return result
+
+    def get_briefings_by_article(self, article_id: str) -> List[dict]:
+        """获取包含该文章的早报（按日期倒序），含文章在早报中的位置"""
+        with self._scope() as session:
+            rows = session.query(DailyBriefingDB, BriefingArticle.position).join(
+                BriefingArticle, BriefingArticle.briefing_id == DailyBriefingDB.id
+            ).filter(BriefingArticle.article_id == article_id).order_by(desc(DailyBriefingDB.date)).all()
+            return [
+                {"id": briefing.id, "date": briefing.date, "title": briefing.title, "position": position}
+                for briefing, position in rows
+            ]
+
+    def get_daily_briefing(self, date: str, include_content: bool = True) -> Optional[dict]:
+        """获取指定日期的早报（include_content 为 False 时文章不含正文）"""
+        with self._scope() as session:
             briefing = session.query(DailyBriefingDB).filter_by(date=date).first()
-            if briefing:
-                result = briefing.to_dict()
-                # 获取文章详情
-                if briefing.article_ids:
-                    articles = []
-                    for article_id in briefing.article_ids:
-                        article = session.query(ArticleDB).filter_by(id=article_id).first()
-                        if article:
-                            articles.append(article.to_dict())
-                    result['articles'] = articles
-                return result
-        return None
+            return self._briefing_with_articles(session, briefing, include_content)
+
+    def get_briefing_by_id(self, briefing_id: int, include_content: bool = True) -> Optional[dict]:
+        """根据ID获取早报（含文章详情）"""
+        with self._scope() as session:
+            briefing = session.query(DailyBriefingDB).filter_by(id=briefing_id).first()
+            return self._briefing_with_articles(session, briefing, include_content)
 
-    def get_latest_briefing(self) -> Optional[dict]:
-        """获取最新早报"""
-        with session_scope() as session:
+    def get_latest_briefing(self, include_content: bool = True) -> Optional[dict]:
+        """获取最新早报（include_content 为 False 时文章不含正文）"""
+        with self._scope() as session:
             briefing = session.query(DailyBriefingDB).order_by(
                 desc(DailyBriefingDB.date)
             ).first()
-            if briefing:
-                result = briefing.to_dict()
-                # 获取文章详情
-                if briefing.article_ids:
-                    articles = []
-                    for article_id in briefing.article_ids:
-                        article = session.query(ArticleDB).filter_by(id=article_id).first()
-                        if article:
-                            articles.append(article.to_dict())
-                    result['articles'] = articles
-                return result
+            return self._briefing_with_articles(session, briefing, include_content)
+
+    def list_briefings(self, limit: int = 10, offset: int = 0, before: Optional[str] = None,
+                       fields: Optional[List[str]] = None) -> List[dict]:
+        """
+        按日期倒序列出早报（只查询需要的列）
+
+        Args:
+            limit: 数量
+            offset: 偏移量（传入 before 时忽略）
+            before: 游标，只返回该日期（YYYY-MM-DD）之前的早报，沿 date 唯一索引定位，翻页深度不影响耗时
+            fields: 在 BRIEFING_LIST_FIELDS 之外追加返回的字段（BRIEFING_EXTRA_FIELDS 中的字段）
+        """
+        names = list(BRIEFING_LIST_FIELDS) + [f for f in BRIEFING_EXTRA_FIELDS if f in (fields or [])]
+        with self._scope() as session:
+            query = session.query(*[getattr(DailyBriefingDB, name) for name in names])
+            if before:
+                query = query.filter(DailyBriefingDB.date < before)
+            query = query.order_by(desc(DailyBriefingDB.date)).limit(limit)
+            rows = (query if before else query.offset(offset)).all()
+            briefings = [dict(zip(names, row)) for row in rows]
+            for briefing in briefings:
+                if briefing.get("created_at"):
+                    briefing["created_at"] = briefing["created_at"].isoformat()
+            return briefings
+
+    def get_briefing_dates(self, start_date: str, end_date: str) -> List[str]:
+        """获取日期区间内（含两端）已生成早报的日期"""
+        with self._scope() as session:
+            rows = session.query(DailyBriefingDB.date).filter(
+                DailyBriefingDB.date >= start_date,
+                DailyBriefingDB.date <= end_date
+            ).all()
+            return [row.date for row in rows]
+
+    def get_source_watermarks(self, source_type: str, limit: int = 1000) -> List[dict]:
+        """
+        获取消息源已有文章的URL与发布时间（回填时用于定位历史文章）
+
+        Returns:
+            [{source_url, publication_date, created_at}]，按创建时间倒序
+        """
+        with self._scope() as session:
+            rows = session.query(
+                ArticleDB.source_url, ArticleDB.publication_date, ArticleDB.created_at
+            ).filter(
+                ArticleDB.source_type == SourceTypeEnum(source_type),
+                ArticleDB.publication_date.isnot(None)
+            ).order_by(desc(ArticleDB.created_at)).limit(limit).all()
+            return [
+                {"source_url": row.source_url, "publication_date": row.publication_date, "created_at": row.created_at}
+                for row in rows
+            ]
+
+    def get_checkpoint(self, date: str) -> Optional[dict]:
+        """获取指定日期的早报生成检查点"""
+        with self._scope() as session:
+            checkpoint = session.query(BriefingCheckpoint).filter_by(date=date).first()
+            if checkpoint:
+                return checkpoint.to_dict()
         return None
 
-    def list_briefings(self, limit: int = 10, offset: int = 0) -> List[dict]:
-        """列出早报"""
-        with session_scope() as session:
-            briefings = session.query(DailyBriefingDB).order_by(
-                desc(DailyBriefingDB.date)
-            ).limit(limit).offset(offset).all()
-            return [b.to_dict() for b in briefings]
+    def save_checkpoint(self, date: str, **fields) -> dict:
+        """
+        创建或更新早报生成检查点（只更新传入的字段）
+
+        Args:
+            date: 日期
+            **fields: stage/sources/article_urls/article_ids/ai_summary/attempts/error_message
+        """
+        if "stage" in fields:
+            fields["stage"] = BriefingStageEnum(getattr(fields["stage"], "value", fields["stage"]))
+        with self._scope() as session:
+            checkpoint = session.query(BriefingCheckpoint).filter_by(date=date).first()
+            if checkpoint:
+                for key, value in fields.items():
+                    setattr(checkpoint, key, value)
+                checkpoint.updated_at = datetime.now()
+            else:
+                checkpoint = BriefingCheckpoint(date=date, **fields)
+                session.add(checkpoint)
+            session.flush()
+            return checkpoint.to_dict()
+
+    def list_incomplete_checkpoints(self, stale_before: Optional[datetime] = None) -> List[dict]:
+        """列出未完成的检查点（stale_before：只返回在该时间之前最后更新的，即执行者可能已崩溃）"""
+        with self._scope() as session:
+            query = session.query(BriefingCheckpoint).filter(
+                BriefingCheckpoint.stage != BriefingStageEnum.COMPLETED
+            )
+            if stale_before:
+                query = query.filter(BriefingCheckpoint.updated_at < stale_before)
+            return [c.to_dict() for c in query.order_by(BriefingCheckpoint.date).all()]
 
     def log_task(self, task_name: str, status: str, start_time: datetime,
                  end_time: Optional[datetime] = None, duration: Optional[int] = None,
-                 result: Optional[str] = None, error_message: Optional[str] = None):
-        """记录任务日志"""
-        with session_scope() as session:
+                 result: Optional[str] = None, error_message: Optional[str] = None,
+                 metrics: Optional[dict] = None) -> int:
+        """记录任务日志，返回日志ID（metrics 为 PhaseTimer.summary() 的结果）"""
+        with self._scope() as session:
             log = TaskLog(
                 task_name=task_name,
                 status=status,
@@ -171,15 +477,91 @@ class NewsRepository:
                 end_time=end_time,
                 duration=duration,
                 result=result,
-                error_message=error_message
+                error_message=error_message,
+                metrics=metrics
             )
             session.add(log)
+            session.flush()
+            return log.id
+
+    def get_task_metrics(self, task_log_id: int) -> Optional[dict]:
+        """获取任务日志中的分阶段耗时，日志不存在时返回 None"""
+        with self._scope() as session:
+            log = session.query(TaskLog).filter_by(id=task_log_id).first()
+            if not log:
+                return None
+            return log.metrics or {}
+
+    def update_task_metrics(self, task_log_id: int, metrics: dict) -> bool:
+        """更新任务日志中的分阶段耗时（发布任务链补充保存、缓存、推送阶段）"""
+        with self._scope() as session:
+            log = session.query(TaskLog).filter_by(id=task_log_id).first()
+            if not log:
+                return False
+            log.metrics = metrics
+            return True
 
     def get_task_logs(self, task_name: Optional[str] = None, limit: int = 50) -> List[dict]:
         """获取任务日志"""
-        with session_scope() as session:
+        with self._scope() as session:
             query = session.query(TaskLog)
             if task_name:
                 query = query.filter_by(task_name=task_name)
             logs = query.order_by(desc(TaskLog.created_at)).limit(limit).all()
             return [log.to_dict() for log in logs]
+
+    def log_llm_usage(self, task_name: str, briefing_date: str, usage: dict,
+                      task_log_id: Optional[int] = None) -> int:
+        """记录一次早报生成的大模型调用统计（usage 为 LLMUsageTracker.summary() 的结果）"""
+        with self._scope() as session:
+            log = LLMUsageLog(
+                task_log_id=task_log_id,
+                task_name=task_name,
+                briefing_date=briefing_date,
+                calls=usage.get("calls", 0),
+                failed_calls=usage.get("failed_calls", 0),
+                retries=usage.get("retries", 0),
+                hedges=usage.get("hedges", 0),
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                total_tokens=usage.get("total_tokens", 0),
+                cost=usage.get("cost", 0.0),
+                latency_avg_ms=usage.get("latency_avg_ms"),
+                latency_p50_ms=usage.get("latency_p50_ms"),
+                latency_p95_ms=usage.get("latency_p95_ms"),
+                latency_p99_ms=usage.get("latency_p99_ms"),
+                latency_max_ms=usage.get("latency_max_ms"),
+                latency_histogram=usage.get("latency_histogram"),
+                outcomes=usage.get("outcomes"),
+                providers=usage.get("providers")
+            )
+            session.add(log)
+            session.flush()
+            return log.id
+
+    def get_llm_usage_logs(self, task_name: Optional[str] = None, limit: int = 30) -> List[dict]:
+        """获取大模型调用统计（按时间倒序）"""
+        with self._scope() as session:
+            query = session.query(LLMUsageLog)
+            if task_name:
+                query = query.filter_by(task_name=task_name)
+            logs = query.order_by(desc(LLMUsageLog.created_at)).limit(limit).all()
+            return [log.to_dict() for log in logs]
+
+    def get_unattached_llm_usage_logs(self, task_name: str, briefing_date: str) -> List[dict]:
+        """获取某天尚未关联任务日志的调用统计（分布式模式下各篇文章的总结）"""
+        with self._scope() as session:
+            logs = session.query(LLMUsageLog).filter(
+                LLMUsageLog.briefing_date == briefing_date,
+                LLMUsageLog.task_name == task_name,
+                LLMUsageLog.task_log_id.is_(None)
+            ).all()
+            return [log.to_dict() for log in logs]
+
+    def attach_llm_usage_logs(self, log_ids: List[int], task_log_id: int) -> int:
+        """把调用统计关联到任务日志"""
+        if not log_ids:
+            return 0
+        with self._scope() as session:
+            return session.query(LLMUsageLog).filter(LLMUsageLog.id.in_(log_ids)).update(
+                {LLMUsageLog.task_log_id: task_log_id}, synchronize_session=False)
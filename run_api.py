@@ -28,6 +28,10 @@ if __name__ == '__main__':
     print(f"   GET  /api/v1/briefing/<date>    - 获取指定日期早报")
     print(f"   POST /api/v1/briefing/generate  - 手动生成早报")
     print(f"   GET  /api/v1/briefing/list      - 早报列表")
+    print(f"   GET  /api/v1/articles/search    - 文章检索")
+    print(f"   GET  /api/v1/briefing/<date>/summary/stream - 流式获取每日总结（SSE）")
+    print(f"   GET  /api/v1/metrics/llm        - 大模型调用统计")
+    print(f"   GET  /api/v1/metrics/tasks      - 任务分阶段耗时")
     print(f"\n" + "=" * 60)
     print("⚡ 启动服务...")
     print("=" * 60 + "\n")
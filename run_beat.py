@@ -16,7 +16,9 @@ if __name__ == '__main__':
     print(f"\n配置:")
     print(f"   Broker: {celery_app.conf.broker_url}")
     print(f"   Backend: {celery_app.conf.result_backend}")
-    print(f"   Schedule: {os.getenv('SCHEDULE_CRONTAB', '未配置')}")
+    print(f"   Schedule: {'SCHEDULE_TABLE' if os.getenv('SCHEDULE_TABLE') else os.getenv('SCHEDULE_CRONTAB', '未配置')}")
+    for name, entry in celery_app.conf.beat_schedule.items():
+        print(f"   - {name}: {entry['task']} ({entry['schedule']}, 队列 {entry['options'].get('queue')})")
     print(f"\n启动调度器...")
     print("=" * 60 + "\n")
 
@@ -1,8 +1,16 @@
 """
 Celery Worker 启动脚本
+
+用法：
+    python run_celery.py                                 # 单个 Worker 消费全部队列（本地开发）
+    python run_celery.py --group push                    # 按队列分组启动，使用分组的默认并发
+    python run_celery.py --group summarize --concurrency 40
+    python run_celery.py --queues crawl,summarize --concurrency 10
+
+生产环境按分组分别启动 Worker：推送使用单独的 Worker，不会排在生成、总结任务后面等待；
+长时间运行的批量总结、历史回填也使用单独的 Worker，不会占用生成早报的名额
 """
-import os
-import sys
+import argparse
 from dotenv import load_dotenv
 
 # 加载环境变量
@@ -10,16 +18,53 @@ load_dotenv()
 
 from tasks.celery_app import celery_app
 
-# 导入任务模块以注册任务（重要！）
+# 导入任务模块以注册任务（重要！发布任务由 daily_generation 导入）
 import tasks.daily_generation
+import tasks.bulk_summarization
+import tasks.distributed_generation
+import tasks.backfill
+import tasks.ingestion
+
+# 队列分组: (队列, 默认并发)
+QUEUE_GROUPS = {
+    "briefing": (["celery", "briefing"], 2),
+    # 批量总结、历史回填可能运行数小时，单独的 Worker，不占用生成早报的名额
+    "bulk": (["bulk"], 2),
+    "crawl": (["crawl"], 8),
+    "summarize": (["summarize"], 20),
+    "publish": (["persist", "cache"], 4),
+    "push": (["push"], 8),
+}
+ALL_QUEUES = [queue for queues, _ in QUEUE_GROUPS.values() for queue in queues]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="启动 Celery Worker")
+    parser.add_argument("--group", choices=["all", *QUEUE_GROUPS], default="all",
+                        help="消费的队列分组，默认 all（全部队列，并发为 Celery 默认值）")
+    parser.add_argument("--queues", help="逗号分隔的队列列表，指定后替代 --group 的队列")
+    parser.add_argument("--concurrency", type=int, help="并发数，默认使用分组的默认并发")
+    return parser.parse_args()
+
 
 if __name__ == '__main__':
+    args = parse_args()
+    if args.group == "all":
+        queues, concurrency = ALL_QUEUES, None
+    else:
+        queues, concurrency = QUEUE_GROUPS[args.group]
+    if args.queues:
+        queues = [queue.strip() for queue in args.queues.split(",") if queue.strip()]
+    concurrency = args.concurrency or concurrency
+
     print("=" * 60)
     print("🔄 Celery Worker")
     print("=" * 60)
     print(f"\n📋 配置:")
     print(f"   Broker: {celery_app.conf.broker_url}")
     print(f"   Backend: {celery_app.conf.result_backend}")
+    print(f"   队列: {','.join(queues)}")
+    print(f"   并发: {concurrency or '默认'}")
     print(f"\n📝 已注册任务:")
     for task_name in sorted(celery_app.tasks.keys()):
         if not task_name.startswith('celery.'):
@@ -27,10 +72,15 @@ if __name__ == '__main__':
     print(f"\n⚡ 启动 Worker...")
     print("=" * 60 + "\n")
 
+    argv = ['worker', '--loglevel=info', '-Q', ','.join(queues)]
     # 启动worker（Windows 兼容：使用 solo pool）
     import platform
     if platform.system() == 'Windows':
         print("⚠️  检测到 Windows 环境，使用 solo pool（单进程模式）")
-        celery_app.worker_main(['worker', '--loglevel=info', '--pool=solo', '-Q', 'celery,briefing'])
-    else:
-        celery_app.worker_main(['worker', '--loglevel=info', '-Q', 'celery,briefing'])
+        argv.append('--pool=solo')
+    elif concurrency:
+        argv.append(f'--concurrency={concurrency}')
+    if args.group != "all" and not args.queues:
+        # 同一台机器上启动多个分组时节点名不能重复
+        argv.append(f'--hostname={args.group}@%h')
+    celery_app.worker_main(argv)
@@ -0,0 +1,60 @@
+"""
+持续采集守护进程（不使用 Celery 时的替代方案）
+按 INGESTION_INTERVAL 轮询消息源，新文章到达后立即抓取、保存并总结
+"""
+
+import asyncio
+from datetime import datetime
+from dotenv import load_dotenv
+
+# 加载环境变量
+load_dotenv()
+
+from services.ai_summary_service import AISummaryService
+from services.ingestion_service import IngestionService
+from repositories.news_repository import NewsRepository
+from config.settings import get_settings
+
+
+async def main():
+    """主函数"""
+    settings = get_settings()
+
+    print("=" * 60)
+    print("📡 持续采集")
+    print("=" * 60)
+
+    if not settings.DATABASE_URL:
+        print("❌ 错误: DATABASE_URL 环境变量未设置（采集结果需要写入数据库）")
+        return
+
+    try:
+        ai_service = AISummaryService.from_settings(settings)
+    except ValueError as e:
+        print(f"❌ 错误: {e}")
+        return
+
+    # 整个进程复用同一个 AI 服务（保留自适应并发与提供商健康统计）
+    service = IngestionService.from_settings(settings, ai_service, NewsRepository())
+
+    print(f"\n📋 配置:")
+    print(f"   轮询间隔: {settings.INGESTION_INTERVAL} 秒")
+    print(f"   每次检查: {settings.INGESTION_MAX_ARTICLES} 篇")
+    print("\n按 Ctrl+C 停止\n")
+
+    while True:
+        started = asyncio.get_running_loop().time()
+        try:
+            result = await service.poll(limit=settings.INGESTION_MAX_ARTICLES)
+            print(f"[{datetime.now():%H:%M:%S}] ✅ 新抓取 {result['fetched']} 篇，完成总结 {result['summarized']} 篇")
+        except Exception as e:
+            print(f"[{datetime.now():%H:%M:%S}] ❌ 采集失败: {e}")
+        elapsed = asyncio.get_running_loop().time() - started
+        await asyncio.sleep(max(0.0, settings.INGESTION_INTERVAL - elapsed))
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 已停止")
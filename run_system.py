@@ -16,7 +16,7 @@ from services.ai_summary_service import AISummaryService
 from repositories.news_repository import NewsRepository
 from cache.cache_repository import CacheRepository
 from cache.redis_client import RedisClient
-from config.settings import get_settings, get_ai_settings
+from config.settings import get_settings, get_ai_providers
 
 
 async def main():
@@ -27,12 +27,13 @@ async def main():
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION}")
     print("=" * 60)
 
-    # 获取 AI 配置
+    # 获取 AI 配置（支持多提供商池）
     try:
-        api_key, base_url, model = get_ai_settings()
+        providers = get_ai_providers()
         print(f"\n🤖 AI 配置:")
-        print(f"   API: {base_url}")
-        print(f"   模型: {model}")
+        for provider in providers:
+            print(f"   [{provider['name']}] API: {provider['base_url']}  模型: {provider['model']}  "
+                  f"权重: {provider.get('weight', 1)}")
     except ValueError as e:
         print(f"❌ 错误: {e}")
         print("   请在 .env 文件中设置 AI_API_KEY")
@@ -50,12 +51,7 @@ async def main():
     print(f"   Redis: {'✅' if use_redis else '❌'}")
 
     # 初始化 AI 服务
-    ai_service = AISummaryService(
-        api_key=api_key,
-        base_url=base_url,
-        model=model,
-        max_concurrent=settings.AI_SUMMARY_CONCURRENT
-    )
+    ai_service = AISummaryService.from_settings(settings)
 
     news_repo = None
     if use_db:
@@ -122,6 +118,11 @@ async def main():
             print("📝 每日汇总:")
             print(f"   {briefing.ai_summary}\n")
 
+        usage = ai_service.usage.summary()
+        if usage["calls"]:
+            print(f"📊 大模型调用: {usage['calls']} 次（失败 {usage['failed_calls']}，重试 {usage['retries']}），"
+                  f"{usage['total_tokens']} tokens，P50 {usage['latency_p50_ms']}ms / P95 {usage['latency_p95_ms']}ms\n")
+
         # 保存到JSON
         news_service.save_briefing_to_json(briefing)
 
@@ -0,0 +1,82 @@
+"""
+历史早报回填脚本
+为日期区间内缺少早报的日期补生成早报（已存在的日期跳过，可重复执行）
+
+用法:
+    python scripts/backfill.py --start 2026-01-01 --end 2026-01-07
+    python scripts/backfill.py --start 2026-01-01 --end 2026-01-07 --celery   # 提交到 Celery 后台执行
+"""
+
+import sys
+import os
+import asyncio
+import argparse
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from config.settings import get_settings
+from utils.validation import validate_date_format
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="回填历史早报")
+    parser.add_argument("--start", required=True, help="开始日期（YYYY-MM-DD）")
+    parser.add_argument("--end", help="结束日期（YYYY-MM-DD），默认与开始日期相同")
+    parser.add_argument("--sources", default="aibase", help="消息源，多个用逗号分隔（默认 aibase）")
+    parser.add_argument("--limit", type=int, help="每份早报最多包含的文章数（默认 CRAWLER_MAX_ARTICLES）")
+    parser.add_argument("--celery", action="store_true", help="提交到 Celery 后台执行")
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    settings = get_settings()
+    end = args.end or args.start
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+
+    print("=" * 60)
+    print("🗓️  历史早报回填")
+    print("=" * 60)
+
+    if not validate_date_format(args.start) or not validate_date_format(end):
+        print("❌ 错误: 日期格式应为 YYYY-MM-DD")
+        return
+    if not settings.DATABASE_URL:
+        print("❌ 错误: DATABASE_URL 环境变量未设置（回填结果需要写入数据库）")
+        return
+
+    if args.celery:
+        from tasks.backfill import backfill_briefings_task
+        task = backfill_briefings_task.delay(args.start, end, sources=sources, limit=args.limit)
+        print(f"\n🚀 已提交回填任务: {task.id}")
+        return
+
+    from services.ai_summary_service import AISummaryService
+    from services.backfill_service import BackfillService
+    from repositories.news_repository import NewsRepository
+
+    service = BackfillService.from_settings(settings, AISummaryService.from_settings(settings), NewsRepository())
+    try:
+        result = asyncio.run(service.backfill(
+            args.start, end, sources=sources, limit=args.limit or settings.CRAWLER_MAX_ARTICLES
+        ))
+    except ValueError as e:
+        print(f"❌ 错误: {e}")
+        return
+
+    print("\n" + "=" * 60)
+    print("✅ 回填完成！")
+    for date, status in result["dates"].items():
+        print(f"   {date}: {status}")
+    print(f"   新生成: {result['created']} 天，已存在: {result['skipped']} 天，"
+          f"无文章: {result['empty']} 天，失败: {result['failed']} 天")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
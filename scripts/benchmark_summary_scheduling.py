@@ -0,0 +1,112 @@
+"""
+文章总结调度基准测试
+使用桩（stub）大模型对比「按列表顺序」与「最长优先」两种调度的整批耗时（makespan）
+
+用法：
+    python scripts/benchmark_summary_scheduling.py [--articles 40] [--concurrent 5] [--rounds 5]
+"""
+
+import sys
+import os
+import time
+import random
+import asyncio
+import argparse
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import Article, SourceType
+from services.ai_summary_service import AISummaryService
+from services.llm_providers import LLMProvider
+from utils.text import estimate_tokens
+
+
+class StubChatCompletions:
+    """桩 chat.completions：耗时与输入 token 数成正比，不访问网络"""
+
+    def __init__(self, base_latency: float, seconds_per_token: float):
+        self.base_latency = base_latency
+        self.seconds_per_token = seconds_per_token
+
+    def create(self, model, messages, **kwargs):
+        tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        time.sleep(self.base_latency + tokens * self.seconds_per_token)
+        message = type("Message", (), {"content": "stub summary"})()
+        choice = type("Choice", (), {"message": message})()
+        return type("Response", (), {"choices": [choice]})()
+
+
+def make_articles(count: int, seed: int) -> list:
+    """按对数正态分布生成文章长度（大多数几百字，少数几千字的长文）"""
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        length = int(min(12000, max(200, rng.lognormvariate(7.0, 0.8))))
+        articles.append(Article(
+            title=f"文章 {i}",
+            content="测" * length,
+            source_url=f"https://example.com/news/{i}",
+            source_type=SourceType.CUSTOM,
+        ))
+    return articles
+
+
+def make_service(concurrent: int, base_latency: float, seconds_per_token: float) -> AISummaryService:
+    """创建使用桩大模型、固定并发数的服务（排除 AIMD 调整对结果的影响）"""
+    provider = LLMProvider(
+        name="stub",
+        api_key="stub",
+        max_concurrent=concurrent,
+        max_concurrent_limit=concurrent,
+    )
+    provider.client.chat = type("Chat", (), {})()
+    provider.client.chat.completions = StubChatCompletions(base_latency, seconds_per_token)
+    return AISummaryService(providers=[provider], max_retries=0)
+
+
+async def run_once(articles: list, longest_first: bool, args) -> float:
+    """运行一轮并返回整批耗时（秒）"""
+    service = make_service(args.concurrent, args.base_latency, args.seconds_per_token)
+    batch = [article.model_copy() for article in articles]
+    start = time.perf_counter()
+    await service.batch_generate_summaries(batch, longest_first=longest_first)
+    elapsed = time.perf_counter() - start
+    assert [a.source_url for a in batch] == [a.source_url for a in articles], "结果顺序被打乱"
+    return elapsed
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="文章总结调度基准测试")
+    parser.add_argument("--articles", type=int, default=40, help="每轮文章数")
+    parser.add_argument("--concurrent", type=int, default=5, help="并发数")
+    parser.add_argument("--rounds", type=int, default=5, help="轮数（每轮不同的长度分布样本）")
+    parser.add_argument("--base-latency", type=float, default=0.05, help="每次调用的固定延迟（秒）")
+    parser.add_argument("--seconds-per-token", type=float, default=0.0001, help="每个输入 token 的延迟（秒）")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 文章总结调度基准测试（桩大模型）")
+    print("=" * 60)
+    print(f"   文章数: {args.articles}  并发数: {args.concurrent}  轮数: {args.rounds}")
+
+    fifo_total = 0.0
+    lpt_total = 0.0
+    for round_index in range(args.rounds):
+        articles = make_articles(args.articles, seed=round_index)
+        fifo = await run_once(articles, longest_first=False, args=args)
+        lpt = await run_once(articles, longest_first=True, args=args)
+        fifo_total += fifo
+        lpt_total += lpt
+        print(f"   第 {round_index + 1} 轮: 列表顺序 {fifo:.2f}s  最长优先 {lpt:.2f}s  "
+              f"缩短 {(1 - lpt / fifo):.1%}")
+
+    print("\n" + "=" * 60)
+    print(f"平均整批耗时: 列表顺序 {fifo_total / args.rounds:.2f}s  最长优先 {lpt_total / args.rounds:.2f}s  "
+          f"缩短 {(1 - lpt_total / fifo_total):.1%}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
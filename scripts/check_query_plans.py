@@ -0,0 +1,154 @@
+"""
+查询计划检查
+在 SQLite 上执行仓储层的常用查询，用 EXPLAIN QUERY PLAN 检查每条 SELECT 的执行计划，
+出现全表扫描（SCAN <表>，未使用索引）时以非零状态退出，用于发现缺失索引导致的性能退化
+
+用法：
+    python scripts/check_query_plans.py [--database-url sqlite:///news.db]
+
+不指定 --database-url 时使用临时数据库（按模型建表并执行迁移）
+"""
+
+import sys
+import os
+import re
+import tempfile
+import argparse
+from datetime import datetime, timedelta
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, ArticleDB, DailyBriefingDB, BriefingArticle, SourceTypeEnum, ArticleStatusEnum
+from database.migrations import run_migrations
+from repositories.news_repository import NewsRepository
+
+# 全表扫描：SCAN articles / SCAN TABLE articles（旧版 SQLite），不含 USING INDEX
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?\w+( AS \w+)?$")
+
+SAMPLE_DATE = "2026-01-15"
+SAMPLE_ARTICLE_ID = "0" * 32
+
+# (名称, 查询)：仓储层的常用查询
+HOT_QUERIES = [
+    ("get_articles_for_summarization", lambda repo: repo.get_articles_for_summarization(since=SAMPLE_DATE, limit=100)),
+    ("get_processed_articles", lambda repo: repo.get_processed_articles(datetime.now() - timedelta(hours=24), limit=50)),
+    ("get_source_watermarks", lambda repo: repo.get_source_watermarks("aibase")),
+    ("search_articles", lambda repo: repo.search_articles("人工智能 芯片")),
+    ("get_articles_by_ids", lambda repo: repo.get_articles_by_ids([SAMPLE_ARTICLE_ID, "1" * 32])),
+    ("get_daily_briefing", lambda repo: repo.get_daily_briefing(SAMPLE_DATE)),
+    ("get_latest_briefing", lambda repo: repo.get_latest_briefing(include_content=False)),
+    ("list_briefings", lambda repo: repo.list_briefings(limit=10)),
+    ("list_briefings(cursor)", lambda repo: repo.list_briefings(limit=10, before=SAMPLE_DATE)),
+    ("get_briefing_dates", lambda repo: repo.get_briefing_dates("2026-01-01", "2026-01-31")),
+    ("get_briefings_by_article", lambda repo: repo.get_briefings_by_article(SAMPLE_ARTICLE_ID)),
+    ("get_checkpoint", lambda repo: repo.get_checkpoint(SAMPLE_DATE)),
+    ("get_task_logs", lambda repo: repo.get_task_logs(limit=50)),
+    ("get_task_logs(task_name)", lambda repo: repo.get_task_logs(task_name="daily_briefing", limit=50)),
+    ("get_llm_usage_logs", lambda repo: repo.get_llm_usage_logs(limit=30)),
+    ("get_llm_usage_logs(task_name)", lambda repo: repo.get_llm_usage_logs(task_name="daily_briefing", limit=30)),
+    ("get_unattached_llm_usage_logs",
+     lambda repo: repo.get_unattached_llm_usage_logs("summarize_article", SAMPLE_DATE)),
+]
+
+
+def seed(session_factory):
+    """写入一份早报及其文章，让按早报加载文章的联表查询也会被执行"""
+    session = session_factory()
+    try:
+        if not session.query(DailyBriefingDB).filter_by(date=SAMPLE_DATE).first():
+            session.add(ArticleDB(
+                id=SAMPLE_ARTICLE_ID, title="示例文章", content="示例内容", source_url="https://example.com/0",
+                source_type=SourceTypeEnum.AIBASE, status=ArticleStatusEnum.COMPLETED
+            ))
+            briefing = DailyBriefingDB(date=SAMPLE_DATE, title="示例早报", article_ids=[SAMPLE_ARTICLE_ID], total_count=1)
+            session.add(briefing)
+            session.flush()
+            session.add(BriefingArticle(briefing_id=briefing.id, position=0, article_id=SAMPLE_ARTICLE_ID))
+        session.commit()
+    finally:
+        session.close()
+
+
+def capture_selects(engine, session_factory, query) -> list:
+    """执行一个仓储查询，返回其中的 SELECT 语句 [(sql, 参数)]"""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    session = session_factory()
+    try:
+        query(NewsRepository(session))
+        session.rollback()
+    finally:
+        session.close()
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return statements
+
+
+def explain(engine, statement: str, parameters) -> list:
+    """执行计划明细（EXPLAIN QUERY PLAN 的 detail 列）"""
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查常用查询的执行计划（SQLite）")
+    parser.add_argument("--database-url", help="SQLite 数据库地址，默认使用临时数据库")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.database_url
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'query_plans.db')}"
+    if not url.startswith("sqlite"):
+        print(f"❌ 只支持 SQLite: {url}")
+        sys.exit(2)
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    session_factory = sessionmaker(bind=engine)
+    seed(session_factory)
+
+    print("=" * 60)
+    print("🔍 查询计划检查")
+    print("=" * 60)
+
+    failures = []
+    for name, query in HOT_QUERIES:
+        statements = capture_selects(engine, session_factory, query)
+        scans = []
+        print(f"\n📋 {name}")
+        for statement, parameters in statements:
+            for detail in explain(engine, statement, parameters):
+                full_scan = bool(FULL_SCAN.match(detail))
+                print(f"   {'❌' if full_scan else '  '} {detail}")
+                if full_scan:
+                    scans.append(detail)
+        if scans:
+            failures.append((name, scans))
+
+    engine.dispose()
+    if tmpdir:
+        tmpdir.cleanup()
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"❌ {len(failures)} 个查询存在全表扫描:")
+        for name, scans in failures:
+            print(f"   - {name}: {'; '.join(scans)}")
+        sys.exit(1)
+    print(f"✅ {len(HOT_QUERIES)} 个查询均使用了索引")
+
+
+if __name__ == '__main__':
+    main()
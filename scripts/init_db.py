@@ -42,13 +42,25 @@ def main():
 
     try:
         print("\n🔧 开始初始化数据库...")
-        init_db()
+        applied = init_db()
         print("✅ 数据库初始化成功！")
 
         print("\n📊 已创建以下表:")
         print("   - articles         文章表")
         print("   - daily_briefings  每日早报表")
+        print("   - briefing_articles 早报文章关联表")
+        print("   - briefing_checkpoints 早报生成检查点表")
         print("   - task_logs        任务日志表")
+        print("   - llm_usage_logs   大模型调用统计表")
+        print("   - schema_migrations 数据库迁移记录表")
+        print("   - articles_fts     文章检索索引（SQLite；MySQL 为 articles 上的 FULLTEXT 索引）")
+
+        if applied:
+            print(f"\n🔄 已执行 {len(applied)} 个迁移:")
+            for version in applied:
+                print(f"   - {version}")
+        else:
+            print("\n✅ 数据库结构已是最新，没有需要执行的迁移")
 
         print("\n" + "=" * 60)
         print("✅ 初始化完成！")
@@ -3,11 +3,81 @@ AI 总结服务
 支持 OpenAI 格式的大模型 API
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple, Callable, Awaitable
+from email.utils import parsedate_to_datetime
 import asyncio
-from openai import OpenAI
+import random
+import threading
+import time
+import openai
 from core.models import Article, ArticleStatus
 from core.constants import AI_SUMMARY_SYSTEM_PROMPT
+from config.settings import get_ai_providers_config
+from services.llm_providers import LLMProvider, ProviderPool
+from services.hedging import RequestHedger
+from services.single_flight import SingleFlight, RedisSingleFlight, content_key
+from services.extractive_summary import ExtractiveSummarizer
+from services.llm_metrics import (
+    LLMUsageTracker, current_usage_tracker,
+    OUTCOME_SUCCESS, OUTCOME_RATE_LIMITED, OUTCOME_TIMEOUT, OUTCOME_ERROR, OUTCOME_CANCELLED
+)
+from utils.text import estimate_tokens
+
+
+def _parse_retry_after(error: Exception) -> Optional[float]:
+    """从错误响应头中解析 Retry-After（秒）"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _classify_error(error: Exception) -> Tuple[bool, bool, Optional[float]]:
+    """
+    判断调用失败的类型
+
+    Returns:
+        (是否过载, 是否可重试, Retry-After 秒数)
+    """
+    if isinstance(error, openai.RateLimitError):
+        return True, True, _parse_retry_after(error)
+    if isinstance(error, openai.APITimeoutError):
+        return True, True, None
+    if isinstance(error, openai.APIConnectionError):
+        return False, True, None
+    if isinstance(error, openai.APIStatusError) and error.status_code >= 500:
+        return False, True, _parse_retry_after(error)
+    return False, False, None
+
+
+def _error_outcome(error: BaseException) -> str:
+    """将调用异常归类为埋点中的调用结果"""
+    if isinstance(error, asyncio.CancelledError):
+        return OUTCOME_CANCELLED
+    if isinstance(error, openai.RateLimitError):
+        return OUTCOME_RATE_LIMITED
+    if isinstance(error, openai.APITimeoutError):
+        return OUTCOME_TIMEOUT
+    return OUTCOME_ERROR
 
 
 class AISummaryService:
@@ -15,10 +85,19 @@ class AISummaryService:
 
     def __init__(
         self,
-        api_key: str,
+        api_key: Optional[str] = None,
         base_url: str = "https://api.openai.com/v1",
         model: str = "gpt-3.5-turbo",
-        max_concurrent: int = 10
+        max_concurrent: int = 10,
+        max_concurrent_limit: Optional[int] = None,
+        max_retries: int = 3,
+        timeout: float = 60.0,
+        providers: Optional[List[LLMProvider]] = None,
+        hedger: Optional[RequestHedger] = None,
+        extractive_fallback: bool = True,
+        max_input_tokens: Optional[int] = None,
+        summary_deadline: Optional[float] = None,
+        daily_delta_max_changes: int = 3
     ):
         """
         初始化 AI 总结服务
@@ -27,7 +106,16 @@ class AISummaryService:
             api_key: API 密钥
             base_url: API 基础 URL（支持任何兼容 OpenAI 格式的 API）
             model: 模型名称
-            max_concurrent: 最大并发数
+            max_concurrent: 初始并发数（运行时根据 429 / 超时自适应调整）
+            max_concurrent_limit: 自适应并发的上限，默认为初始并发数的 4 倍
+            max_retries: 单次调用失败后的最大重试次数
+            timeout: 单次请求超时（秒）
+            providers: 提供商池；传入后忽略 api_key/base_url/model，按延迟和错误率路由
+            hedger: 请求对冲策略，为 None 时不对冲
+            extractive_fallback: 大模型失败或超过截止时间时，是否使用本地抽取式摘要兜底
+            max_input_tokens: 文章估算 token 数超过该值时，先用抽取式摘要压缩再送入大模型
+            summary_deadline: 批量总结的默认截止时间（秒）
+            daily_delta_max_changes: 每日总结增量更新的最大变化文章数，超过时全量重新生成（0 表示总是全量）
 
         支持的提供商示例：
             - OpenAI: base_url="https://api.openai.com/v1", model="gpt-3.5-turbo"
@@ -35,81 +123,508 @@ class AISummaryService:
             - DeepSeek: base_url="https://api.deepseek.com/v1", model="deepseek-chat"
             - 通义千问: base_url="https://dashscope.aliyuncs.com/compatible-mode/v1", model="qwen-turbo"
         """
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
-        self.model = model
+        if not providers:
+            if not api_key:
+                raise ValueError("未配置 AI API 密钥")
+            providers = [LLMProvider(
+                name="default",
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                max_concurrent=max_concurrent,
+                max_concurrent_limit=max_concurrent_limit,
+                timeout=timeout
+            )]
+
+        self.pool = ProviderPool(providers)
+        # 主提供商（兼容直接访问 client/model 的旧代码）
+        self.client = providers[0].client
+        self.model = providers[0].model
         self.system_prompt = AI_SUMMARY_SYSTEM_PROMPT
         self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.hedger = hedger
+        # 相同内容的并发总结请求合并（进程内；attach_cache 后扩展到跨进程）
+        self.single_flight = SingleFlight()
+        self.distributed_flight: Optional[RedisSingleFlight] = None
+        # 本地抽取式摘要（兜底与长文压缩）
+        self.extractive = ExtractiveSummarizer()
+        self.extractive_fallback = extractive_fallback
+        self.max_input_tokens = max_input_tokens
+        self.summary_deadline = summary_deadline
+        self.daily_delta_max_changes = daily_delta_max_changes
+        # 调用埋点（token 用量、延迟、重试、结果）：进程内的全部调用；
+        # 各任务在 llm_metrics.track_usage 中另外单独统计，按任务汇总后入库
+        self.usage = LLMUsageTracker()
+
+    @classmethod
+    def from_settings(cls, settings) -> "AISummaryService":
+        """
+        根据配置创建服务（支持 AI_PROVIDERS 多提供商池）
+
+        Raises:
+            ValueError: 如果未配置 AI 密钥
+        """
+        providers = [
+            LLMProvider.from_config(config, timeout=settings.AI_REQUEST_TIMEOUT)
+            for config in get_ai_providers_config(settings)
+        ]
+        hedger = None
+        if settings.AI_HEDGE_ENABLED:
+            hedger = RequestHedger(
+                percentile=settings.AI_HEDGE_PERCENTILE,
+                budget=settings.AI_HEDGE_BUDGET
+            )
+        return cls(
+            max_concurrent=settings.AI_SUMMARY_CONCURRENT,
+            max_concurrent_limit=settings.AI_SUMMARY_MAX_CONCURRENT,
+            max_retries=settings.AI_MAX_RETRIES,
+            timeout=settings.AI_REQUEST_TIMEOUT,
+            providers=providers,
+            hedger=hedger,
+            extractive_fallback=settings.AI_EXTRACTIVE_FALLBACK,
+            max_input_tokens=settings.AI_SUMMARY_MAX_INPUT_TOKENS or None,
+            summary_deadline=settings.AI_SUMMARY_DEADLINE or None,
+            daily_delta_max_changes=settings.DAILY_SUMMARY_DELTA_MAX_CHANGES
+        )
+
+    def _record_usage(self, provider: LLMProvider, messages: List[dict], kind: str, outcome: str,
+                      start: float, attempt: int = 0, hedge: bool = False, usage=None,
+                      completion: Optional[str] = None, error: Optional[BaseException] = None):
+        """
+        记录一次调用的埋点；提供商未返回 usage 时按文本长度估算 token 数
 
-    def _generate_summary_sync(self, content: str) -> Optional[str]:
-        """同步生成单篇文章总结"""
+        被取消的调用（对冲落败、超过截止时间）不再等待结果，但请求已经发出、线程仍会执行完并计费，
+        按估算的输入 token 数计入；在 track_usage 中调用时同时记录到当前任务的记录器
+        """
+        if usage is not None:
+            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        elif outcome == OUTCOME_SUCCESS:
+            prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+            completion_tokens = estimate_tokens(completion or "")
+        elif outcome == OUTCOME_CANCELLED:
+            prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+            completion_tokens = 0
+        else:
+            # 失败的请求是否计费取决于提供商，这里不计入
+            prompt_tokens = completion_tokens = 0
+
+        record = dict(
+            provider=provider.name,
+            model=provider.model,
+            kind=kind,
+            outcome=outcome,
+            latency=time.monotonic() - start,
+            attempt=attempt,
+            hedge=hedge,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            usage_estimated=usage is None and outcome in (OUTCOME_SUCCESS, OUTCOME_CANCELLED),
+            cost=provider.cost(prompt_tokens, completion_tokens),
+            error=str(error)[:200] if error is not None and outcome != OUTCOME_CANCELLED else None
+        )
+        self.usage.record(**record)
+        task_usage = current_usage_tracker()
+        if task_usage is not None:
+            task_usage.record(**record)
+
+    @staticmethod
+    async def _request(provider: LLMProvider, messages: List[dict], params: dict):
+        """
+        在线程中执行一次同步 SDK 调用，线程返回后才归还并发名额（名额由调用方占用）
+
+        取消等待（对冲落败、超过截止时间）并不会中止线程中的 HTTP 请求，
+        若此时就归还名额，实际在途请求数会超过自适应限流器的上限
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": f"文章内容：{content}"}
-                ],
-                top_p=0.7,
-                temperature=0.1,
-                stream=False
+            return await asyncio.to_thread(
+                provider.client.chat.completions.create,
+                model=provider.model,
+                messages=messages,
+                **params
             )
-            return response.choices[0].message.content
+        finally:
+            await provider.limiter.release()
+
+    async def _finish_call(self, provider: LLMProvider, request: asyncio.Future, start: float, messages: List[dict],
+                           kind: str = "summary", attempt: int = 0, hedge: bool = False) -> Optional[str]:
+        """等待一次提供商调用完成并记录健康统计与埋点（被取消时请求本身继续执行至线程返回）"""
+        try:
+            response = await asyncio.shield(request)
+        except asyncio.CancelledError as e:
+            self._record_usage(provider, messages, kind, _error_outcome(e), start, attempt, hedge)
+            raise
         except Exception as e:
-            print(f"    ❌ AI总结失败: {e}")
+            self._record_usage(provider, messages, kind, _error_outcome(e), start, attempt, hedge, error=e)
+            provider.record_failure()
+            overloaded, _, retry_after = _classify_error(e)
+            if overloaded:
+                # Retry-After 由该提供商的限流器统一遵守
+                await provider.limiter.record_overload(retry_after)
+            raise
+
+        latency = time.monotonic() - start
+        content = response.choices[0].message.content
+        self._record_usage(provider, messages, kind, OUTCOME_SUCCESS, start, attempt, hedge,
+                           usage=getattr(response, "usage", None), completion=content)
+        provider.record_success(latency)
+        await provider.limiter.record_success()
+        if self.hedger:
+            self.hedger.record_latency(latency)
+        return content
+
+    async def _call(self, provider: LLMProvider, messages: List[dict], params: dict,
+                    allow_hedge: bool = True, kind: str = "summary", attempt: int = 0,
+                    hedge: bool = False) -> Optional[str]:
+        """
+        在指定提供商上执行一次调用
+
+        启用对冲时，请求开始执行后超过近期延迟分位数仍未返回，
+        则向备用（或同一）提供商发出一份副本，取先成功返回的结果
+        """
+        await provider.limiter.acquire()
+        start = time.monotonic()
+        request = asyncio.ensure_future(self._request(provider, messages, params))
+        # 无人等待结果时（已被取消）避免 "exception was never retrieved" 警告
+        request.add_done_callback(lambda t: t.cancelled() or t.exception())
+        primary = asyncio.ensure_future(self._finish_call(
+            provider, request, start, messages, kind, attempt, hedge
+        ))
+
+        try:
+            if not (self.hedger and allow_hedge):
+                return await primary
+
+            delay = self.hedger.hedge_delay()
+            if delay is None:
+                # 延迟样本不足（预热阶段）不对冲，也不计入对冲预算的基数
+                return await primary
+            self.hedger.request_count += 1
+            await asyncio.wait({primary}, timeout=delay)
+            # 备用提供商没有空闲名额时不对冲（排队的副本无助于降低尾延迟）
+            hedge_provider = self.pool.select(exclude=[provider.name])
+            if (primary.done()
+                    or hedge_provider.limiter.queued >= hedge_provider.limiter.limit
+                    or not self.hedger.try_acquire()):
+                return await primary
+
+            hedge_task = asyncio.ensure_future(self._call(
+                hedge_provider, messages, params, allow_hedge=False, kind=kind, attempt=attempt, hedge=True
+            ))
+            pending = {primary, hedge_task}
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None and task.result():
+                            if task is hedge_task:
+                                self.hedger.hedge_win_count += 1
+                            return task.result()
+            finally:
+                for task in pending:
+                    task.cancel()
+
+            # 两路请求都失败，以主请求的结果为准
+            return await primary
+        finally:
+            # 调用方取消（如超过截止时间）时不再等待主请求
+            if not primary.done():
+                primary.cancel()
+
+    def attach_cache(self, cache_repo):
+        """启用基于 Redis 的跨进程 single-flight（相同内容只总结一次，结果按内容哈希缓存）"""
+        self.distributed_flight = RedisSingleFlight(cache_repo)
+
+    async def _complete(self, messages: List[dict], kind: str = "summary", **params) -> Optional[str]:
+        """
+        调用大模型（延迟感知路由 + 自适应并发 + 请求对冲 + 故障切换 + 失败重试）
+
+        kind 为调用用途（summary / daily_summary），用于埋点统计
+        """
+        last_error = None
+        tried = set()
+
+        for attempt in range(self.max_retries + 1):
+            provider = self.pool.select(exclude=tried)
+            try:
+                return await self._call(provider, messages, params, kind=kind, attempt=attempt)
+            except Exception as e:
+                last_error = e
+                _, retryable, _ = _classify_error(e)
+
+            if attempt >= self.max_retries:
+                break
+
+            tried.add(provider.name)
+            if self.pool.has_alternative(tried):
+                # 还有其他提供商可用，立即切换
+                print(f"    ⚠️ {provider.name} 请求失败（{last_error}），切换提供商 "
+                      f"[{attempt + 1}/{self.max_retries}]")
+                continue
+
+            if not retryable:
+                break
+
+            # 所有提供商均已尝试，指数退避 + 抖动后重试
+            tried.clear()
+            delay = min(30.0, 2 ** attempt) * (0.5 + random.random() / 2)
+            print(f"    ⚠️ AI请求失败（{last_error}），{delay:.1f}s 后重试 "
+                  f"[{attempt + 1}/{self.max_retries}]，当前并发上限: {provider.limiter.limit}")
+            await asyncio.sleep(delay)
+
+        raise last_error
+
+    async def _generate_summary(self, content: str) -> Optional[str]:
+        """生成单篇文章总结（失败时抛出异常）"""
+        return await self._complete(
+            [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": f"文章内容：{content}"}
+            ],
+            top_p=0.7,
+            temperature=0.1,
+            stream=False
+        )
+
+    async def _generate_summary_shared(self, key: str, content: str) -> Optional[str]:
+        """生成单篇文章总结（跨进程合并）"""
+        if self.distributed_flight:
+            return await self.distributed_flight.do(key, lambda: self._generate_summary(content))
+        return await self._generate_summary(content)
+
+    def _fallback_summary(self, content: str) -> Optional[str]:
+        """本地抽取式摘要兜底"""
+        if not self.extractive_fallback:
             return None
+        return self.extractive.summarize(content) or None
 
-    async def generate_summary(self, content: str) -> Optional[str]:
-        """异步生成单篇文章总结"""
-        return await asyncio.to_thread(self._generate_summary_sync, content)
-
-    async def batch_generate_summaries(self, articles: List[Article]) -> List[Article]:
-        """批量生成文章总结（并发执行）"""
-        # 创建任务列表
-        tasks = []
-        for article in articles:
-            if not article.summary:
-                tasks.append(self.generate_summary(article.content))
+    async def _summarize(self, content: str, deadline: Optional[float] = None) -> Tuple[Optional[str], bool]:
+        """
+        生成单篇文章总结
+
+        Args:
+            content: 文章内容
+            deadline: 截止时间（time.monotonic()），超过后改用本地抽取式摘要
+
+        Returns:
+            (总结, 是否由大模型生成)
+        """
+        if deadline is not None and deadline <= time.monotonic():
+            return self._fallback_summary(content), False
+
+        # 超长文章先用抽取式摘要压缩，再送入大模型
+        llm_input = content
+        if self.max_input_tokens and estimate_tokens(content) > self.max_input_tokens:
+            llm_input = self.extractive.compress(content, self.max_input_tokens)
+
+        # 相同内容的并发请求只调用一次大模型
+        key = content_key(self.system_prompt, llm_input)
+        task = asyncio.ensure_future(
+            self.single_flight.do(key, lambda: self._generate_summary_shared(key, llm_input))
+        )
+        try:
+            if deadline is None:
+                summary = await task
             else:
-                tasks.append(None)  # 已有总结的占位
+                # 超过截止时间即取消大模型请求（不在常驻事件循环上留下继续消耗 token 的孤儿任务），当前文章用本地摘要
+                summary = await asyncio.wait_for(task, timeout=deadline - time.monotonic())
+            if summary:
+                return summary, True
+        except asyncio.TimeoutError:
+            print(f"    ⏱️ AI总结超过截止时间，使用本地摘要")
+        except Exception as e:
+            print(f"    ❌ AI总结失败: {e}")
 
-        if not tasks:
-            return articles
+        return self._fallback_summary(content), False
+
+    async def generate_summary(self, content: str) -> Optional[str]:
+        """异步生成单篇文章总结（大模型失败时使用本地抽取式摘要兜底）"""
+        summary, _ = await self._summarize(content)
+        return summary
 
-        # 过滤出需要执行的任务
-        pending_tasks = [t for t in tasks if t is not None]
+    async def batch_generate_summaries(
+        self,
+        articles: List[Article],
+        longest_first: bool = True,
+        deadline_seconds: Optional[float] = None,
+        on_summary: Optional[Callable[[Article], Awaitable[None]]] = None
+    ) -> List[Article]:
+        """
+        批量生成文章总结（并发执行）
 
-        if not pending_tasks:
+        Args:
+            articles: 文章列表
+            longest_first: 按估算 token 数从长到短调度，避免长文章最后启动拖长整批耗时；
+                结果仍按原文章顺序写回
+            deadline_seconds: 整批截止时间（秒），超时未完成的文章使用本地抽取式摘要；
+                默认使用初始化时的 summary_deadline
+            on_summary: 每篇文章总结完成后立即调用（用于逐篇持久化，崩溃后无需重新总结）
+        """
+        # 需要生成总结的文章下标
+        pending = [i for i, article in enumerate(articles) if not article.summary]
+
+        if not pending:
             return articles
 
-        print(f"    🔄 并发生成 {len(pending_tasks)} 篇文章总结（最大并发: {self.max_concurrent}）...")
+        if longest_first:
+            pending.sort(key=lambda i: estimate_tokens(articles[i].content), reverse=True)
+
+        print(f"    🔄 并发生成 {len(pending)} 篇文章总结（当前并发上限: {self.pool.total_limit}）...")
 
-        # 使用 Semaphore 限制并发数
-        semaphore = asyncio.Semaphore(self.max_concurrent)
+        deadline_seconds = deadline_seconds if deadline_seconds is not None else self.summary_deadline
+        deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
 
-        async def limited_task(task):
-            async with semaphore:
-                return await task
+        async def summarize(index: int) -> bool:
+            """总结单篇文章并写回，返回是否使用了本地摘要兜底"""
+            article = articles[index]
+            article.summary, by_llm = await self._summarize(article.content, deadline)
+            # 大模型生成成功后更新状态为 completed；本地摘要仅作兜底，保持原状态以便后续重新总结
+            if article.summary and by_llm:
+                article.status = ArticleStatus.COMPLETED
+            if on_summary and article.summary:
+                try:
+                    await on_summary(article)
+                except Exception as e:
+                    print(f"    ⚠️ 保存文章总结失败: {e}")
+            return bool(article.summary) and not by_llm
 
-        # 并发执行所有任务
-        results = await asyncio.gather(*[limited_task(t) for t in pending_tasks])
+        # 并发执行所有任务（并发数由自适应限流器控制，按创建顺序获取并发名额）
+        fallbacks = await asyncio.gather(*[summarize(i) for i in pending])
 
-        # 将结果赋值回文章
-        result_index = 0
-        for i, article in enumerate(articles):
-            if tasks[i] is not None:  # 需要生成总结的
-                article.summary = results[result_index]
-                # 生成成功后更新状态为 completed
-                if article.summary:
-                    article.status = ArticleStatus.COMPLETED
-                result_index += 1
+        if len(self.pool.providers) > 1:
+            for stats in self.pool.stats():
+                print(f"    📊 [{stats['name']}] 成功 {stats['success_count']} / 失败 {stats['failure_count']}，"
+                      f"平均延迟 {stats['latency_ewma']}s，并发上限 {stats['limit']}")
+        if self.hedger:
+            stats = self.hedger.stats()
+            print(f"    📊 对冲请求 {stats['hedges']}/{stats['requests']}（对冲率 {stats['hedge_rate']:.1%}，"
+                  f"胜出率 {stats['win_rate']:.1%}）")
+
+        fallback_count = sum(fallbacks)
+        if fallback_count:
+            print(f"    ⚠️ {fallback_count} 篇文章使用本地抽取式摘要兜底")
 
         return articles
 
-    def _generate_daily_summary_sync(self, titles_and_summaries: str) -> Optional[str]:
-        """同步生成每日早报整体总结"""
+    async def _stream_complete(self, messages: List[dict], on_text: Callable[[str], Awaitable[None]],
+                               kind: str = "daily_summary", **params) -> Optional[str]:
+        """
+        流式调用大模型
+
+        每收到一批新 token，就以「当前已生成的完整文本」调用一次 on_text（失败时抛出异常）。
+        被取消或 on_text 失败时通知线程停止读取，但与 _request 相同，并发名额在线程返回后才归还
+        """
+        provider = self.pool.select()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        stop = threading.Event()
+        # 请求在最后一个分片中返回 usage（include_usage），未返回时按文本长度估算
+        usage = []
+
+        def consume():
+            """在线程中消费流式响应，把增量投递回事件循环"""
+            try:
+                stream = provider.client.chat.completions.create(
+                    model=provider.model,
+                    messages=messages,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **params
+                )
+                try:
+                    for chunk in stream:
+                        if stop.is_set():
+                            break
+                        if getattr(chunk, "usage", None):
+                            usage.append(chunk.usage)
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            loop.call_soon_threadsafe(queue.put_nowait, chunk.choices[0].delta.content)
+                finally:
+                    close = getattr(stream, "close", None)
+                    if stop.is_set() and close:
+                        close()
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+        async def run_stream():
+            try:
+                await asyncio.to_thread(consume)
+            finally:
+                await provider.limiter.release()
+
+        parts = []
+        await provider.limiter.acquire()
+        start = time.monotonic()
+        worker = asyncio.ensure_future(run_stream())
+        # 提前放弃等待时，线程中的异常不再关心
+        worker.add_done_callback(lambda t: t.cancelled() or t.exception())
+        try:
+            done = False
+            while not done:
+                item = await queue.get()
+                # 合并已到达的增量，减少下游写入次数
+                while True:
+                    if item is finished:
+                        done = True
+                        break
+                    parts.append(item)
+                    if queue.empty():
+                        break
+                    item = queue.get_nowait()
+                if parts:
+                    await on_text("".join(parts))
+        except BaseException:
+            # 被取消或 on_text 失败：请求已发出并计费，按估算的输入 token 记为取消
+            stop.set()
+            self._record_usage(provider, messages, kind, OUTCOME_CANCELLED, start)
+            raise
+
+        try:
+            await worker
+        except Exception as e:
+            self._record_usage(provider, messages, kind, _error_outcome(e), start, error=e)
+            provider.record_failure()
+            overloaded, _, retry_after = _classify_error(e)
+            if overloaded:
+                await provider.limiter.record_overload(retry_after)
+            raise
+
+        self._record_usage(provider, messages, kind, OUTCOME_SUCCESS, start,
+                           usage=usage[-1] if usage else None, completion="".join(parts))
+        provider.record_success(time.monotonic() - start)
+        await provider.limiter.record_success()
+
+        return "".join(parts)
+
+    async def _complete_daily_summary(
+        self,
+        messages: List[dict],
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Optional[str]:
+        """请求每日总结（有回调时流式生成，失败后改用普通请求）"""
+        if on_text:
+            try:
+                return await self._stream_complete(messages, on_text, temperature=0.3, max_tokens=200)
+            except Exception as e:
+                print(f"    ⚠️ 流式生成每日总结失败（{e}），改用普通请求")
+
+        try:
+            result = await self._complete(messages, kind="daily_summary", temperature=0.3, max_tokens=200)
+            if on_text and result:
+                await on_text(result)
+            return result
+        except Exception as e:
+            print(f"    ❌ 生成每日总结失败: {e}")
+            return None
+
+    async def _generate_daily_summary(
+        self,
+        titles_and_summaries: str,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Optional[str]:
+        """生成每日早报整体总结"""
         prompt = f"""
                 请基于以下文章列表，生成一份简短的早报汇总（3-5句话）：
 
@@ -120,27 +635,87 @@ class AISummaryService:
                 2. 每条一句话概括
                 3. 总字数不超过100字
                 """
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "你是一个专业的新闻编辑，擅长提炼资讯要点。"},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=200
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"    ❌ 生成每日总结失败: {e}")
-            return None
+        messages = [
+            {"role": "system", "content": "你是一个专业的新闻编辑，擅长提炼资讯要点。"},
+            {"role": "user", "content": prompt}
+        ]
+        return await self._complete_daily_summary(messages, on_text)
 
-    async def generate_daily_summary(self, articles: List[Article]) -> Optional[str]:
-        """生成每日早报整体总结"""
+    async def _update_daily_summary(
+        self,
+        previous_summary: str,
+        added: List[dict],
+        removed: List[dict],
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Optional[str]:
+        """根据新增/移除的文章增量更新每日总结（只发送变化部分）"""
+        added_text = "\n".join(
+            f"{i+1}. {item['title']}\n{item['summary']}" for i, item in enumerate(added)
+        ) or "无"
+        removed_text = "\n".join(f"- {item['title']}" for item in removed) or "无"
+        prompt = f"""
+                以下是今日早报的现有汇总：
+
+                {previous_summary}
+
+                文章列表有更新。
+                新增文章：
+                {added_text}
+
+                移除文章：
+                {removed_text}
+
+                要求：
+                1. 在现有汇总的基础上更新，删去只与移除文章有关的内容
+                2. 新增文章比现有内容更重要时才纳入
+                3. 保持3-5句话、总字数不超过100字，只输出更新后的汇总
+                """
+        messages = [
+            {"role": "system", "content": "你是一个专业的新闻编辑，擅长提炼资讯要点。"},
+            {"role": "user", "content": prompt}
+        ]
+        return await self._complete_daily_summary(messages, on_text)
+
+    @staticmethod
+    def daily_summary_items(articles: List[Article]) -> List[dict]:
+        """
+        计算每篇文章对每日总结的贡献项（按早报顺序）
+
+        key 为标题+总结的内容指纹，用于判断两次生成之间哪些文章发生了变化
+        """
+        return [
+            {
+                "key": content_key(article.title, article.summary or ""),
+                "title": article.title,
+                "summary": article.summary or "",
+            }
+            for article in articles
+        ]
+
+    async def generate_daily_summary(
+        self,
+        articles: List[Article],
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+        previous: Optional[dict] = None
+    ) -> Optional[str]:
+        """
+        生成每日早报整体总结
+
+        Args:
+            articles: 文章列表
+            on_text: 流式回调，每收到新 token 时以当前已生成的完整文本调用（用于边生成边发布）
+            previous: 上次生成的状态 {"items": daily_summary_items(...), "summary": 上次总结}；
+                文章及顺序均未变化时直接复用上次总结，少量变化时只发送增量
+        """
         if not articles:
             print(f"    ⚠️ 文章列表为空，无法生成每日总结")
             return None
 
+        if previous and previous.get("summary"):
+            result = await self._generate_daily_summary_incremental(articles, previous, on_text)
+            if result:
+                return result
+
         print(f"    📝 正在生成每日总结（共 {len(articles)} 篇文章）...")
 
         titles_and_summaries = "\n".join([
@@ -148,7 +723,7 @@ class AISummaryService:
             for i, article in enumerate(articles)
         ])
 
-        result = await asyncio.to_thread(self._generate_daily_summary_sync, titles_and_summaries)
+        result = await self._generate_daily_summary(titles_and_summaries, on_text)
 
         if result:
             print(f"    ✅ 每日总结生成成功")
@@ -156,3 +731,39 @@ class AISummaryService:
             print(f"    ⚠️ 每日总结生成失败（返回为空）")
 
         return result
+
+    async def _generate_daily_summary_incremental(
+        self,
+        articles: List[Article],
+        previous: dict,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Optional[str]:
+        """尝试复用或增量更新上次的每日总结，需要全量重新生成时返回 None"""
+        items = self.daily_summary_items(articles)
+        previous_items = previous.get("items") or []
+        keys = [item["key"] for item in items]
+        previous_keys = [item["key"] for item in previous_items]
+
+        if keys == previous_keys:
+            print(f"    ⏭️ 文章未变化，复用上次的每日总结")
+            if on_text:
+                await on_text(previous["summary"])
+            return previous["summary"]
+
+        key_set = set(keys)
+        previous_key_set = set(previous_keys)
+        added = [item for item in items if item["key"] not in previous_key_set]
+        removed = [item for item in previous_items if item["key"] not in key_set]
+        changes = len(added) + len(removed)
+
+        # 仅顺序变化、变化过多或几乎全部是新文章时，全量重新生成
+        if changes == 0 or changes > self.daily_delta_max_changes or len(added) >= len(items):
+            return None
+
+        print(f"    📝 正在增量更新每日总结（新增 {len(added)} 篇，移除 {len(removed)} 篇）...")
+        result = await self._update_daily_summary(previous["summary"], added, removed, on_text)
+        if result:
+            print(f"    ✅ 每日总结增量更新成功")
+        else:
+            print(f"    ⚠️ 增量更新失败，改为全量生成")
+        return result
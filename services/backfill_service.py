@@ -0,0 +1,163 @@
+"""
+历史早报回填
+按发布日期发现历史文章，为日期区间内缺少早报的日期补生成早报（已存在的日期直接跳过，可重复执行）
+"""
+
+import asyncio
+from typing import Optional, List, Dict, Any
+
+from adapters.factory import AdapterFactory
+from core.models import Article, ArticleStatus
+from services.news_service import NewsService
+from utils.dates import date_range
+
+
+class BackfillService:
+    """历史早报回填服务"""
+
+    def __init__(
+        self,
+        ai_service,
+        news_repo,
+        max_concurrent_dates: int = 2,
+        fetch_concurrency: int = 5,
+        max_days: int = 31,
+        adapter_factory=None
+    ):
+        """
+        Args:
+            ai_service: AISummaryService 实例
+            news_repo: 新闻数据访问层（回填结果写入数据库，必填）
+            max_concurrent_dates: 同时生成早报的日期数
+            fetch_concurrency: 发现历史文章时的最大并发抓取数
+            max_days: 单次回填最多覆盖的天数
+            adapter_factory: 提供 get_adapter(source)，默认为 AdapterFactory（Worker 中传入运行时以复用适配器实例）
+        """
+        self.ai_service = ai_service
+        self.news_repo = news_repo
+        self.adapter_factory = adapter_factory or AdapterFactory
+        # 不写缓存：回填的是历史日期，不能覆盖「最新早报」缓存
+        self.news_service = NewsService(ai_service=ai_service, news_repo=news_repo, adapter_factory=adapter_factory)
+        self.max_concurrent_dates = max(1, max_concurrent_dates)
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.max_days = max_days
+
+    @classmethod
+    def from_settings(cls, settings, ai_service, news_repo, adapter_factory=None) -> "BackfillService":
+        """根据配置创建回填服务"""
+        return cls(
+            ai_service=ai_service,
+            news_repo=news_repo,
+            adapter_factory=adapter_factory,
+            max_concurrent_dates=settings.BACKFILL_MAX_CONCURRENT_DATES,
+            fetch_concurrency=settings.BACKFILL_FETCH_CONCURRENCY,
+            max_days=settings.BACKFILL_MAX_DAYS
+        )
+
+    async def _discover(self, start_date: str, end_date: str, sources: List[str]) -> Dict[str, List[Article]]:
+        """从各消息源发现日期区间内发布的文章"""
+        grouped: Dict[str, List[Article]] = {}
+        for source in sources:
+            adapter = self.adapter_factory.get_adapter(source)
+            if not adapter:
+                print(f"    ⚠️ 未知的消息源: {source}")
+                continue
+            print(f"\n🔍 从 {source} 发现 {start_date} ~ {end_date} 的文章...")
+            try:
+                found = await adapter.discover_articles_by_date(
+                    start_date, end_date,
+                    watermarks=self.news_repo.get_source_watermarks(adapter.source_type.value),
+                    concurrency=self.fetch_concurrency
+                )
+            except NotImplementedError as e:
+                print(f"    ⚠️ {e}")
+                continue
+            for date, articles in found.items():
+                grouped.setdefault(date, []).extend(articles)
+                print(f"    📅 {date}: {len(articles)} 篇")
+        return grouped
+
+    def _reuse_summaries(self, articles: List[Article]):
+        """复用数据库中已完成的文章总结（每个日期一条 IN 查询，不读取正文）"""
+        existing_by_url = {
+            existing["source_url"]: existing
+            for existing in self.news_repo.get_articles_by_urls(
+                [article.source_url for article in articles], include_content=False)
+        }
+        for article in articles:
+            existing = existing_by_url.get(article.source_url)
+            if existing and existing.get("summary") and existing.get("status") == ArticleStatus.COMPLETED.value:
+                article.summary = existing["summary"]
+                article.status = ArticleStatus.COMPLETED
+
+    async def _build(self, date: str, articles: List[Article], semaphore: asyncio.Semaphore) -> str:
+        """生成单个日期的早报，返回结果状态"""
+        async with semaphore:
+            # 其他回填任务或定时任务可能已生成该日期的早报
+            if self.news_repo.get_daily_briefing(date, include_content=False):
+                return "skipped"
+            try:
+                print(f"\n📥 回填 {date} 的早报（{len(articles)} 篇文章）...")
+                self._reuse_summaries(articles)
+                await self.ai_service.batch_generate_summaries(articles)
+                await self.news_service.build_briefing(date, articles, save_to_db=True, use_cache=False)
+                return "created"
+            except Exception as e:
+                print(f"    ❌ 回填 {date} 失败: {e}")
+                return "failed"
+
+    async def backfill(
+        self,
+        start_date: str,
+        end_date: str,
+        sources: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        回填日期区间（含两端）内缺少的早报
+
+        Args:
+            start_date: 开始日期（YYYY-MM-DD）
+            end_date: 结束日期（YYYY-MM-DD）
+            sources: 消息源列表，默认为 ["aibase"]
+            limit: 每份早报最多包含的文章数（按发布时间取最新的），默认不限制
+
+        Returns:
+            {"status", "dates": {日期: created/skipped/empty/failed}, "created", "skipped", "empty", "failed"}
+        """
+        sources = sources or ["aibase"]
+        dates = date_range(start_date, end_date)
+        if not dates:
+            raise ValueError(f"开始日期 {start_date} 晚于结束日期 {end_date}")
+        if len(dates) > self.max_days:
+            raise ValueError(f"单次最多回填 {self.max_days} 天，当前为 {len(dates)} 天")
+        existing = set(self.news_repo.get_briefing_dates(start_date, end_date))
+        results = {date: "skipped" for date in dates if date in existing}
+        missing = [date for date in dates if date not in existing]
+
+        if missing:
+            print(f"\n🗓️ {start_date} ~ {end_date} 共 {len(dates)} 天，需要回填 {len(missing)} 天")
+            grouped = await self._discover(missing[0], missing[-1], sources)
+
+            semaphore = asyncio.Semaphore(self.max_concurrent_dates)
+            targets: Dict[str, List[Article]] = {}
+            for date in missing:
+                articles = grouped.get(date, [])
+                if articles:
+                    targets[date] = articles[:limit] if limit else articles
+                else:
+                    results[date] = "empty"
+            outcomes = await asyncio.gather(*(
+                self._build(date, articles, semaphore) for date, articles in targets.items()
+            ))
+            results.update(zip(targets, outcomes))
+        else:
+            print(f"\n✅ {start_date} ~ {end_date} 的早报均已存在，无需回填")
+
+        counts = {status: sum(1 for value in results.values() if value == status)
+                  for status in ("created", "skipped", "empty", "failed")}
+        return {
+            "status": "failed" if counts["failed"] else "success",
+            "dates": dict(sorted(results.items())),
+            **counts,
+        }
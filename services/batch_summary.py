@@ -0,0 +1,369 @@
+"""
+离线批量总结
+把待总结的文章写成 OpenAI Batch API 格式的 JSONL，提交批处理任务，轮询完成后批量写回数据库
+
+适用于历史回填、修改提示词后重新总结等不需要实时返回的场景（批处理接口通常有较大的价格折扣）
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+from openai import OpenAI
+
+from core.constants import AI_SUMMARY_SYSTEM_PROMPT
+from services.extractive_summary import ExtractiveSummarizer
+
+# 批处理请求的目标接口
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# 批处理任务状态
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def build_batch_requests(
+    articles: List[dict],
+    model: str,
+    system_prompt: str = AI_SUMMARY_SYSTEM_PROMPT,
+    max_input_tokens: Optional[int] = None
+) -> List[dict]:
+    """
+    构建批处理请求（每篇文章一行，custom_id 为文章ID）
+
+    Args:
+        articles: 文章字典列表（至少包含 id 与 content）
+        model: 模型名称
+        system_prompt: 系统提示词
+        max_input_tokens: 超过该长度的文章先抽取压缩
+    """
+    extractive = ExtractiveSummarizer()
+    requests = []
+    for article in articles:
+        content = article.get("content") or ""
+        if max_input_tokens:
+            content = extractive.compress(content, max_input_tokens)
+        requests.append({
+            "custom_id": article["id"],
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"文章内容：{content}"}
+                ],
+                "top_p": 0.7,
+                "temperature": 0.1,
+            }
+        })
+    return requests
+
+
+def write_jsonl(path: str, rows: List[dict]):
+    """写入 JSONL 文件"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def parse_jsonl(text: str) -> List[dict]:
+    """解析 JSONL 文本（忽略空行）"""
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def parse_batch_output(rows: List[dict]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    解析批处理输出
+
+    Returns:
+        (成功结果 {custom_id: 总结}, 失败结果 {custom_id: 错误信息})
+    """
+    summaries, errors = {}, {}
+    for row in rows:
+        custom_id = row.get("custom_id")
+        if not custom_id:
+            continue
+        response = row.get("response") or {}
+        body = response.get("body") or {}
+        if row.get("error") or response.get("status_code") != 200:
+            error = row.get("error") or body.get("error") or f"HTTP {response.get('status_code')}"
+            errors[custom_id] = json.dumps(error, ensure_ascii=False) if isinstance(error, dict) else str(error)
+            continue
+        try:
+            content = body["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            content = None
+        if content and content.strip():
+            summaries[custom_id] = content.strip()
+        else:
+            errors[custom_id] = "empty response"
+    return summaries, errors
+
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API（及兼容该接口的提供商）"""
+
+    def __init__(self, api_key: str, base_url: str = "https://api.openai.com/v1",
+                 completion_window: str = "24h", timeout: float = 600.0):
+        self.client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+        self.completion_window = completion_window
+
+    def submit(self, input_path: str) -> str:
+        """上传 JSONL 并创建批处理任务，返回任务ID"""
+        with open(input_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+            metadata={"source": "morning_news"}
+        )
+        return batch.id
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """查询任务状态 {"status", "output_file_id", "error_file_id", "request_counts"}"""
+        batch = self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {
+            "status": batch.status,
+            "output_file_id": batch.output_file_id,
+            "error_file_id": batch.error_file_id,
+            "request_counts": {
+                "total": counts.total,
+                "completed": counts.completed,
+                "failed": counts.failed,
+            } if counts else None,
+        }
+
+    def download_results(self, batch_id: str) -> List[dict]:
+        """下载任务输出（含错误文件中的失败请求）"""
+        info = self.retrieve(batch_id)
+        rows = []
+        for file_id in (info["output_file_id"], info["error_file_id"]):
+            if file_id:
+                rows.extend(parse_jsonl(self.client.files.content(file_id).text))
+        return rows
+
+    def cancel(self, batch_id: str):
+        """取消任务"""
+        self.client.batches.cancel(batch_id)
+
+
+class LocalBatchBackend:
+    """
+    本地批处理（替身）
+
+    不依赖提供商的 Batch API：提交时逐行调用普通对话接口（沿用 AISummaryService 的限流与重试），
+    按 Batch API 的输出格式写入结果文件。适用于不支持批处理接口的提供商和本地测试
+    """
+
+    def __init__(self, ai_service, work_dir: str):
+        """
+        Args:
+            ai_service: AISummaryService 实例
+            work_dir: 结果文件目录
+        """
+        self.ai_service = ai_service
+        self.work_dir = work_dir
+
+    def _output_path(self, batch_id: str) -> str:
+        return os.path.join(self.work_dir, f"{batch_id}_output.jsonl")
+
+    async def _run_request(self, row: dict) -> dict:
+        """执行一行请求，返回 Batch API 格式的输出行"""
+        body = dict(row["body"])
+        messages = body.pop("messages")
+        body.pop("model", None)
+        try:
+            content = await self.ai_service._complete(messages, **body)
+            response = {
+                "status_code": 200,
+                "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+            }
+            error = None
+        except Exception as e:
+            response = None
+            error = {"code": type(e).__name__, "message": str(e)}
+        return {
+            "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+            "custom_id": row["custom_id"],
+            "response": response,
+            "error": error,
+        }
+
+    async def _run(self, rows: List[dict]) -> List[dict]:
+        return await asyncio.gather(*(self._run_request(row) for row in rows))
+
+    def submit(self, input_path: str) -> str:
+        """同步执行整个批次并写入结果文件，返回任务ID"""
+        with open(input_path, "r", encoding="utf-8") as f:
+            rows = parse_jsonl(f.read())
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        write_jsonl(self._output_path(batch_id), asyncio.run(self._run(rows)))
+        return batch_id
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """查询任务状态（结果文件存在即为完成）"""
+        if not os.path.exists(self._output_path(batch_id)):
+            return {"status": "failed", "request_counts": None}
+        rows = self.download_results(batch_id)
+        failed = sum(1 for row in rows if row.get("error"))
+        return {
+            "status": "completed",
+            "request_counts": {"total": len(rows), "completed": len(rows) - failed, "failed": failed},
+        }
+
+    def download_results(self, batch_id: str) -> List[dict]:
+        """读取结果文件"""
+        with open(self._output_path(batch_id), "r", encoding="utf-8") as f:
+            return parse_jsonl(f.read())
+
+    def cancel(self, batch_id: str):
+        """本地批次在提交时已执行完毕，无需取消"""
+
+
+class BulkSummarizer:
+    """批量总结流程：选取文章 → 写 JSONL → 提交 → 轮询 → 批量写回"""
+
+    def __init__(
+        self,
+        backend,
+        news_repo,
+        model: str,
+        work_dir: str = "data/batches",
+        poll_interval: float = 60.0,
+        max_wait: float = 86400.0,
+        max_input_tokens: Optional[int] = None
+    ):
+        """
+        Args:
+            backend: 批处理后端（OpenAIBatchBackend / LocalBatchBackend）
+            news_repo: 新闻数据访问层
+            model: 批处理使用的模型
+            work_dir: JSONL 文件目录
+            poll_interval: 轮询间隔（秒）
+            max_wait: 最长等待时间（秒），超时后取消任务
+            max_input_tokens: 超过该长度的文章先抽取压缩
+        """
+        self.backend = backend
+        self.news_repo = news_repo
+        self.model = model
+        self.work_dir = work_dir
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.max_input_tokens = max_input_tokens
+
+    def submit(
+        self,
+        statuses: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        选取文章、写 JSONL 并提交批处理任务
+
+        Args:
+            statuses: 选取的文章状态，默认为 pending/failed；传入 completed 等可在修改提示词后重新总结
+            since: 只处理该日期（YYYY-MM-DD）及之后创建的文章
+            limit: 最多处理的文章数
+
+        Returns:
+            {"batch_id", "article_ids"}，没有需要总结的文章时返回 None
+        """
+        articles = self.news_repo.get_articles_for_summarization(statuses=statuses, since=since, limit=limit)
+        if not articles:
+            print("    ⚠️ 没有需要总结的文章")
+            return None
+
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        input_path = os.path.join(self.work_dir, f"batch_{name}_input.jsonl")
+        write_jsonl(input_path, build_batch_requests(
+            articles, self.model, max_input_tokens=self.max_input_tokens
+        ))
+        print(f"    📝 已写入 {len(articles)} 条批处理请求: {input_path}")
+
+        batch_id = self.backend.submit(input_path)
+        print(f"    🚀 已提交批处理任务: {batch_id}")
+        return {"batch_id": batch_id, "article_ids": [article["id"] for article in articles]}
+
+    def check(self, batch_id: str, deadline: float) -> Optional[Dict[str, Any]]:
+        """
+        查询一次任务状态（不等待）
+
+        Args:
+            batch_id: 任务ID
+            deadline: 最晚等待到的时间（time.time() 时间戳），超过后取消任务
+
+        Returns:
+            任务已结束（或超时）时返回状态信息，仍在执行时返回 None
+        """
+        info = self.backend.retrieve(batch_id)
+        if info["status"] in BATCH_TERMINAL_STATUSES:
+            return info
+        if time.time() >= deadline:
+            print(f"    ⚠️ 批处理任务 {batch_id} 等待超时，取消任务")
+            try:
+                self.backend.cancel(batch_id)
+            except Exception as e:
+                print(f"    ⚠️ 取消批处理任务失败: {e}")
+            return {**info, "status": "timeout"}
+        counts = info.get("request_counts") or {}
+        print(f"    ⏳ 批处理任务 {batch_id}: {info['status']} "
+              f"({counts.get('completed', 0)}/{counts.get('total', 0)})")
+        return None
+
+    def wait(self, batch_id: str) -> Dict[str, Any]:
+        """轮询直到任务结束或超时"""
+        deadline = time.time() + self.max_wait
+        while True:
+            info = self.check(batch_id, deadline)
+            if info is not None:
+                return info
+            time.sleep(self.poll_interval)
+
+    def apply(self, batch_id: str, article_ids: List[str], info: Dict[str, Any]) -> Dict[str, Any]:
+        """下载已结束任务的结果并批量写回数据库"""
+        # 过期的任务仍可能有部分已完成的结果
+        rows = self.backend.download_results(batch_id) if info["status"] in ("completed", "expired") else []
+
+        summaries, errors = parse_batch_output(rows)
+        # 没有返回结果的文章（任务失败、过期、被取消）一并标记为失败，下次重新选取
+        # （重新总结已完成的文章时，失败的文章保留原有总结和 completed 状态）
+        failed_ids = [article_id for article_id in article_ids if article_id not in summaries]
+        updated = self.news_repo.bulk_apply_summaries(summaries, failed_ids)
+        print(f"    ✅ 批处理完成: 成功 {len(summaries)} 篇，失败 {len(failed_ids)} 篇")
+
+        return {
+            "status": info["status"],
+            "batch_id": batch_id,
+            "total": len(article_ids),
+            "succeeded": len(summaries),
+            "failed": len(failed_ids),
+            "updated": updated,
+            "errors": dict(list(errors.items())[:10]),
+        }
+
+    def run(
+        self,
+        statuses: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        执行一次批量总结（提交后在当前线程中等待完成；Celery 任务改为定时重新投递轮询任务，见 tasks.bulk_summarization）
+
+        Args:
+            statuses: 选取的文章状态，默认为 pending/failed；传入 completed 等可在修改提示词后重新总结
+            since: 只处理该日期（YYYY-MM-DD）及之后创建的文章
+            limit: 最多处理的文章数
+        """
+        submitted = self.submit(statuses=statuses, since=since, limit=limit)
+        if not submitted:
+            return {"status": "skipped", "total": 0}
+        info = self.wait(submitted["batch_id"])
+        return self.apply(submitted["batch_id"], submitted["article_ids"], info)
@@ -0,0 +1,149 @@
+"""
+自适应并发控制
+基于 AIMD（加性增、乘性减）动态调整大模型请求并发数
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, Any
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD 自适应并发限制器
+
+    - 请求成功：并发上限加性增长（每完成约一个窗口的请求 +increase_step）
+    - 遇到 429 / 超时：并发上限乘以 decrease_factor
+    - 服务端返回 Retry-After 时，在该时间内暂停发放新的并发名额
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 50,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0
+    ):
+        """
+        Args:
+            initial_limit: 初始并发数
+            min_limit: 并发下限
+            max_limit: 并发上限
+            increase_step: 每个窗口增加的并发数
+            decrease_factor: 过载时的乘性缩减系数
+            decrease_cooldown: 两次缩减之间的最小间隔（秒），避免同一波 429 连续缩减
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiting = 0
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._condition_obj: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.success_count = 0
+        self.overload_count = 0
+
+    @property
+    def _condition(self) -> asyncio.Condition:
+        """当前事件循环的条件变量（服务实例跨事件循环复用时自动重建）"""
+        loop = asyncio.get_running_loop()
+        if self._condition_obj is None or self._loop is not loop:
+            self._condition_obj = asyncio.Condition()
+            self._loop = loop
+            self._in_flight = 0
+            self._waiting = 0
+        return self._condition_obj
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """当前执行中的请求数"""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """执行中 + 排队等待中的请求数"""
+        return self._in_flight + self._waiting
+
+    async def acquire(self):
+        """获取一个并发名额（必要时等待）"""
+        condition = self._condition
+        self._waiting += 1
+        try:
+            await self._acquire(condition)
+        finally:
+            self._waiting -= 1
+
+    async def _acquire(self, condition: asyncio.Condition):
+        """等待并占用并发名额"""
+        async with condition:
+            while True:
+                wait_time = self._blocked_until - time.monotonic()
+                if wait_time > 0:
+                    # 遵守 Retry-After，到期后重新检查
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=wait_time)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+
+                await condition.wait()
+
+    async def release(self):
+        """归还并发名额"""
+        async with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._condition.notify_all()
+
+    async def record_success(self):
+        """记录一次成功调用：加性增大并发"""
+        async with self._condition:
+            self.success_count += 1
+            self._limit = min(self.max_limit, self._limit + self.increase_step / max(self._limit, 1.0))
+            self._condition.notify_all()
+
+    async def record_overload(self, retry_after: Optional[float] = None):
+        """记录一次过载（429 / 超时）：乘性减小并发，并遵守 Retry-After"""
+        async with self._condition:
+            self.overload_count += 1
+            now = time.monotonic()
+
+            if now - self._last_decrease >= self.decrease_cooldown:
+                self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                self._last_decrease = now
+
+            if retry_after and retry_after > 0:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """限流器状态"""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "success_count": self.success_count,
+            "overload_count": self.overload_count,
+        }
@@ -0,0 +1,116 @@
+"""
+本地抽取式摘要
+基于 TF-IDF + TextRank 从原文中挑选关键句，无需网络，单篇毫秒级
+用作大模型失败 / 临近截止时间时的兜底，以及长文送入大模型前的压缩
+"""
+
+from typing import List
+
+import numpy as np
+
+from utils.text import split_sentences, tokenize, estimate_tokens
+
+
+class ExtractiveSummarizer:
+    """抽取式摘要器"""
+
+    def __init__(self, damping: float = 0.85, iterations: int = 30, lead_bonus: float = 0.3):
+        """
+        Args:
+            damping: TextRank 阻尼系数
+            iterations: 幂迭代次数
+            lead_bonus: 位置先验权重（新闻的前几句通常更重要）
+        """
+        self.damping = damping
+        self.iterations = iterations
+        self.lead_bonus = lead_bonus
+
+    def score_sentences(self, sentences: List[str]) -> np.ndarray:
+        """计算每个句子的重要性分数"""
+        count = len(sentences)
+        if count <= 2:
+            return np.linspace(1.0, 0.5, count)
+
+        # 构建词表与词频矩阵（句子 × 词）
+        token_lists = [tokenize(sentence) for sentence in sentences]
+        vocabulary = {}
+        rows, cols = [], []
+        for row, tokens in enumerate(token_lists):
+            for token in tokens:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(token, len(vocabulary)))
+        if not vocabulary:
+            return np.linspace(1.0, 0.5, count)
+
+        tf = np.zeros((count, len(vocabulary)))
+        np.add.at(tf, (rows, cols), 1.0)
+
+        # TF-IDF，行向量 L2 归一化
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log((1 + count) / (1 + df)) + 1.0
+        tfidf = tf * idf
+        norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+        tfidf = tfidf / np.where(norms == 0, 1.0, norms)
+
+        # 余弦相似度图上的 TextRank（幂迭代）
+        similarity = tfidf @ tfidf.T
+        np.fill_diagonal(similarity, 0.0)
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1.0 / count),
+                               where=out_weight > 0)
+
+        scores = np.full(count, 1.0 / count)
+        for _ in range(self.iterations):
+            scores = (1 - self.damping) / count + self.damping * (transition.T @ scores)
+
+        # 位置先验：越靠前的句子加成越多
+        position_prior = 1.0 + self.lead_bonus / np.arange(1, count + 1)
+        return scores * position_prior
+
+    def _select(self, sentences: List[str], scores: np.ndarray, budget: int, cost) -> List[str]:
+        """按分数从高到低选句，直到超出预算；结果保持原文顺序"""
+        selected = []
+        used = 0
+        for index in np.argsort(-scores, kind="stable"):
+            size = cost(sentences[index])
+            if selected and used + size > budget:
+                continue
+            selected.append(int(index))
+            used += size
+            if used >= budget:
+                break
+        return [sentences[i] for i in sorted(selected)]
+
+    def summarize(self, text: str, max_sentences: int = 2, max_chars: int = 120) -> str:
+        """
+        生成抽取式摘要
+
+        Args:
+            text: 原文
+            max_sentences: 最多句数
+            max_chars: 最多字数
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            return (text or "").strip()[:max_chars]
+
+        scores = self.score_sentences(sentences)
+        top = sorted(np.argsort(-scores, kind="stable")[:max_sentences])
+        selected = self._select([sentences[i] for i in top], scores[top], max_chars, len)
+        return "".join(selected)[:max_chars]
+
+    def compress(self, text: str, max_tokens: int) -> str:
+        """
+        压缩长文：保留最重要的句子（原文顺序），使估算 token 数不超过 max_tokens
+
+        用于在送入大模型前缩短超长输入
+        """
+        if estimate_tokens(text) <= max_tokens:
+            return text
+
+        sentences = split_sentences(text)
+        if not sentences:
+            return text
+
+        scores = self.score_sentences(sentences)
+        return "\n".join(self._select(sentences, scores, max_tokens, estimate_tokens))
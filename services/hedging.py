@@ -0,0 +1,64 @@
+"""
+请求对冲（Hedged Requests）
+请求超过近期延迟的指定分位数仍未返回时，再发出一份副本，取先返回的结果
+"""
+
+from collections import deque
+from typing import Optional, Dict, Any
+
+
+class RequestHedger:
+    """对冲策略与统计"""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200
+    ):
+        """
+        Args:
+            percentile: 触发对冲的延迟分位数（0~100）
+            budget: 对冲预算，对冲请求数最多占总请求数的比例
+            min_samples: 延迟样本少于该值时不对冲
+            window: 参与分位数计算的最近样本数
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+
+        self.request_count = 0
+        self.hedge_count = 0
+        self.hedge_win_count = 0
+
+    def record_latency(self, latency: float):
+        """记录一次请求延迟（秒）"""
+        self._latencies.append(latency)
+
+    def hedge_delay(self) -> Optional[float]:
+        """发出对冲请求前的等待时间（秒），样本不足时返回 None"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        samples = sorted(self._latencies)
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return samples[index]
+
+    def try_acquire(self) -> bool:
+        """申请一次对冲（超出预算时拒绝）"""
+        if self.hedge_count + 1 > self.budget * self.request_count:
+            return False
+        self.hedge_count += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """对冲统计：对冲率、对冲胜出率"""
+        return {
+            "requests": self.request_count,
+            "hedges": self.hedge_count,
+            "hedge_wins": self.hedge_win_count,
+            "hedge_rate": round(self.hedge_count / self.request_count, 4) if self.request_count else 0.0,
+            "win_rate": round(self.hedge_win_count / self.hedge_count, 4) if self.hedge_count else 0.0,
+            "hedge_delay": self.hedge_delay(),
+        }
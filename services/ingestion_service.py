@@ -0,0 +1,150 @@
+"""
+持续采集
+全天定时轮询消息源，发现新文章后立即抓取、保存并总结；
+定时生成早报时只需从已处理的文章中挑选排序并生成整体总结，发布耗时降到秒级
+"""
+
+import math
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any
+
+from adapters.factory import AdapterFactory
+from core.models import Article, ArticleStatus
+
+
+def rank_articles(articles: List[Article], now: Optional[datetime] = None,
+                  half_life_hours: float = 12.0) -> List[Article]:
+    """
+    给文章打分并按分数倒序排列（写入 article.rank_score）
+
+    分数 = 时间衰减（每 half_life_hours 小时减半） × 正文长度加成（正文越充实略高，最多 1.5 倍）
+    """
+    now = now or datetime.now()
+    for article in articles:
+        age_hours = max(0.0, (now - article.created_at).total_seconds() / 3600)
+        recency = math.pow(0.5, age_hours / half_life_hours) if half_life_hours > 0 else 1.0
+        richness = 1.0 + 0.5 * min(len(article.content or ""), 4000) / 4000
+        article.rank_score = round(recency * richness, 6)
+    return sorted(articles, key=lambda a: a.rank_score, reverse=True)
+
+
+class IngestionService:
+    """持续采集服务"""
+
+    def __init__(self, ai_service, news_repo, fetch_concurrency: int = 5, rank_half_life_hours: float = 12.0,
+                 max_summary_attempts: int = 3, adapter_factory=None):
+        """
+        Args:
+            ai_service: AISummaryService 实例
+            news_repo: 新闻数据访问层（采集结果写入数据库，必填）
+            fetch_concurrency: 最大并发抓取数
+            rank_half_life_hours: 排序时的时间衰减半衰期（小时）
+            max_summary_attempts: 总结失败的文章最多重新总结的次数
+            adapter_factory: 提供 get_adapter(source)，默认为 AdapterFactory（Worker 中传入运行时以复用适配器实例）
+        """
+        self.ai_service = ai_service
+        self.news_repo = news_repo
+        self.adapter_factory = adapter_factory or AdapterFactory
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.rank_half_life_hours = rank_half_life_hours
+        self.max_summary_attempts = max(1, max_summary_attempts)
+
+    @classmethod
+    def from_settings(cls, settings, ai_service, news_repo, adapter_factory=None) -> "IngestionService":
+        """根据配置创建采集服务"""
+        return cls(
+            ai_service=ai_service,
+            news_repo=news_repo,
+            adapter_factory=adapter_factory,
+            fetch_concurrency=settings.INGESTION_FETCH_CONCURRENCY,
+            rank_half_life_hours=settings.INGESTION_RANK_HALF_LIFE_HOURS,
+            max_summary_attempts=settings.INGESTION_MAX_SUMMARY_ATTEMPTS
+        )
+
+    async def _fetch(self, targets: List[tuple]) -> List[Article]:
+        """并发抓取文章，每篇抓取成功后立即保存"""
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        adapters = {source: self.adapter_factory.get_adapter(source) for source, _ in targets}
+
+        async def fetch(source: str, url: str) -> Optional[Article]:
+            async with semaphore:
+                try:
+                    article = await adapters[source].fetch_article(url)
+                except Exception as e:
+                    print(f"    ❌ 抓取失败: {url}: {e}")
+                    return None
+            if article:
+                article.id = await asyncio.to_thread(self.news_repo.save_article, article)
+            return article
+
+        articles = await asyncio.gather(*(fetch(source, url) for source, url in targets))
+        return [article for article in articles if article]
+
+    async def poll(self, sources: Optional[List[str]] = None, limit: int = 30) -> Dict[str, Any]:
+        """
+        轮询一次：发现新文章 → 抓取并保存 → 总结
+
+        已完成总结的文章跳过；已抓取但未总结或总结失败（pending / failed）的文章直接从数据库读取后重新总结，
+        失败次数达到 max_summary_attempts 后不再重试；processing 的文章正由早报任务总结，也跳过
+
+        Args:
+            sources: 消息源列表，默认为 ["aibase"]
+            limit: 每个消息源检查的最新文章数
+
+        Returns:
+            {"found", "new", "fetched", "summarized"}
+        """
+        sources = sources or ["aibase"]
+        targets = []
+        for source in sources:
+            adapter = self.adapter_factory.get_adapter(source)
+            if not adapter:
+                print(f"    ⚠️ 未知的消息源: {source}")
+                continue
+            targets.extend((source, url) for url in await adapter.fetch_article_list(limit))
+
+        rows = await asyncio.to_thread(self.news_repo.get_articles_by_urls, [url for _, url in targets])
+        existing = {data["source_url"]: data for data in rows}
+        retry_statuses = (ArticleStatus.PENDING.value, ArticleStatus.FAILED.value)
+        retryable = [data for data in existing.values() if data.get("status") in retry_statuses]
+        pending = [Article(**data) for data in retryable
+                   if data.get("summary_attempts", 0) < self.max_summary_attempts]
+        # 上次只得到本地摘要兜底的文章清空总结，batch_generate_summaries 才会重新请求大模型
+        for article in pending:
+            article.summary = None
+        new_targets = [(source, url) for source, url in targets if url not in existing]
+        print(f"\n📡 发现 {len(targets)} 篇文章，新文章 {len(new_targets)} 篇，待重新总结 {len(pending)} 篇")
+        if len(retryable) > len(pending):
+            print(f"    ⚠️ {len(retryable) - len(pending)} 篇文章已总结失败 {self.max_summary_attempts} 次，不再重试")
+
+        fetched = await self._fetch(new_targets) if new_targets else []
+        articles = pending + fetched
+        if articles:
+            async def on_summary(article: Article):
+                await asyncio.to_thread(self.news_repo.save_article, article)
+
+            await self.ai_service.batch_generate_summaries(articles, on_summary=on_summary)
+            # 只得到本地摘要兜底（或没有总结）的文章记为失败一次，下次轮询时重新总结
+            failed_ids = [a.id for a in articles if a.status != ArticleStatus.COMPLETED]
+            await asyncio.to_thread(self.news_repo.record_summary_failures, failed_ids)
+
+        return {
+            "found": len(targets),
+            "new": len(new_targets),
+            "fetched": len(fetched),
+            "summarized": sum(1 for a in articles if a.status == ArticleStatus.COMPLETED),
+        }
+
+    def select_articles(self, limit: int, window_hours: float = 24.0,
+                        now: Optional[datetime] = None) -> List[Article]:
+        """
+        从最近 window_hours 小时内已完成总结的文章中挑选排名最高的 limit 篇
+
+        Returns:
+            按分数倒序排列的文章
+        """
+        now = now or datetime.now()
+        rows = self.news_repo.get_processed_articles(since=now - timedelta(hours=window_hours))
+        articles = rank_articles([Article(**data) for data in rows], now, self.rank_half_life_hours)
+        return articles[:limit]
@@ -0,0 +1,256 @@
+"""
+大模型调用埋点
+记录每次调用的 token 用量、延迟、提供商/模型、重试次数和结果，并汇总为单份早报的统计
+"""
+
+import math
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Iterable, Iterator
+
+# 延迟直方图的桶上界（毫秒），最后一个桶为 +Inf
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000, 20000, 30000, 60000)
+
+# 调用结果
+OUTCOME_SUCCESS = "success"
+OUTCOME_RATE_LIMITED = "rate_limited"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_ERROR = "error"
+OUTCOME_CANCELLED = "cancelled"  # 对冲中落败或超过截止时间而被取消的请求（按估算的输入 token 计费）
+
+
+def percentile(values: Iterable[float], p: float) -> Optional[float]:
+    """计算分位数（最近秩法），无样本时返回 None"""
+    samples = sorted(values)
+    if not samples:
+        return None
+    index = min(len(samples) - 1, max(0, math.ceil(len(samples) * p / 100) - 1))
+    return samples[index]
+
+
+def latency_histogram(latencies_ms: Iterable[float]) -> Dict[str, int]:
+    """按 LATENCY_BUCKETS_MS 统计延迟直方图（非累计），键为桶上界字符串"""
+    histogram = {str(bound): 0 for bound in LATENCY_BUCKETS_MS}
+    histogram["+Inf"] = 0
+    for latency in latencies_ms:
+        for bound in LATENCY_BUCKETS_MS:
+            if latency <= bound:
+                histogram[str(bound)] += 1
+                break
+        else:
+            histogram["+Inf"] += 1
+    return histogram
+
+
+def merge_histograms(histograms: Iterable[Optional[Dict[str, int]]]) -> Dict[str, int]:
+    """合并多个延迟直方图"""
+    merged = latency_histogram([])
+    for histogram in histograms:
+        for bucket, count in (histogram or {}).items():
+            merged[bucket] = merged.get(bucket, 0) + count
+    return merged
+
+
+def histogram_percentile(histogram: Dict[str, int], p: float) -> Optional[float]:
+    """根据直方图估算分位数（返回所在桶的上界；落在 +Inf 桶时返回最后一个有限上界）"""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = math.ceil(total * p / 100)
+    seen = 0
+    for bound in LATENCY_BUCKETS_MS:
+        seen += histogram.get(str(bound), 0)
+        if seen >= rank:
+            return float(bound)
+    return float(LATENCY_BUCKETS_MS[-1])
+
+
+# 按次数累加的字段
+_SUM_FIELDS = ("calls", "failed_calls", "retries", "hedges", "prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def merge_usage(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并多份调用统计（LLMUsageTracker.summary() 或 llm_usage_logs 记录），
+    分位数根据合并后的直方图估算（取所在桶上界）
+    """
+    summaries = list(summaries)
+    result: Dict[str, Any] = {field: sum(s.get(field) or 0 for s in summaries) for field in _SUM_FIELDS}
+    result["cost"] = round(sum(s.get("cost") or 0.0 for s in summaries), 6)
+
+    # 平均延迟按各份统计的延迟样本数（直方图总数）加权
+    weighted = [(s["latency_avg_ms"], sum((s.get("latency_histogram") or {}).values()))
+                for s in summaries if s.get("latency_avg_ms") is not None]
+    samples = sum(count for _, count in weighted)
+    result["latency_avg_ms"] = round(sum(avg * count for avg, count in weighted) / samples, 1) if samples else None
+    histogram = merge_histograms(s.get("latency_histogram") for s in summaries)
+    result["latency_histogram"] = histogram
+    result["latency_p50_ms"] = histogram_percentile(histogram, 50)
+    result["latency_p95_ms"] = histogram_percentile(histogram, 95)
+    result["latency_p99_ms"] = histogram_percentile(histogram, 99)
+    maxima = [s["latency_max_ms"] for s in summaries if s.get("latency_max_ms") is not None]
+    result["latency_max_ms"] = max(maxima) if maxima else None
+
+    outcomes: Dict[str, int] = {}
+    for s in summaries:
+        for outcome, count in (s.get("outcomes") or {}).items():
+            outcomes[outcome] = outcomes.get(outcome, 0) + count
+    result["outcomes"] = outcomes
+    result["failure_rate"] = round(result["failed_calls"] / result["calls"], 4) if result["calls"] else 0.0
+    return result
+
+
+def merge_provider_usage(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """按提供商合并多份调用统计的 providers 明细"""
+    provider_stats: Dict[str, List[dict]] = {}
+    for s in summaries:
+        for name, stats in (s.get("providers") or {}).items():
+            provider_stats.setdefault(name, []).append(stats)
+    return {
+        name: {"model": items[0].get("model"), **merge_usage(items)}
+        for name, items in provider_stats.items()
+    }
+
+
+class LLMUsageTracker:
+    """大模型调用记录器（进程内，按早报汇总后入库）"""
+
+    def __init__(self, max_records: int = 10000):
+        """
+        Args:
+            max_records: 最多保留的调用记录数
+        """
+        self.records = deque(maxlen=max_records)
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        kind: str,
+        outcome: str,
+        latency: float,
+        attempt: int = 0,
+        hedge: bool = False,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        usage_estimated: bool = False,
+        cost: float = 0.0,
+        error: Optional[str] = None
+    ):
+        """
+        记录一次调用
+
+        Args:
+            provider: 提供商名称
+            model: 模型名称
+            kind: 调用用途（summary / daily_summary）
+            outcome: 调用结果（success / rate_limited / timeout / error / cancelled）
+            latency: 耗时（秒，不含排队时间）
+            attempt: 第几次尝试（0 为首次，大于 0 为重试或切换）
+            hedge: 是否为对冲副本
+            prompt_tokens: 输入 token 数
+            completion_tokens: 输出 token 数
+            usage_estimated: 提供商未返回 usage，token 数为本地估算
+            cost: 费用（按提供商单价计算）
+            error: 错误信息
+        """
+        self.records.append({
+            "provider": provider,
+            "model": model,
+            "kind": kind,
+            "outcome": outcome,
+            "latency_ms": round(latency * 1000, 1),
+            "attempt": attempt,
+            "hedge": hedge,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "usage_estimated": usage_estimated,
+            "cost": cost,
+            "error": error,
+        })
+
+    def reset(self):
+        """清空调用记录（开始统计新的一份早报）"""
+        self.records.clear()
+
+    @staticmethod
+    def _aggregate(records: List[dict]) -> Dict[str, Any]:
+        """汇总一组调用记录"""
+        latencies = [r["latency_ms"] for r in records if r["outcome"] != OUTCOME_CANCELLED]
+        prompt_tokens = sum(r["prompt_tokens"] for r in records)
+        completion_tokens = sum(r["completion_tokens"] for r in records)
+        outcomes: Dict[str, int] = {}
+        for r in records:
+            outcomes[r["outcome"]] = outcomes.get(r["outcome"], 0) + 1
+        return {
+            "calls": len(records),
+            "failed_calls": sum(1 for r in records if r["outcome"] not in (OUTCOME_SUCCESS, OUTCOME_CANCELLED)),
+            "retries": sum(1 for r in records if r["attempt"] > 0),
+            "hedges": sum(1 for r in records if r["hedge"]),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "estimated_calls": sum(1 for r in records if r["usage_estimated"]),
+            "cost": round(sum(r["cost"] for r in records), 6),
+            "latency_avg_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+            "latency_p50_ms": percentile(latencies, 50),
+            "latency_p95_ms": percentile(latencies, 95),
+            "latency_p99_ms": percentile(latencies, 99),
+            "latency_max_ms": max(latencies) if latencies else None,
+            "latency_histogram": latency_histogram(latencies),
+            "outcomes": outcomes,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总统计：总量、延迟分位数与直方图，以及按提供商 / 用途的明细"""
+        records = list(self.records)
+        result = self._aggregate(records)
+
+        providers: Dict[str, List[dict]] = {}
+        kinds: Dict[str, List[dict]] = {}
+        for r in records:
+            providers.setdefault(r["provider"], []).append(r)
+            kinds.setdefault(r["kind"], []).append(r)
+
+        result["providers"] = {
+            name: {"model": items[-1]["model"], **self._aggregate(items)}
+            for name, items in providers.items()
+        }
+        result["kinds"] = {
+            kind: {
+                "calls": len(items),
+                "total_tokens": sum(r["prompt_tokens"] + r["completion_tokens"] for r in items),
+                "cost": round(sum(r["cost"] for r in items), 6),
+            }
+            for kind, items in kinds.items()
+        }
+        return result
+
+
+# 当前任务的调用记录器（由 track_usage 设置，随协程创建的子任务和 asyncio.to_thread 线程传递）
+_task_usage: ContextVar[Optional[LLMUsageTracker]] = ContextVar("task_llm_usage", default=None)
+
+
+@contextmanager
+def track_usage(tracker: Optional[LLMUsageTracker] = None) -> Iterator[LLMUsageTracker]:
+    """
+    在当前上下文中把大模型调用额外记录到单独的记录器（进程共享的 AI 服务上并发执行的任务各自统计）
+
+    Args:
+        tracker: 记录器，默认新建一个
+
+    Yields:
+        本次统计使用的记录器
+    """
+    tracker = tracker if tracker is not None else LLMUsageTracker()
+    token = _task_usage.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _task_usage.reset(token)
+
+
+def current_usage_tracker() -> Optional[LLMUsageTracker]:
+    """当前上下文的任务记录器（不在 track_usage 中时为 None）"""
+    return _task_usage.get()
@@ -0,0 +1,167 @@
+"""
+大模型提供商池
+按指数加权的延迟与错误率为请求选择提供商，提供商劣化时自动切换
+"""
+
+import math
+import time
+from typing import Optional, List, Dict, Any, Iterable
+from openai import OpenAI
+
+from services.concurrency import AdaptiveConcurrencyLimiter
+
+
+class LLMProvider:
+    """单个大模型提供商（独立的客户端、并发限制和健康统计）"""
+
+    # 无延迟样本时的默认估计（秒）
+    DEFAULT_LATENCY = 1.0
+
+    def __init__(
+        self,
+        name: str,
+        api_key: str,
+        base_url: str = "https://api.openai.com/v1",
+        model: str = "gpt-3.5-turbo",
+        weight: float = 1.0,
+        max_concurrent: int = 10,
+        max_concurrent_limit: Optional[int] = None,
+        timeout: float = 60.0,
+        ewma_alpha: float = 0.3,
+        error_decay_seconds: float = 60.0,
+        input_price: float = 0.0,
+        output_price: float = 0.0
+    ):
+        """
+        Args:
+            name: 提供商名称（日志和统计使用）
+            api_key: API 密钥
+            base_url: API 基础 URL
+            model: 模型名称
+            weight: 路由权重，越大分到的流量越多
+            max_concurrent: 初始并发数
+            max_concurrent_limit: 自适应并发上限，默认为初始并发数的 4 倍
+            timeout: 单次请求超时（秒）
+            ewma_alpha: 指数加权平滑系数
+            error_decay_seconds: 错误分数的衰减时间常数，保证劣化的提供商恢复后能重新获得流量
+            input_price: 输入单价（每百万 token），用于统计费用
+            output_price: 输出单价（每百万 token）
+        """
+        self.name = name
+        self.model = model
+        self.base_url = base_url
+        self.weight = max(weight, 0.01)
+        self.ewma_alpha = ewma_alpha
+        self.error_decay_seconds = error_decay_seconds
+        self.input_price = input_price
+        self.output_price = output_price
+
+        # 重试和切换由调用方统一处理，关闭 SDK 内置重试，以便限流器感知 429
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=0
+        )
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=max_concurrent,
+            max_limit=max_concurrent_limit or max_concurrent * 4
+        )
+
+        self.latency_ewma: Optional[float] = None
+        self._error_ewma = 0.0
+        self._last_error_at = 0.0
+        self.success_count = 0
+        self.failure_count = 0
+
+    @property
+    def error_score(self) -> float:
+        """当前错误分数（0~1，随时间衰减）"""
+        if not self._error_ewma:
+            return 0.0
+        elapsed = time.monotonic() - self._last_error_at
+        return self._error_ewma * math.exp(-elapsed / self.error_decay_seconds)
+
+    def score(self) -> float:
+        """路由评分（越低越优先）"""
+        latency = self.latency_ewma if self.latency_ewma is not None else self.DEFAULT_LATENCY
+        load = 1.0 + self.limiter.queued / self.limiter.limit
+        return latency * load * (1.0 + 10.0 * self.error_score) / self.weight
+
+    def record_success(self, latency: float):
+        """记录成功调用"""
+        self.success_count += 1
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = self.ewma_alpha * latency + (1 - self.ewma_alpha) * self.latency_ewma
+        self._error_ewma = (1 - self.ewma_alpha) * self.error_score
+        self._last_error_at = time.monotonic()
+
+    def record_failure(self):
+        """记录失败调用"""
+        self.failure_count += 1
+        self._error_ewma = self.ewma_alpha + (1 - self.ewma_alpha) * self.error_score
+        self._last_error_at = time.monotonic()
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """按单价计算一次调用的费用"""
+        return (prompt_tokens * self.input_price + completion_tokens * self.output_price) / 1_000_000
+
+    def stats(self) -> Dict[str, Any]:
+        """提供商统计"""
+        return {
+            "name": self.name,
+            "model": self.model,
+            "weight": self.weight,
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "error_score": round(self.error_score, 3),
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            **self.limiter.stats(),
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], timeout: float = 60.0) -> "LLMProvider":
+        """根据配置字典创建提供商"""
+        return cls(
+            name=config.get("name") or config.get("model", "default"),
+            api_key=config["api_key"],
+            base_url=config.get("base_url", "https://api.openai.com/v1"),
+            model=config.get("model", "gpt-3.5-turbo"),
+            weight=float(config.get("weight", 1.0)),
+            max_concurrent=int(config.get("max_concurrent", 10)),
+            max_concurrent_limit=config.get("max_concurrent_limit"),
+            timeout=float(config.get("timeout", timeout)),
+            input_price=float(config.get("input_price", 0.0)),
+            output_price=float(config.get("output_price", 0.0)),
+        )
+
+
+class ProviderPool:
+    """提供商池（延迟感知路由 + 故障切换）"""
+
+    def __init__(self, providers: List[LLMProvider]):
+        if not providers:
+            raise ValueError("至少需要配置一个大模型提供商")
+        self.providers = providers
+
+    def select(self, exclude: Iterable[str] = ()) -> LLMProvider:
+        """选择评分最优的提供商（优先选择未被排除的）"""
+        excluded = set(exclude)
+        candidates = [p for p in self.providers if p.name not in excluded] or self.providers
+        return min(candidates, key=lambda p: p.score())
+
+    def has_alternative(self, exclude: Iterable[str]) -> bool:
+        """是否还有未尝试过的提供商"""
+        excluded = set(exclude)
+        return any(p.name not in excluded for p in self.providers)
+
+    @property
+    def total_limit(self) -> int:
+        """所有提供商当前并发上限之和"""
+        return sum(p.limiter.limit for p in self.providers)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """所有提供商的统计"""
+        return [p.stats() for p in self.providers]
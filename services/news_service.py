@@ -6,31 +6,71 @@
 from typing import List, Optional
 from datetime import datetime
 import asyncio
+import inspect
+import time
 
-from core.models import Article, DailyBriefing
+from core.models import Article, ArticleStatus, BriefingStage, DailyBriefing
 from adapters.factory import AdapterFactory
 from repositories.news_repository import NewsRepository
 from cache.cache_repository import CacheRepository
+from services.task_metrics import (
+    PhaseTimer, PHASE_LIST, PHASE_FETCH, PHASE_SUMMARIZE, PHASE_DAILY_SUMMARY, PHASE_PERSIST, PHASE_CACHE
+)
+
+
+class _AwaitableRepo:
+    """
+    统一以 await 调用数据访问层：AsyncNewsRepository 的方法直接等待，
+    NewsRepository 的方法在线程中执行（不阻塞 Worker 常驻事件循环上的其他任务）
+    """
+
+    def __init__(self, repo):
+        self._repo = repo
+
+    def __getattr__(self, name):
+        method = getattr(self._repo, name)
+
+        async def call(*args, **kwargs):
+            if inspect.iscoroutinefunction(method):
+                return await method(*args, **kwargs)
+            return await asyncio.to_thread(method, *args, **kwargs)
+        return call
 
 
 class NewsService:
     """新闻聚合服务（完整版，支持缓存和数据库）"""
 
-    def __init__(self, ai_service, news_repo: NewsRepository = None, cache_repo: CacheRepository = None):
-        self.adapter_factory = AdapterFactory()
+    def __init__(self, ai_service, news_repo: NewsRepository = None, cache_repo: CacheRepository = None,
+                 adapter_factory=None, timer: Optional[PhaseTimer] = None):
+        # adapter_factory 只需提供 get_adapter(source)，Worker 中传入运行时以复用适配器实例
+        self.adapter_factory = adapter_factory or AdapterFactory()
+        # 各阶段耗时，由任务汇总后写入 TaskLog.metrics
+        self.timer = timer or PhaseTimer()
         self.ai_service = ai_service
+        # news_repo 可以是 NewsRepository 或 AsyncNewsRepository（DATABASE_ASYNC），统一通过 self.db 调用
         self.news_repo = news_repo
+        self.db = _AwaitableRepo(news_repo) if news_repo else None
         self.cache_repo = cache_repo
 
+        # 有 Redis 时，相同内容的总结请求跨进程合并（如手动生成与定时任务重叠）
+        if cache_repo:
+            ai_service.attach_cache(cache_repo)
+
     async def generate_daily_briefing(
         self,
         date: Optional[str] = None,
         sources: Optional[List[str]] = None,
         limit: int = 10,
         use_cache: bool = True,
-        save_to_db: bool = False
+        save_to_db: bool = False,
+        publish: bool = True
     ) -> DailyBriefing:
-        """生成每日早报"""
+        """
+        生成每日早报
+
+        publish 为 False 时只生成草稿（文章与整体总结记录在检查点中），
+        由 persist_draft 持久化、warm_cache 写入缓存，可拆分为独立的任务执行（需要 save_to_db）
+        """
         date = date or datetime.now().strftime("%Y-%m-%d")
         sources = sources or ["aibase"]
 
@@ -53,23 +93,12 @@ class NewsService:
                     created_at=datetime.fromisoformat(cached['created_at']) if cached.get('created_at') else None
                 )
 
-        # 2. 从多个消息源抓取文章
-        all_articles = []
-        for source in sources:
-            print(f"\n📍 处理消息源: {source}")
-            adapter = self.adapter_factory.get_adapter(source)
-            if adapter:
-                urls = await adapter.fetch_article_list(limit)
-                print(f"    找到 {len(urls)} 篇文章")
-
-                for i, url in enumerate(urls, 1):
-                    print(f"    [{i}/{len(urls)}] 正在获取: {url}", end=" ")
-                    article = await adapter.fetch_article(url)
-                    if article:
-                        print(f"✅ {article.title[:30]}...")
-                        all_articles.append(article)
-                    else:
-                        print(f"❌")
+        # 保存到数据库时记录各阶段检查点，Worker 崩溃后从中断处恢复
+        checkpointing = bool(save_to_db and self.news_repo)
+        checkpoint = await self._load_checkpoint(date) if checkpointing else None
+
+        # 2. 从多个消息源抓取文章（每篇文章抓取后立即保存）
+        all_articles = await self._fetch_articles(date, sources, limit, checkpoint, checkpointing)
 
         if not all_articles:
             print("⚠️ 未获取到任何文章")
@@ -80,41 +109,338 @@ class NewsService:
                 total_count=0
             )
 
-        # 3. 生成AI总结
+        # 3. 生成AI总结（已有总结的文章跳过；每篇总结完成后立即保存）
         print(f"\n🤖 开始生成AI总结...")
-        articles_with_summary = await self.ai_service.batch_generate_summaries(all_articles)
+        if checkpointing:
+            if checkpoint:
+                # 上次只得到本地摘要兜底的文章（failed），恢复时重新请求大模型
+                for article in all_articles:
+                    if article.status == ArticleStatus.FAILED:
+                        article.summary = None
+            pending_ids = [a.id for a in all_articles if not a.summary]
+            await self.db.update_articles_status(pending_ids, ArticleStatus.PROCESSING.value)
+            await self.db.save_checkpoint(date, stage=BriefingStage.SUMMARIZING)
+
+        async def save_summary(article: Article):
+            # 本地摘要兜底的文章记为 failed（而不是停留在 processing），恢复或批量总结时会重新总结
+            if article.status != ArticleStatus.COMPLETED:
+                article.status = ArticleStatus.FAILED
+            await self.db.save_article(article)
+
+        with self.timer.phase(PHASE_SUMMARIZE):
+            articles_with_summary = await self.ai_service.batch_generate_summaries(
+                all_articles, on_summary=save_summary if checkpointing else None
+            )
         success_count = sum(1 for a in articles_with_summary if a.summary)
+        self.timer.count("articles", len(articles_with_summary))
+        self.timer.count("summarized", success_count)
+        for _ in range(len(articles_with_summary) - success_count):
+            self.timer.fail(PHASE_SUMMARIZE, "empty_summary")
         print(f"    ✅ 成功生成 {success_count}/{len(articles_with_summary)} 篇文章总结")
 
-        # 4. 生成整体总结
-        daily_summary = await self.ai_service.generate_daily_summary(articles_with_summary)
+        # 4. 生成整体总结（有 Redis 时流式写入，客户端可通过 SSE 边生成边展示）
+        if checkpoint and checkpoint.get("ai_summary"):
+            daily_summary = checkpoint["ai_summary"]
+            print(f"    ♻️ 使用检查点中的每日汇总")
+        else:
+            if checkpointing:
+                await self.db.save_checkpoint(date, stage=BriefingStage.DAILY_SUMMARY)
+            with self.timer.phase(PHASE_DAILY_SUMMARY):
+                daily_summary = await self._generate_daily_summary(date, articles_with_summary)
+            if checkpointing:
+                await self.db.save_checkpoint(date, stage=BriefingStage.SAVING, ai_summary=daily_summary)
+        if daily_summary:
+            print(f"    ✅ 每日汇总: {daily_summary}")
+
+        if checkpointing and not publish:
+            return await self._save_draft(date, articles_with_summary, daily_summary)
+
+        # 5~7. 构建、保存并缓存早报
+        briefing = await self._publish_briefing(date, articles_with_summary, daily_summary, save_to_db, use_cache)
+        if checkpointing:
+            await self.db.save_checkpoint(date, stage=BriefingStage.COMPLETED)
+        return briefing
+
+    async def build_briefing(
+        self,
+        date: str,
+        articles: List[Article],
+        save_to_db: bool = False,
+        use_cache: bool = True,
+        publish: bool = True
+    ) -> DailyBriefing:
+        """
+        用已抓取并总结好的文章组装早报（生成整体总结、保存、缓存）
+
+        供分布式生成等在其他地方完成抓取与总结的流程使用；
+        publish 为 False 时只保存草稿（文章需已入库），见 generate_daily_briefing
+        """
+        daily_summary = None
+        if articles:
+            with self.timer.phase(PHASE_DAILY_SUMMARY):
+                daily_summary = await self._generate_daily_summary(date, articles)
         if daily_summary:
             print(f"    ✅ 每日汇总: {daily_summary}")
+        if not publish and self.news_repo:
+            return await self._save_draft(date, articles, daily_summary)
+        return await self._publish_briefing(date, articles, daily_summary, save_to_db, use_cache)
 
+    async def _save_draft(self, date: str, articles: List[Article], daily_summary: Optional[str]) -> DailyBriefing:
+        """把早报草稿（文章ID顺序、排序得分与整体总结）记录到检查点，返回未保存的早报对象"""
+        await self.db.save_checkpoint(
+            date,
+            stage=BriefingStage.SAVING,
+            article_urls=[
+                {"source": getattr(article.source_type, "value", article.source_type), "url": article.source_url,
+                 "rank_score": article.rank_score}
+                for article in articles
+            ],
+            article_ids=[article.id for article in articles],
+            ai_summary=daily_summary
+        )
+        print(f"    📝 已保存草稿（{len(articles)} 篇文章）")
+        return DailyBriefing(
+            date=date,
+            title=f"早报 - {date}",
+            articles=articles,
+            total_count=len(articles),
+            ai_summary=daily_summary
+        )
+
+    async def persist_draft(self, date: str) -> Optional[int]:
+        """
+        把检查点中的早报草稿保存为正式早报，返回早报ID（可重复执行）
+
+        Returns:
+            早报ID，没有草稿也没有已保存的早报时返回 None
+        """
+        checkpoint = await self.db.get_checkpoint(date)
+        if not checkpoint or checkpoint["stage"] != BriefingStage.SAVING.value:
+            existing = await self.db.get_daily_briefing(date, include_content=False)
+            return existing["id"] if existing else None
+
+        articles = [Article(**data) for data in await self.db.get_articles_by_ids(checkpoint.get("article_ids") or [])]
+        rank_scores = {item["url"]: item.get("rank_score") for item in checkpoint.get("article_urls") or []}
+        for article in articles:
+            article.rank_score = rank_scores.get(article.source_url)
+        briefing = DailyBriefing(
+            date=date,
+            title=f"早报 - {date}",
+            articles=articles,
+            total_count=len(articles),
+            ai_summary=checkpoint.get("ai_summary")
+        )
+        with self.timer.phase(PHASE_PERSIST):
+            briefing_id = await self.db.save_daily_briefing(briefing)
+        await self.db.save_checkpoint(date, stage=BriefingStage.COMPLETED)
+        print(f"    ✅ 已保存（ID: {briefing_id}）")
+        return briefing_id
+
+    async def warm_cache(self, briefing_id: int) -> Optional[DailyBriefing]:
+        """从数据库读取早报并写入缓存（当天早报与最新早报）"""
+        data = await self.db.get_briefing_by_id(briefing_id)
+        if not data:
+            return None
+        briefing = DailyBriefing(
+            id=data["id"],
+            date=data["date"],
+            title=data["title"],
+            articles=[Article(**a) for a in data.get("articles", [])],
+            total_count=data["total_count"],
+            ai_summary=data.get("ai_summary"),
+            full_text=data.get("full_text"),
+            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+        )
+        if self.cache_repo:
+            with self.timer.phase(PHASE_CACHE):
+                await self.cache_repo.set_daily_briefing(briefing.date, briefing.to_dict())
+                await self.cache_repo.set_latest_briefing(briefing.to_dict())
+            print(f"    ✅ 已缓存")
+        return briefing
+
+    async def _publish_briefing(
+        self,
+        date: str,
+        articles: List[Article],
+        daily_summary: Optional[str],
+        save_to_db: bool,
+        use_cache: bool
+    ) -> DailyBriefing:
+        """构建早报对象，持久化到数据库并写入缓存"""
         # 5. 构建早报对象
         briefing = DailyBriefing(
             date=date,
             title=f"早报 - {date}",
-            articles=articles_with_summary,
-            total_count=len(articles_with_summary),
+            articles=articles,
+            total_count=len(articles),
             ai_summary=daily_summary
         )
 
         # 6. 持久化到数据库
         if save_to_db and self.news_repo:
             print(f"\n💾 保存到数据库...")
-            briefing_id = self.news_repo.save_daily_briefing(briefing)
+            with self.timer.phase(PHASE_PERSIST):
+                briefing_id = await self.db.save_daily_briefing(briefing)
             briefing.id = briefing_id
             print(f"    ✅ 已保存（ID: {briefing_id}）")
 
         # 7. 写入缓存
         if use_cache and self.cache_repo:
-            await self.cache_repo.set_daily_briefing(date, briefing.to_dict())
-            await self.cache_repo.set_latest_briefing(briefing.to_dict())
+            with self.timer.phase(PHASE_CACHE):
+                await self.cache_repo.set_daily_briefing(date, briefing.to_dict())
+                await self.cache_repo.set_latest_briefing(briefing.to_dict())
             print(f"    ✅ 已缓存")
 
         return briefing
 
+    async def _load_checkpoint(self, date: str) -> Optional[dict]:
+        """获取未完成的检查点（用于恢复），不存在或已完成时返回 None"""
+        checkpoint = await self.db.get_checkpoint(date)
+        if not checkpoint or checkpoint["stage"] == BriefingStage.COMPLETED.value:
+            return None
+        checkpoint = await self.db.save_checkpoint(date, attempts=(checkpoint.get("attempts") or 1) + 1)
+        print(f"♻️ 从检查点恢复（阶段: {checkpoint['stage']}，已抓取 {len(checkpoint.get('article_ids') or [])}"
+              f"/{len(checkpoint.get('article_urls') or [])} 篇，第 {checkpoint['attempts']} 次执行）")
+        return checkpoint
+
+    async def _fetch_articles(
+        self,
+        date: str,
+        sources: List[str],
+        limit: int,
+        checkpoint: Optional[dict] = None,
+        checkpointing: bool = False
+    ) -> List[Article]:
+        """
+        抓取文章
+
+        - 有检查点时沿用上次的文章列表，已保存的文章直接从数据库读取，只抓取剩余的
+        - checkpointing 为 True 时每篇文章抓取后立即保存并记录到检查点
+        """
+        fetched = {}
+        if checkpoint and checkpoint.get("article_urls"):
+            targets = [(item["source"], item["url"]) for item in checkpoint["article_urls"]]
+            for data in await self.db.get_articles_by_ids(checkpoint.get("article_ids") or []):
+                fetched[data["source_url"]] = Article(**data)
+            print(f"\n📍 恢复抓取: 共 {len(targets)} 篇，已保存 {len(fetched)} 篇")
+        else:
+            targets = []
+            for source in sources:
+                print(f"\n📍 处理消息源: {source}")
+                adapter = self.adapter_factory.get_adapter(source)
+                if adapter:
+                    with self.timer.phase(PHASE_LIST):
+                        urls = await adapter.fetch_article_list(limit)
+                    self.timer.count("listed", len(urls))
+                    print(f"    找到 {len(urls)} 篇文章")
+                    targets.extend((source, url) for url in urls)
+            if checkpointing:
+                fields = {} if checkpoint else {"attempts": 1, "error_message": None}
+                await self.db.save_checkpoint(
+                    date,
+                    stage=BriefingStage.CRAWLING,
+                    sources=sources,
+                    article_urls=[{"source": source, "url": url} for source, url in targets],
+                    article_ids=[],
+                    ai_summary=None,
+                    **fields
+                )
+
+        all_articles = []
+        article_ids = [article.id for article in fetched.values()]
+        adapters = {}
+        for i, (source, url) in enumerate(targets, 1):
+            if url in fetched:
+                all_articles.append(fetched[url])
+                continue
+
+            if source not in adapters:
+                adapters[source] = self.adapter_factory.get_adapter(source)
+            adapter = adapters[source]
+            if not adapter:
+                continue
+            print(f"    [{i}/{len(targets)}] 正在获取: {url}", end=" ")
+            start = time.perf_counter()
+            article = await adapter.fetch_article(url)
+            self.timer.record(PHASE_FETCH, (time.perf_counter() - start) * 1000,
+                              ok=article is not None, error="fetch_failed")
+            if article:
+                print(f"✅ {article.title[:30]}...")
+                if checkpointing:
+                    article.id = await self.db.save_article(article)
+                    article_ids.append(article.id)
+                    await self.db.save_checkpoint(date, article_ids=article_ids)
+                all_articles.append(article)
+            else:
+                print(f"❌")
+
+        return all_articles
+
+    async def _load_daily_summary_state(self, date: str) -> Optional[dict]:
+        """获取上次生成每日总结时的状态（优先 Redis，其次数据库中已保存的早报）"""
+        if self.cache_repo:
+            try:
+                state = await self.cache_repo.get_daily_summary_state(date)
+                if state:
+                    return state
+            except Exception as e:
+                print(f"    ⚠️ 读取每日总结状态失败: {e}")
+
+        if self.news_repo:
+            try:
+                briefing_data = await self.db.get_daily_briefing(date)
+            except Exception as e:
+                print(f"    ⚠️ 读取已保存的早报失败: {e}")
+                briefing_data = None
+            if briefing_data and briefing_data.get('ai_summary'):
+                articles = [Article(**a) for a in briefing_data.get('articles', [])]
+                return {
+                    "items": self.ai_service.daily_summary_items(articles),
+                    "summary": briefing_data['ai_summary']
+                }
+
+        return None
+
+    async def _save_daily_summary_state(self, date: str, articles: List[Article], summary: str):
+        """保存本次每日总结的状态，供当天后续刷新增量生成"""
+        if not self.cache_repo:
+            return
+        try:
+            await self.cache_repo.set_daily_summary_state(date, {
+                "items": self.ai_service.daily_summary_items(articles),
+                "summary": summary
+            })
+        except Exception as e:
+            print(f"    ⚠️ 写入每日总结状态失败: {e}")
+
+    async def _generate_daily_summary(self, date: str, articles: List[Article]) -> Optional[str]:
+        """
+        生成每日总结
+
+        - 与当天上次生成时的文章完全相同则直接复用，少量变化时只发送增量
+        - 有 Redis 时把流式生成的文本实时写入缓存
+        """
+        previous = await self._load_daily_summary_state(date)
+
+        if not self.cache_repo:
+            return await self.ai_service.generate_daily_summary(articles, previous=previous)
+
+        async def publish(text: str):
+            try:
+                await self.cache_repo.set_summary_stream(date, "streaming", text)
+            except Exception as e:
+                print(f"    ⚠️ 写入流式总结失败: {e}")
+
+        await publish("")
+        daily_summary = await self.ai_service.generate_daily_summary(articles, on_text=publish, previous=previous)
+        try:
+            await self.cache_repo.set_summary_stream(date, "done" if daily_summary else "failed", daily_summary or "")
+        except Exception as e:
+            print(f"    ⚠️ 写入流式总结失败: {e}")
+        if daily_summary:
+            await self._save_daily_summary_state(date, articles, daily_summary)
+        return daily_summary
+
     async def get_briefing_by_date(self, date: str) -> Optional[DailyBriefing]:
         """获取指定日期的早报"""
         # 先查缓存
@@ -135,7 +461,7 @@ class NewsService:
 
         # 查数据库
         if self.news_repo:
-            briefing_data = self.news_repo.get_daily_briefing(date)
+            briefing_data = await self.db.get_daily_briefing(date)
             if briefing_data:
                 articles = [Article(**a) for a in briefing_data.get('articles', [])]
                 return DailyBriefing(
@@ -171,7 +497,7 @@ class NewsService:
 
         # 查数据库
         if self.news_repo:
-            briefing_data = self.news_repo.get_latest_briefing()
+            briefing_data = await self.db.get_latest_briefing()
             if briefing_data:
                 articles = [Article(**a) for a in briefing_data.get('articles', [])]
                 return DailyBriefing(
@@ -0,0 +1,122 @@
+"""
+Single-flight 请求合并
+相同内容的并发总结请求只调用一次大模型，所有等待方共享结果
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Dict, Callable, Awaitable, Optional
+
+from cache.cache_repository import CacheRepository
+
+# Redis 操作失败的标记（区别于正常返回的 None / False）
+_FAILED = object()
+
+
+def content_key(*parts: str) -> str:
+    """根据内容生成合并键（SHA-256）"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """进程内 single-flight：同一个 key 同时只执行一次，其余调用等待并共享结果"""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """执行 fn，若相同 key 的调用正在进行则等待其结果"""
+        future = self._calls.get(key)
+        if future is not None and future.get_loop() is asyncio.get_running_loop():
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # 领头者被取消（如超过截止时间）：等待方收到普通异常后各自兜底，取消不传播给它们
+            future.set_exception(RuntimeError("合并的总结请求已取消"))
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有等待方时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+class RedisSingleFlight:
+    """基于 Redis 的跨进程 single-flight
+
+    - 领头者获取 Redis 锁并调用大模型，结果写入 Redis
+    - 其他进程轮询结果；领头者失败或崩溃（锁消失且无结果）时自行调用
+    """
+
+    def __init__(self, cache_repo: CacheRepository, lock_timeout: int = 300, poll_interval: float = 0.5,
+                 redis_timeout: float = 2.0):
+        """
+        Args:
+            cache_repo: 缓存仓储
+            lock_timeout: 锁超时（秒），同时也是等待领头者的最长时间
+            poll_interval: 轮询结果的间隔（秒）
+            redis_timeout: 单次 Redis 操作的超时（秒）
+        """
+        self.cache_repo = cache_repo
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.redis_timeout = redis_timeout
+
+    async def _redis(self, action: str, call: Awaitable):
+        """执行一次 Redis 操作，失败或超时返回 _FAILED（合并只是优化，Redis 不可用时不影响总结本身）"""
+        try:
+            return await asyncio.wait_for(call, timeout=self.redis_timeout)
+        except Exception as e:
+            print(f"    ⚠️ 跨进程合并{action}失败（Redis 不可用时跳过合并）: {e!r}")
+            return _FAILED
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """执行 fn，若其他进程正在处理相同 key 则等待其结果（Redis 出错时直接执行 fn）"""
+        cached = await self._redis("读取结果", self.cache_repo.get_summary(key))
+        if cached is _FAILED:
+            return await fn()
+        if cached:
+            return cached
+
+        acquired = await self._redis("获取锁", self.cache_repo.acquire_summary_lock(key, self.lock_timeout))
+        if acquired is _FAILED:
+            return await fn()
+        if acquired:
+            try:
+                result = await fn()
+                # 写入失败不影响本次结果
+                if result:
+                    await self._redis("写入结果", self.cache_repo.set_summary(key, result))
+                return result
+            finally:
+                await self._redis("释放锁", self.cache_repo.release_summary_lock(key))
+
+        # 其他进程正在处理，等待其结果
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            cached = await self._redis("读取结果", self.cache_repo.get_summary(key))
+            if cached is _FAILED:
+                break
+            if cached:
+                return cached
+            if await self._redis("检查锁", self.cache_repo.summary_lock_exists(key)) in (False, _FAILED):
+                break
+
+        # 领头者失败或超时（或 Redis 不可用），自行处理
+        return await fn()
@@ -0,0 +1,109 @@
+"""
+任务分阶段耗时
+记录早报生成各阶段（列表、抓取、总结、整体总结、保存、缓存、推送）的耗时、计数与失败原因，
+汇总为 JSON 写入 TaskLog.metrics，用于定位哪个阶段变慢
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any
+
+from services.llm_metrics import percentile
+
+# 早报生成的阶段
+PHASE_LIST = "list"
+PHASE_FETCH = "fetch"
+PHASE_SUMMARIZE = "summarize"
+PHASE_DAILY_SUMMARY = "daily_summary"
+PHASE_PERSIST = "persist"
+PHASE_CACHE = "cache"
+PHASE_PUSH = "push"
+
+
+class PhaseTimer:
+    """
+    分阶段计时器
+
+    - phase(name)：计时一段代码（同一阶段可多次进入，耗时与次数累加）
+    - record(name, ms, ...)：记录单个条目的耗时（如每篇文章的抓取），汇总时给出 P50/P95
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.samples: Dict[str, List[float]] = {}
+        self.counts: Dict[str, int] = {}
+        # 合并进来的分位数（原始样本不再保留）
+        self.percentiles: Dict[str, Dict[str, float]] = {}
+
+    def _phase(self, name: str) -> Dict[str, Any]:
+        return self.phases.setdefault(name, {"ms": 0.0, "count": 0, "failed": 0, "errors": {}})
+
+    @contextmanager
+    def phase(self, name: str):
+        """计时一段代码，抛出的异常记为该阶段的失败原因"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.fail(name, type(e).__name__)
+            raise
+        finally:
+            phase = self._phase(name)
+            phase["ms"] += (time.perf_counter() - start) * 1000
+            phase["count"] += 1
+
+    def record(self, name: str, ms: float, ok: bool = True, error: Optional[str] = None):
+        """记录单个条目的耗时与结果"""
+        phase = self._phase(name)
+        phase["count"] += 1
+        self.samples.setdefault(name, []).append(ms)
+        if not ok:
+            self.fail(name, error or "failed")
+
+    def fail(self, name: str, reason: str):
+        """记录一次失败"""
+        phase = self._phase(name)
+        phase["failed"] += 1
+        phase["errors"][reason] = phase["errors"].get(reason, 0) + 1
+
+    def count(self, name: str, value: int = 1):
+        """累加计数（如发现的文章数、使用本地摘要的文章数）"""
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def merge(self, other: Optional[Dict[str, Any]]):
+        """合并另一份 summary() 结果（如发布任务链中各任务的计时）"""
+        for name, stats in ((other or {}).get("phases") or {}).items():
+            phase = self._phase(name)
+            phase["ms"] += stats.get("ms") or 0.0
+            phase["count"] += stats.get("count") or 0
+            phase["failed"] += stats.get("failed") or 0
+            for reason, n in (stats.get("errors") or {}).items():
+                phase["errors"][reason] = phase["errors"].get(reason, 0) + n
+            if "p50_ms" in stats:
+                self.percentiles[name] = {"p50_ms": stats["p50_ms"], "p95_ms": stats.get("p95_ms")}
+        for name, value in ((other or {}).get("counts") or {}).items():
+            self.count(name, value)
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总：{"phases": {阶段: {ms, count, failed, errors, p50_ms, p95_ms}}, "counts", "total_ms"}"""
+        phases = {}
+        for name, phase in self.phases.items():
+            samples = self.samples.get(name) or []
+            # 只记录了条目耗时、没有用 phase() 计时的阶段，以条目耗时之和计
+            ms = phase["ms"] or sum(samples)
+            phases[name] = {
+                "ms": round(ms, 1),
+                "count": phase["count"],
+                "failed": phase["failed"],
+                "errors": dict(phase["errors"]),
+            }
+            if samples:
+                phases[name]["p50_ms"] = round(percentile(samples, 50), 1)
+                phases[name]["p95_ms"] = round(percentile(samples, 95), 1)
+            elif name in self.percentiles:
+                phases[name].update(self.percentiles[name])
+        return {
+            "phases": phases,
+            "counts": dict(self.counts),
+            "total_ms": round(sum(p["ms"] for p in phases.values()), 1),
+        }
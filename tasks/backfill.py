@@ -0,0 +1,81 @@
+"""
+历史早报回填任务
+按发布日期发现历史文章，补生成日期区间内缺少的早报（长时间运行，使用独立的 bulk 队列）
+"""
+from datetime import datetime
+from typing import Optional, List
+import logging
+
+from tasks.celery_app import celery_app
+from tasks.worker_runtime import get_runtime, log_llm_usage
+from services.backfill_service import BackfillService
+from services.llm_metrics import LLMUsageTracker
+from repositories.news_repository import NewsRepository
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name='tasks.backfill.backfill_briefings_task',
+    # 每天的文章需要逐篇抓取，长区间可能超过默认的 1 小时限制
+    soft_time_limit=6 * 3600,
+    time_limit=6 * 3600 + 600
+)
+def backfill_briefings_task(start_date: str, end_date: Optional[str] = None,
+                            sources: Optional[List[str]] = None, limit: Optional[int] = None):
+    """
+    回填历史早报（已存在的日期跳过，可重复执行）
+
+    Args:
+        start_date: 开始日期（YYYY-MM-DD）
+        end_date: 结束日期（YYYY-MM-DD），默认与开始日期相同
+        sources: 消息源列表，默认为 ["aibase"]
+        limit: 每份早报最多包含的文章数，默认为 CRAWLER_MAX_ARTICLES
+    """
+    end_date = end_date or start_date
+    logger.info(f"开始回填早报: {start_date} ~ {end_date}")
+    start_time = datetime.now()
+    settings = get_settings()
+    news_repo = NewsRepository()
+    usage = LLMUsageTracker()
+
+    try:
+        runtime = get_runtime()
+        service = BackfillService.from_settings(settings, runtime.ai_service, news_repo, adapter_factory=runtime)
+        result = runtime.run(service.backfill(
+            start_date, end_date, sources=sources, limit=limit or settings.CRAWLER_MAX_ARTICLES
+        ), usage=usage)
+
+        end_time = datetime.now()
+        duration = int((end_time - start_time).total_seconds())
+        logger.info(f"回填完成: {result}")
+        task_log_id = news_repo.log_task(
+            task_name="backfill",
+            status=result["status"],
+            start_time=start_time,
+            end_time=end_time,
+            duration=duration,
+            result=f"{start_date} ~ {end_date}: 新生成 {result['created']} 天，已存在 {result['skipped']} 天，"
+                   f"无文章 {result['empty']} 天，失败 {result['failed']} 天"
+        )
+        log_llm_usage(news_repo, usage, "backfill", start_date, task_log_id)
+        return {**result, "duration": duration}
+
+    except Exception as e:
+        end_time = datetime.now()
+        duration = int((end_time - start_time).total_seconds())
+        logger.error(f"回填早报失败: {e}", exc_info=True)
+        try:
+            task_log_id = news_repo.log_task(
+                task_name="backfill",
+                status="failed",
+                start_time=start_time,
+                end_time=end_time,
+                duration=duration,
+                error_message=str(e)
+            )
+            log_llm_usage(news_repo, usage, "backfill", start_date, task_log_id)
+        except Exception:
+            pass
+        return {"status": "failed", "error": str(e), "duration": duration}
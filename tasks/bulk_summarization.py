@@ -0,0 +1,161 @@
+"""
+离线批量总结任务
+把待总结的文章提交到批处理接口，定时查询任务状态，完成后批量写回数据库（使用独立的 bulk 队列）
+"""
+import time
+from datetime import datetime
+from typing import Optional, List
+import logging
+
+from tasks.celery_app import celery_app
+from services.ai_summary_service import AISummaryService
+from services.batch_summary import BulkSummarizer, OpenAIBatchBackend, LocalBatchBackend
+from repositories.news_repository import NewsRepository
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_settings = get_settings()
+
+
+def create_bulk_summarizer(settings, news_repo: NewsRepository) -> BulkSummarizer:
+    """根据配置创建批量总结流程"""
+    if settings.AI_BATCH_BACKEND == "local":
+        backend = LocalBatchBackend(AISummaryService.from_settings(settings), settings.AI_BATCH_WORK_DIR)
+    else:
+        api_key = settings.AI_BATCH_API_KEY or settings.AI_API_KEY
+        if not api_key:
+            raise ValueError("未配置 AI_BATCH_API_KEY 或 AI_API_KEY")
+        backend = OpenAIBatchBackend(
+            api_key=api_key,
+            base_url=settings.AI_BATCH_BASE_URL or settings.AI_BASE_URL,
+            completion_window=settings.AI_BATCH_COMPLETION_WINDOW
+        )
+    model = settings.AI_BATCH_MODEL or settings.AI_MODEL
+
+    return BulkSummarizer(
+        backend=backend,
+        news_repo=news_repo,
+        model=model,
+        work_dir=settings.AI_BATCH_WORK_DIR,
+        poll_interval=settings.AI_BATCH_POLL_INTERVAL,
+        max_wait=settings.AI_BATCH_MAX_WAIT,
+        max_input_tokens=settings.AI_SUMMARY_MAX_INPUT_TOKENS or None
+    )
+
+
+def _log_result(news_repo: NewsRepository, start_time: datetime, result: dict):
+    """记录批量总结的任务日志（从提交开始计时）"""
+    end_time = datetime.now()
+    news_repo.log_task(
+        task_name="bulk_summarization",
+        status="success" if result["status"] in ("completed", "skipped") else result["status"],
+        start_time=start_time,
+        end_time=end_time,
+        duration=int((end_time - start_time).total_seconds()),
+        result=f"共 {result['total']} 篇，成功 {result.get('succeeded', 0)} 篇，失败 {result.get('failed', 0)} 篇"
+    )
+
+
+def _log_failure(news_repo: NewsRepository, start_time: datetime, error: Exception) -> dict:
+    end_time = datetime.now()
+    duration = int((end_time - start_time).total_seconds())
+    try:
+        news_repo.log_task(
+            task_name="bulk_summarization",
+            status="failed",
+            start_time=start_time,
+            end_time=end_time,
+            duration=duration,
+            error_message=str(error)
+        )
+    except Exception:
+        pass
+    return {"status": "failed", "error": str(error), "duration": duration}
+
+
+@celery_app.task(
+    name='tasks.bulk_summarization.bulk_summarize_articles_task',
+    # 本地批处理（AI_BATCH_BACKEND=local）在提交时逐条执行，可能需要数小时，放宽默认的 1 小时限制
+    soft_time_limit=_settings.AI_BATCH_MAX_WAIT + 1800,
+    time_limit=_settings.AI_BATCH_MAX_WAIT + 3600
+)
+def bulk_summarize_articles_task(statuses: Optional[List[str]] = None, since: Optional[str] = None,
+                                 limit: Optional[int] = None):
+    """
+    离线批量总结文章：提交批处理任务后立即返回，由 poll_bulk_summary_task 定时查询并写回
+
+    Args:
+        statuses: 选取的文章状态，默认为 pending/failed；修改提示词后可传 ["completed"] 重新总结
+        since: 只处理该日期（YYYY-MM-DD）及之后创建的文章
+        limit: 最多处理的文章数
+    """
+    logger.info(f"开始批量总结: statuses={statuses}, since={since}, limit={limit}")
+    start_time = datetime.now()
+    settings = get_settings()
+    news_repo = NewsRepository()
+
+    try:
+        summarizer = create_bulk_summarizer(settings, news_repo)
+        submitted = summarizer.submit(statuses=statuses, since=since, limit=limit)
+        if not submitted:
+            result = {"status": "skipped", "total": 0}
+            _log_result(news_repo, start_time, result)
+            return result
+
+        # 不在 Worker 中 sleep 等待：按轮询间隔重新投递查询任务，两次查询之间不占用 Worker
+        poll_bulk_summary_task.apply_async(kwargs={
+            "batch_id": submitted["batch_id"],
+            "article_ids": submitted["article_ids"],
+            "deadline": time.time() + settings.AI_BATCH_MAX_WAIT,
+            "started_at": start_time.isoformat(),
+        }, countdown=settings.AI_BATCH_POLL_INTERVAL)
+        logger.info(f"已提交批处理任务 {submitted['batch_id']}: {len(submitted['article_ids'])} 篇")
+        return {"status": "submitted", "batch_id": submitted["batch_id"], "total": len(submitted["article_ids"])}
+
+    except Exception as e:
+        logger.error(f"批量总结失败: {e}", exc_info=True)
+        return _log_failure(news_repo, start_time, e)
+
+
+@celery_app.task(name='tasks.bulk_summarization.poll_bulk_summary_task')
+def poll_bulk_summary_task(batch_id: str, article_ids: List[str], deadline: float, started_at: str):
+    """
+    查询一次批处理任务：仍在执行时按 AI_BATCH_POLL_INTERVAL 重新投递自身，结束（或超时）后批量写回
+
+    Args:
+        batch_id: 批处理任务ID
+        article_ids: 提交的文章ID
+        deadline: 最晚等待到的时间（time.time() 时间戳），超过后取消任务
+        started_at: 提交时间（ISO 格式，任务日志从提交开始计时）
+    """
+    start_time = datetime.fromisoformat(started_at)
+    settings = get_settings()
+    news_repo = NewsRepository()
+
+    try:
+        summarizer = create_bulk_summarizer(settings, news_repo)
+        info = summarizer.check(batch_id, deadline)
+    except Exception as e:
+        if time.time() < deadline:
+            # 查询失败（如网络抖动）不影响批处理任务本身，稍后再查
+            logger.warning(f"查询批处理任务 {batch_id} 失败，稍后重试: {e}")
+            info = None
+        else:
+            logger.error(f"批量总结失败: {e}", exc_info=True)
+            return _log_failure(news_repo, start_time, e)
+
+    if info is None:
+        poll_bulk_summary_task.apply_async(kwargs={
+            "batch_id": batch_id, "article_ids": article_ids, "deadline": deadline, "started_at": started_at,
+        }, countdown=settings.AI_BATCH_POLL_INTERVAL)
+        return {"status": "running", "batch_id": batch_id}
+
+    try:
+        result = summarizer.apply(batch_id, article_ids, info)
+        logger.info(f"批量总结完成: {result}")
+        _log_result(news_repo, start_time, result)
+        return {**result, "duration": int((datetime.now() - start_time).total_seconds())}
+    except Exception as e:
+        logger.error(f"批量总结失败: {e}", exc_info=True)
+        return _log_failure(news_repo, start_time, e)
@@ -2,107 +2,169 @@
 每日早报生成任务
 """
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
 from celery import current_task
+from celery.signals import worker_ready
 import logging
 
 from tasks.celery_app import celery_app
+from tasks.publishing import publish_chain
+from tasks.worker_runtime import WorkerRuntime, get_runtime, log_llm_usage
 from services.news_service import NewsService
-from services.ai_summary_service import AISummaryService
+from services.ingestion_service import IngestionService
+from services.llm_metrics import LLMUsageTracker
+from services.task_metrics import PhaseTimer
 from repositories.news_repository import NewsRepository
-from cache.cache_repository import CacheRepository
-from cache.redis_client import RedisClient
-from config.settings import get_settings, get_ai_settings
+from config.settings import get_settings
+from core.models import BriefingStage
 
 logger = logging.getLogger(__name__)
 
 
-async def _generate_briefing_async(date: str, settings, ai_service, news_repo):
-    """异步生成早报的辅助函数"""
-    cache_repo = None
-    redis_client = None
+async def _generate_briefing_async(date: str, settings, ai_service, news_repo, runtime: WorkerRuntime,
+                                   timer: Optional[PhaseTimer] = None):
+    """
+    异步生成早报的辅助函数（在 Worker 的常驻事件循环中执行，复用 Redis 连接；各阶段耗时记录到 timer）
+
+    news_repo 为同步数据访问层，在线程中调用，不阻塞常驻事件循环上的其他任务
+    """
+    cache_repo = await runtime.get_cache_repo()
+
+    # 检查数据库中是否已存在今天的早报
+    checkpoint = None
+    if news_repo:
+        existing_briefing = await asyncio.to_thread(news_repo.get_daily_briefing, date, include_content=False)
+        checkpoint = await asyncio.to_thread(news_repo.get_checkpoint, date)
+        if existing_briefing:
+            # 早报已保存但崩溃发生在标记完成之前
+            if checkpoint and checkpoint["stage"] != BriefingStage.COMPLETED.value:
+                await asyncio.to_thread(news_repo.save_checkpoint, date, stage=BriefingStage.COMPLETED)
+            logger.info(f"数据库中已存在 {date} 的早报，跳过生成")
+            return {
+                "status": "skipped",
+                "reason": "already_exists",
+                "date": date,
+                "message": f"早报已存在: {existing_briefing.get('title')}"
+            }
+
+    # 获取任务锁
+    if cache_repo:
+        lock_acquired = await cache_repo.acquire_task_lock("daily_briefing", date)
+        if not lock_acquired and _is_stale(checkpoint, settings):
+            # 持有锁的 Worker 已崩溃（检查点长时间未更新），接管任务
+            logger.warning(f"检查点已 {settings.BRIEFING_RESUME_STALE_SECONDS}s 未更新，接管任务锁: {date}")
+            await cache_repo.release_task_lock("daily_briefing", date)
+            lock_acquired = await cache_repo.acquire_task_lock("daily_briefing", date)
+        if not lock_acquired:
+            logger.warning(f"任务已在执行中，跳过: {date}")
+            return {"status": "skipped", "reason": "lock not acquired"}
 
     try:
-        # 连接 Redis
-        redis_client = RedisClient(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            password=settings.REDIS_PASSWORD,
-            db=settings.REDIS_DB
+        # 生成早报（定时任务不使用缓存，强制爬取最新数据）
+        news_service = NewsService(
+            ai_service=ai_service,
+            news_repo=runtime.pipeline_repo if news_repo else None,  # DATABASE_ASYNC 时使用异步数据访问层
+            cache_repo=cache_repo,
+            adapter_factory=runtime,
+            timer=timer
         )
-        await redis_client.connect()
-        if await redis_client.ping():
-            cache_repo = CacheRepository(redis_client)
-            logger.info("Redis连接成功")
-
-        # 检查数据库中是否已存在今天的早报
-        if news_repo:
-            existing_briefing = news_repo.get_daily_briefing(date)
-            if existing_briefing:
-                logger.info(f"数据库中已存在 {date} 的早报，跳过生成")
-                return {
-                    "status": "skipped",
-                    "reason": "already_exists",
-                    "date": date,
-                    "message": f"早报已存在: {existing_briefing.get('title')}"
-                }
-
-        # 获取任务锁
-        if cache_repo:
-            lock_acquired = await cache_repo.acquire_task_lock("daily_briefing", date)
-            if not lock_acquired:
-                logger.warning(f"任务已在执行中，跳过: {date}")
-                return {"status": "skipped", "reason": "lock not acquired"}
 
-        try:
-            # 生成早报（定时任务不使用缓存，强制爬取最新数据）
-            news_service = NewsService(
-                ai_service=ai_service,
-                news_repo=news_repo,
-                cache_repo=cache_repo
+        briefing = None
+        if settings.INGESTION_ENABLED and news_repo:
+            # 持续采集模式：文章已在全天轮询中抓取并总结，这里只挑选排序并生成整体总结
+            ingestion = IngestionService.from_settings(settings, ai_service, news_repo, adapter_factory=runtime)
+            articles = await asyncio.to_thread(
+                ingestion.select_articles, settings.CRAWLER_MAX_ARTICLES, settings.INGESTION_WINDOW_HOURS
             )
+            if articles:
+                logger.info(f"从已处理的文章中挑选 {len(articles)} 篇生成早报")
+                briefing = await news_service.build_briefing(date, articles, save_to_db=True, publish=False)
+            else:
+                logger.warning("最近没有已处理的文章，改为现场抓取")
+
+        if briefing is None:
+            if checkpoint and checkpoint["stage"] != BriefingStage.COMPLETED.value:
+                logger.info(f"从检查点恢复 {date} 的早报（阶段: {checkpoint['stage']}）")
 
             briefing = await news_service.generate_daily_briefing(
                 date=date,
                 sources=["aibase"],
                 limit=settings.CRAWLER_MAX_ARTICLES,
                 use_cache=False,  # 定时任务不使用缓存，强制爬取
-                save_to_db=True
+                save_to_db=True,
+                publish=news_repo is None  # 有数据库时只生成草稿，由发布任务链保存、缓存并推送
             )
 
-            logger.info(f"早报生成成功: {briefing.title}, 共 {briefing.total_count} 篇文章")
+        logger.info(f"早报生成成功: {briefing.title}, 共 {briefing.total_count} 篇文章")
 
-            return {
-                "status": "success",
-                "date": date,
-                "total_count": briefing.total_count,
-                "briefing": briefing
-            }
-
-        finally:
-            # 释放任务锁
-            if cache_repo:
-                await cache_repo.release_task_lock("daily_briefing", date)
+        return {
+            "status": "success",
+            "date": date,
+            "total_count": briefing.total_count,
+            "briefing": briefing
+        }
 
     finally:
-        # 关闭Redis连接
-        if redis_client:
-            await redis_client.disconnect()
+        # 释放任务锁
+        if cache_repo:
+            await cache_repo.release_task_lock("daily_briefing", date)
+
+
+def push_briefing(briefing):
+    """通过 Webhook 推送早报（失败只记录日志）"""
+    try:
+        from services.webhook_service import WebhookService
+        webhook = WebhookService()
+
+        # 构建推送数据
+        briefing_dict = briefing.to_dict() if hasattr(briefing, "to_dict") else (briefing or {})
 
+        # 推送
+        push_results = webhook.send_briefing(briefing_dict)
 
-@celery_app.task(name='tasks.daily_generation.generate_daily_briefing_task')
-def generate_daily_briefing_task():
-    """每日早报生成任务"""
-    date = datetime.now().strftime("%Y-%m-%d")
+        # 记录推送结果
+        success_count = sum(1 for v in push_results.values() if v)
+        logger.info(f"Webhook 推送完成: {success_count}/{len(push_results)} 成功")
+    except Exception as e:
+        logger.warning(f"Webhook 推送失败: {e}")
+
+
+def _is_stale(checkpoint: Optional[dict], settings) -> bool:
+    """检查点是否未完成且长时间未更新（执行者可能已崩溃）"""
+    if not checkpoint or checkpoint["stage"] == BriefingStage.COMPLETED.value:
+        return False
+    updated_at = datetime.fromisoformat(checkpoint["updated_at"])
+    return datetime.now() - updated_at > timedelta(seconds=settings.BRIEFING_RESUME_STALE_SECONDS)
+
+
+# acks_late + reject_on_worker_lost：Worker 崩溃时消息重新投递，由检查点从中断处继续
+@celery_app.task(
+    name='tasks.daily_generation.generate_daily_briefing_task',
+    acks_late=True,
+    reject_on_worker_lost=True
+)
+def generate_daily_briefing_task(date: Optional[str] = None):
+    """
+    每日早报生成任务
+
+    Args:
+        date: 日期（YYYY-MM-DD），默认为今天；存在未完成的检查点时从中断处恢复
+    """
+    date = date or datetime.now().strftime("%Y-%m-%d")
     logger.info(f"开始生成 {date} 的早报...")
 
     start_time = datetime.now()
     settings = get_settings()
+    runtime = get_runtime()
+    timer = None
+    # 本次任务的大模型调用统计（AI 服务由进程共享，其他任务的调用不会计入）
+    usage = LLMUsageTracker()
 
     try:
-        # 初始化 AI 服务
+        # 进程共享的 AI 服务（支持多提供商池）
         try:
-            api_key, base_url, model = get_ai_settings()
+            ai_service = runtime.ai_service
         except ValueError as e:
             logger.error(f"AI 配置错误: {e}")
             return {
@@ -112,23 +174,17 @@ def generate_daily_briefing_task():
                 "duration": 0
             }
 
-        ai_service = AISummaryService(
-            api_key=api_key,
-            base_url=base_url,
-            model=model,
-            max_concurrent=settings.AI_SUMMARY_CONCURRENT
-        )
-
         # 初始化数据库
         news_repo = None
         try:
-            news_repo = NewsRepository()
-            logger.info("数据库连接成功")
+            news_repo = runtime.news_repo
         except Exception as e:
             logger.warning(f"数据库连接失败: {e}")
 
-        # 运行异步任务（只创建一次事件循环）
-        result = asyncio.run(_generate_briefing_async(date, settings, ai_service, news_repo))
+        # 在 Worker 的常驻事件循环中运行
+        timer = PhaseTimer()
+        result = runtime.run(_generate_briefing_async(date, settings, ai_service, news_repo, runtime, timer),
+                             usage=usage)
 
         # 计算耗时
         end_time = datetime.now()
@@ -136,33 +192,25 @@ def generate_daily_briefing_task():
 
         # 记录任务日志
         if result.get("status") == "success":
+            task_log_id = None
             if news_repo:
-                news_repo.log_task(
+                task_log_id = news_repo.log_task(
                     task_name="daily_briefing",
                     status="success",
                     start_time=start_time,
                     end_time=end_time,
                     duration=duration,
-                    result=f"生成 {result['total_count']} 篇文章"
+                    result=f"生成 {result['total_count']} 篇文章",
+                    metrics=timer.summary()
                 )
+            log_llm_usage(news_repo, usage, "daily_briefing", date, task_log_id)
 
-            # Webhook 推送
-            if settings.WEBHOOK_ENABLED:
-                try:
-                    from services.webhook_service import WebhookService
-                    webhook = WebhookService()
-
-                    # 构建推送数据
-                    briefing_dict = result["briefing"].to_dict() if hasattr(result.get("briefing"), "to_dict") else result.get("briefing", {})
-
-                    # 推送
-                    push_results = webhook.send_briefing(briefing_dict)
-
-                    # 记录推送结果
-                    success_count = sum(1 for v in push_results.values() if v)
-                    logger.info(f"Webhook 推送完成: {success_count}/{len(push_results)} 成功")
-                except Exception as e:
-                    logger.warning(f"Webhook 推送失败: {e}")
+            if news_repo:
+                # 保存、写缓存、推送由独立队列上的任务链完成，不占用生成任务的 Worker
+                # （各自的耗时补充到同一条任务日志中）
+                publish_chain(date, task_log_id=task_log_id).apply_async()
+            elif settings.WEBHOOK_ENABLED:
+                push_briefing(result.get("briefing"))
 
             return {
                 "status": "success",
@@ -201,20 +249,25 @@ def generate_daily_briefing_task():
         end_time = datetime.now()
         duration = int((end_time - start_time).total_seconds())
         error_msg = str(e)
+        metrics = timer.summary() if timer else None
 
         logger.error(f"生成早报失败: {error_msg}", exc_info=True)
 
-        # 记录失败日志
+        # 记录失败日志（连同已发生的大模型调用，便于排查提供商问题）
         try:
             if news_repo:
-                news_repo.log_task(
+                task_log_id = news_repo.log_task(
                     task_name="daily_briefing",
                     status="failed",
                     start_time=start_time,
                     end_time=end_time,
                     duration=duration,
-                    error_message=error_msg
+                    error_message=error_msg,
+                    metrics=metrics
                 )
+                if news_repo.get_checkpoint(date):
+                    news_repo.save_checkpoint(date, error_message=error_msg)
+                log_llm_usage(news_repo, usage, "daily_briefing", date, task_log_id)
         except:
             pass
 
@@ -238,3 +291,48 @@ def cleanup_cache_task():
     except Exception as e:
         logger.error(f"缓存清理失败: {e}")
         return {"status": "failed", "error": str(e)}
+
+
+@celery_app.task(name='tasks.daily_generation.resume_incomplete_briefings_task')
+def resume_incomplete_briefings_task():
+    """恢复执行者已崩溃的早报生成（检查点未完成且长时间未更新）"""
+    settings = get_settings()
+    try:
+        news_repo = NewsRepository()
+        stale_before = datetime.now() - timedelta(seconds=settings.BRIEFING_RESUME_STALE_SECONDS)
+        checkpoints = news_repo.list_incomplete_checkpoints(stale_before=stale_before)
+    except Exception as e:
+        logger.warning(f"查询未完成的检查点失败: {e}")
+        return {"status": "failed", "error": str(e)}
+
+    resumed = []
+    for checkpoint in checkpoints:
+        if (checkpoint.get("attempts") or 1) >= settings.BRIEFING_RESUME_MAX_ATTEMPTS:
+            logger.warning(f"{checkpoint['date']} 的早报已执行 {checkpoint['attempts']} 次，不再自动恢复")
+            continue
+        logger.info(f"恢复 {checkpoint['date']} 的早报生成（阶段: {checkpoint['stage']}）")
+        generate_daily_briefing_task.apply_async(kwargs={"date": checkpoint["date"]}, queue='briefing')
+        resumed.append(checkpoint["date"])
+
+    return {"status": "success", "resumed": resumed}
+
+
+def _consumes_queue(consumer, queue_name: str) -> bool:
+    """Worker 是否消费指定队列（consumer 为 worker_ready 信号的 sender）"""
+    task_consumer = getattr(consumer, "task_consumer", None)
+    return any(queue.name == queue_name for queue in getattr(task_consumer, "queues", None) or [])
+
+
+@worker_ready.connect
+def _resume_on_worker_ready(sender=None, **kwargs):
+    """
+    Worker 启动后检查是否有中断的早报需要恢复（重启后恢复时间只与剩余工作量相关）
+
+    按队列分组部署时每个分组都是一个 Worker，只由消费 briefing 队列的 Worker 提交，一次重启只恢复一次
+    """
+    if not _consumes_queue(sender, "briefing"):
+        return
+    try:
+        resume_incomplete_briefings_task.apply_async(countdown=get_settings().BRIEFING_RESUME_STALE_SECONDS)
+    except Exception as e:
+        logger.warning(f"提交恢复任务失败: {e}")
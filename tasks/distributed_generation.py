@@ -0,0 +1,259 @@
+"""
+分布式早报生成任务
+基于 Celery group/chord 把抓取和总结拆分到多个 Worker 并行执行：
+
+    每个消息源一个列表任务（crawl 队列）
+        → 每篇文章一条「抓取 → 总结」链（crawl / summarize 队列）
+            → 汇总任务：生成整体总结并保存（briefing 队列）
+                → 发布任务链：写缓存、推送（cache / push 队列）
+
+任务之间只传递文章ID，文章内容通过数据库共享，因此分布式模式需要配置 DATABASE_URL
+"""
+from datetime import datetime
+from typing import Optional, List
+import logging
+
+from celery import chain, chord, group
+from celery.exceptions import Retry
+
+from tasks.celery_app import celery_app
+from tasks.publishing import delivery_chain
+from tasks.worker_runtime import get_runtime, log_llm_usage
+from core.models import Article, ArticleStatus
+from services.news_service import NewsService
+from services.llm_metrics import LLMUsageTracker
+from services.task_metrics import PhaseTimer
+from repositories.news_repository import NewsRepository
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='tasks.distributed_generation.generate_daily_briefing_distributed_task')
+def generate_daily_briefing_distributed_task(date: Optional[str] = None, sources: Optional[List[str]] = None,
+                                             limit: Optional[int] = None):
+    """
+    分布式生成每日早报（只负责编排，立即返回）
+
+    Args:
+        date: 日期（YYYY-MM-DD），默认为今天
+        sources: 消息源列表，默认为 ["aibase"]
+        limit: 每个消息源的文章数，默认为 CRAWLER_MAX_ARTICLES
+    """
+    settings = get_settings()
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    sources = sources or ["aibase"]
+    limit = limit or settings.CRAWLER_MAX_ARTICLES
+
+    news_repo = NewsRepository()
+    existing_briefing = news_repo.get_daily_briefing(date, include_content=False)
+    if existing_briefing:
+        logger.info(f"数据库中已存在 {date} 的早报，跳过生成")
+        return {"status": "skipped", "reason": "already_exists", "date": date}
+
+    logger.info(f"分布式生成 {date} 的早报: {sources}")
+    workflow = chord(
+        group(list_source_articles_task.s(source, limit) for source in sources),
+        dispatch_articles_task.s(date)
+    )
+    workflow.apply_async()
+    return {"status": "dispatched", "date": date, "sources": sources}
+
+
+@celery_app.task(name='tasks.distributed_generation.list_source_articles_task')
+def list_source_articles_task(source: str, limit: int) -> List[List[str]]:
+    """获取消息源的文章列表，返回 [[source, url], ...]"""
+    runtime = get_runtime()
+    adapter = runtime.get_adapter(source)
+    if not adapter:
+        logger.warning(f"未知的消息源: {source}")
+        return []
+    try:
+        urls = runtime.run(adapter.fetch_article_list(limit))
+    except Exception as e:
+        logger.warning(f"获取 {source} 文章列表失败: {e}")
+        return []
+    logger.info(f"{source} 找到 {len(urls)} 篇文章")
+    return [[source, url] for url in urls]
+
+
+@celery_app.task(name='tasks.distributed_generation.dispatch_articles_task')
+def dispatch_articles_task(url_lists: List[List[List[str]]], date: str):
+    """为每篇文章创建「抓取 → 总结」链，全部完成后执行汇总任务"""
+    targets = []
+    seen = set()
+    for url_list in url_lists:
+        for source, url in url_list or []:
+            if url not in seen:
+                seen.add(url)
+                targets.append((source, url))
+
+    if not targets:
+        logger.warning(f"{date} 未获取到任何文章")
+        return {"status": "empty", "date": date}
+
+    logger.info(f"分发 {len(targets)} 篇文章的抓取与总结任务")
+    chord(
+        group(chain(fetch_article_task.s(source, url), summarize_article_task.s(date=date)) for source, url in targets),
+        assemble_briefing_task.s(date)
+    ).apply_async()
+    return {"status": "dispatched", "date": date, "total": len(targets)}
+
+
+@celery_app.task(bind=True, name='tasks.distributed_generation.fetch_article_task',
+                 max_retries=2, default_retry_delay=10)
+def fetch_article_task(self, source: str, url: str) -> Optional[str]:
+    """
+    抓取单篇文章并保存，返回文章ID（失败返回 None，不中断整个 chord）
+
+    已总结过的文章直接复用
+    """
+    news_repo = NewsRepository()
+    existing = news_repo.get_article_by_url(url)
+    if existing and existing.get("summary") and existing.get("status") == ArticleStatus.COMPLETED.value:
+        return existing["id"]
+
+    try:
+        runtime = get_runtime()
+        adapter = runtime.get_adapter(source)
+        article = runtime.run(adapter.fetch_article(url)) if adapter else None
+        if not article:
+            logger.warning(f"抓取失败: {url}")
+            return None
+        return news_repo.save_article(article)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        logger.warning(f"抓取失败（已重试 {self.max_retries} 次）: {url}: {e}")
+        return None
+
+
+@celery_app.task(bind=True, name='tasks.distributed_generation.summarize_article_task',
+                 max_retries=2, default_retry_delay=10)
+def summarize_article_task(self, article_id: Optional[str], date: Optional[str] = None) -> Optional[str]:
+    """
+    总结单篇文章并保存，返回文章ID（抓取失败的文章原样传递 None）
+
+    Args:
+        article_id: 文章ID
+        date: 所属早报的日期（记录大模型调用统计用），默认为今天
+    """
+    if not article_id:
+        return None
+
+    news_repo = NewsRepository()
+    data = news_repo.get_article_by_id(article_id)
+    if not data:
+        return None
+    article = Article(**data)
+    if article.summary and article.status == ArticleStatus.COMPLETED:
+        return article_id
+
+    # 之前只得到本地摘要兜底的文章清空总结，batch_generate_summaries 才会重新请求大模型
+    article.summary = None
+    usage = LLMUsageTracker()
+    try:
+        runtime = get_runtime()
+        runtime.run(runtime.ai_service.batch_generate_summaries([article]), usage=usage)
+        if article.status != ArticleStatus.COMPLETED:
+            # 大模型调用失败时 batch_generate_summaries 不抛异常，而是写入本地摘要兜底
+            if self.request.retries < self.max_retries:
+                raise self.retry()
+            # 重试用尽：保留兜底摘要供早报使用，标记为失败并计入失败次数，持续采集会在上限内重新总结
+            news_repo.save_article(article)
+            news_repo.record_summary_failures([article_id])
+            logger.warning(f"总结失败（已重试 {self.max_retries} 次），使用本地摘要: {article_id}")
+        else:
+            news_repo.save_article(article)
+    except Retry:
+        raise
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        logger.warning(f"总结失败（已重试 {self.max_retries} 次）: {article_id}: {e}")
+    finally:
+        # 每次执行（包括将要重试的）单独记录一条统计
+        log_llm_usage(news_repo, usage, "summarize_article", date or datetime.now().strftime("%Y-%m-%d"))
+    return article_id
+
+
+async def _assemble_async(date: str, articles: List[Article], runtime, timer: Optional[PhaseTimer] = None):
+    """生成整体总结并保存早报（缓存与推送由发布任务链完成）"""
+    news_service = NewsService(
+        ai_service=runtime.ai_service,
+        news_repo=runtime.pipeline_repo,
+        cache_repo=await runtime.get_cache_repo(),
+        adapter_factory=runtime,
+        timer=timer
+    )
+    return await news_service.build_briefing(date, articles, save_to_db=True, use_cache=False)
+
+
+def _log_briefing_usage(news_repo: NewsRepository, usage: LLMUsageTracker, date: str, task_log_id: int):
+    """
+    记录早报的大模型调用统计：合并当天各篇文章的总结（summarize_article），
+    使 daily_briefing 的统计包含完整的费用，并把这些记录关联到早报的任务日志
+    """
+    try:
+        article_logs = news_repo.get_unattached_llm_usage_logs("summarize_article", date)
+    except Exception as e:
+        logger.warning(f"读取单篇总结的调用统计失败: {e}")
+        article_logs = []
+    log_llm_usage(news_repo, usage, "daily_briefing", date, task_log_id, merge_logs=article_logs)
+    try:
+        news_repo.attach_llm_usage_logs([log["id"] for log in article_logs], task_log_id)
+    except Exception as e:
+        logger.warning(f"关联单篇总结的调用统计失败: {e}")
+
+
+@celery_app.task(name='tasks.distributed_generation.assemble_briefing_task')
+def assemble_briefing_task(article_ids: List[Optional[str]], date: str):
+    """汇总任务：按原顺序组装文章，生成整体总结并保存，再交给发布任务链缓存和推送"""
+    start_time = datetime.now()
+    runtime = get_runtime()
+    news_repo = runtime.news_repo
+    timer = PhaseTimer()
+    timer.count("articles", len(article_ids))
+    # 整体总结的大模型调用统计（单篇文章的总结由各 summarize_article_task 记录，写入时合并）
+    usage = LLMUsageTracker()
+
+    try:
+        articles = [Article(**data) for data in news_repo.get_articles_by_ids([i for i in article_ids if i])]
+        logger.info(f"汇总 {date} 的早报: {len(articles)}/{len(article_ids)} 篇文章")
+
+        timer.count("summarized", sum(1 for article in articles if article.summary))
+        briefing = runtime.run(_assemble_async(date, articles, runtime, timer), usage=usage)
+
+        end_time = datetime.now()
+        task_log_id = news_repo.log_task(
+            task_name="daily_briefing",
+            status="success",
+            start_time=start_time,
+            end_time=end_time,
+            duration=int((end_time - start_time).total_seconds()),
+            result=f"分布式生成 {briefing.total_count} 篇文章",
+            metrics=timer.summary()
+        )
+        _log_briefing_usage(news_repo, usage, date, task_log_id)
+
+        delivery_chain(briefing.id, task_log_id=task_log_id).apply_async()
+
+        return {"status": "success", "date": date, "total_count": briefing.total_count}
+
+    except Exception as e:
+        end_time = datetime.now()
+        logger.error(f"汇总早报失败: {e}", exc_info=True)
+        try:
+            task_log_id = news_repo.log_task(
+                task_name="daily_briefing",
+                status="failed",
+                start_time=start_time,
+                end_time=end_time,
+                duration=int((end_time - start_time).total_seconds()),
+                error_message=str(e),
+                metrics=timer.summary()
+            )
+            _log_briefing_usage(news_repo, usage, date, task_log_id)
+        except Exception:
+            pass
+        return {"status": "failed", "date": date, "error": str(e)}
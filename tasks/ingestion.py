@@ -0,0 +1,92 @@
+"""
+持续采集任务
+由 Celery Beat 按 INGESTION_INTERVAL 定时触发，发现新文章后立即抓取、保存并总结
+"""
+from datetime import datetime
+from typing import Optional, List
+import logging
+
+from tasks.celery_app import celery_app
+from tasks.worker_runtime import WorkerRuntime, get_runtime, log_llm_usage
+from services.ingestion_service import IngestionService
+from services.llm_metrics import LLMUsageTracker
+from repositories.news_repository import NewsRepository
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _ingest_async(runtime: WorkerRuntime, settings, news_repo: NewsRepository,
+                        sources: Optional[List[str]], limit: int):
+    """轮询一次（有 Redis 时按消息源加锁，避免上一轮未结束时重复采集，不同消息源的轮询互不影响）"""
+    cache_repo = await runtime.get_cache_repo()
+    lock_key = "poll:" + ",".join(sorted(sources or ["aibase"]))
+    if cache_repo and not await cache_repo.acquire_task_lock("ingestion", lock_key):
+        logger.info("上一轮采集仍在执行，跳过")
+        return {"status": "skipped", "reason": "lock not acquired"}
+
+    try:
+        ai_service = runtime.ai_service
+        if cache_repo:
+            ai_service.attach_cache(cache_repo)
+        service = IngestionService.from_settings(settings, ai_service, news_repo, adapter_factory=runtime)
+        return {"status": "success", **await service.poll(sources, limit)}
+    finally:
+        if cache_repo:
+            await cache_repo.release_task_lock("ingestion", lock_key)
+
+
+@celery_app.task(name='tasks.ingestion.ingest_articles_task')
+def ingest_articles_task(sources: Optional[List[str]] = None, limit: Optional[int] = None):
+    """
+    持续采集：抓取并总结消息源上的新文章
+
+    Args:
+        sources: 消息源列表，默认为 ["aibase"]
+        limit: 每个消息源检查的最新文章数，默认为 INGESTION_MAX_ARTICLES
+    """
+    start_time = datetime.now()
+    settings = get_settings()
+    runtime = get_runtime()
+    news_repo = runtime.news_repo
+    # 本次轮询的大模型调用统计
+    usage = LLMUsageTracker()
+
+    try:
+        result = runtime.run(_ingest_async(runtime, settings, news_repo, sources,
+                                           limit or settings.INGESTION_MAX_ARTICLES), usage=usage)
+        end_time = datetime.now()
+        duration = int((end_time - start_time).total_seconds())
+        if result["status"] == "success":
+            logger.info(f"采集完成: {result}")
+            # 没有新文章的轮询不记录任务日志，避免刷屏
+            task_log_id = None
+            if result["fetched"] or result["summarized"]:
+                task_log_id = news_repo.log_task(
+                    task_name="ingestion",
+                    status="success",
+                    start_time=start_time,
+                    end_time=end_time,
+                    duration=duration,
+                    result=f"发现 {result['found']} 篇，新抓取 {result['fetched']} 篇，完成总结 {result['summarized']} 篇"
+                )
+            log_llm_usage(news_repo, usage, "ingestion", start_time.strftime("%Y-%m-%d"), task_log_id)
+        return {**result, "duration": duration}
+
+    except Exception as e:
+        end_time = datetime.now()
+        duration = int((end_time - start_time).total_seconds())
+        logger.error(f"采集失败: {e}", exc_info=True)
+        try:
+            task_log_id = news_repo.log_task(
+                task_name="ingestion",
+                status="failed",
+                start_time=start_time,
+                end_time=end_time,
+                duration=duration,
+                error_message=str(e)
+            )
+            log_llm_usage(news_repo, usage, "ingestion", start_time.strftime("%Y-%m-%d"), task_log_id)
+        except Exception:
+            pass
+        return {"status": "failed", "error": str(e), "duration": duration}
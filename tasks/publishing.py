@@ -0,0 +1,166 @@
+"""
+早报发布任务链
+生成任务产出草稿后，由独立的任务依次完成：
+
+    persist（persist 队列）→ cache-warm（cache 队列）→ push（push 队列）
+
+每一步单独重试，任务之间只传递早报ID；推送目标响应慢只占用 push 队列的 Worker，不影响早报生成。
+传入 task_log_id 时，各步骤的耗时补充到生成任务的任务日志（TaskLog.metrics）中
+"""
+from datetime import datetime
+from typing import Optional, List
+import logging
+import time
+
+from celery import chain
+
+from tasks.celery_app import celery_app
+from tasks.worker_runtime import WorkerRuntime, get_runtime
+from services.news_service import NewsService
+from services.webhook_service import WebhookService
+from services.task_metrics import PhaseTimer, PHASE_CACHE, PHASE_PUSH
+from repositories.news_repository import NewsRepository
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def publish_chain(date: str, task_log_id: Optional[int] = None):
+    """草稿发布任务链：持久化 → 写缓存 →（启用 Webhook 时）推送"""
+    tasks = [persist_briefing_task.si(date, task_log_id=task_log_id),
+             warm_briefing_cache_task.s(task_log_id=task_log_id)]
+    if get_settings().WEBHOOK_ENABLED:
+        tasks.append(push_briefing_task.s(task_log_id=task_log_id))
+    return chain(*tasks)
+
+
+def delivery_chain(briefing_id: int, task_log_id: Optional[int] = None):
+    """已保存早报的发布任务链：写缓存 →（启用 Webhook 时）推送"""
+    tasks = [warm_briefing_cache_task.si(briefing_id, task_log_id=task_log_id)]
+    if get_settings().WEBHOOK_ENABLED:
+        tasks.append(push_briefing_task.s(task_log_id=task_log_id))
+    return chain(*tasks)
+
+
+def _record_metrics(news_repo: NewsRepository, task_log_id: Optional[int], timer: PhaseTimer):
+    """把本步骤的耗时合并到任务日志（失败只记录日志，不影响发布）"""
+    if not task_log_id or not timer.phases:
+        return
+    try:
+        metrics = news_repo.get_task_metrics(task_log_id)
+        if metrics is None:
+            return
+        merged = PhaseTimer()
+        merged.merge(metrics)
+        merged.merge(timer.summary())
+        news_repo.update_task_metrics(task_log_id, merged.summary())
+    except Exception as e:
+        logger.warning(f"记录发布耗时失败: {e}")
+
+
+@celery_app.task(bind=True, name='tasks.publishing.persist_briefing_task',
+                 autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def persist_briefing_task(self, date: str, task_log_id: Optional[int] = None) -> Optional[int]:
+    """把草稿保存为正式早报，返回早报ID（已保存过时直接返回已有的ID）"""
+    runtime = get_runtime()
+    news_repo = runtime.news_repo
+    timer = PhaseTimer()
+    news_service = NewsService(ai_service=None, news_repo=runtime.pipeline_repo, timer=timer)
+    briefing_id = runtime.run(news_service.persist_draft(date))
+    _record_metrics(news_repo, task_log_id, timer)
+    if briefing_id is None:
+        logger.warning(f"没有找到 {date} 的早报草稿")
+    else:
+        logger.info(f"{date} 的早报已保存（ID: {briefing_id}）")
+    return briefing_id
+
+
+async def _warm_async(briefing_id: int, runtime: WorkerRuntime, timer: Optional[PhaseTimer] = None) -> bool:
+    """写入缓存，返回早报是否存在"""
+    cache_repo = await runtime.get_cache_repo()
+    if not cache_repo:
+        raise ConnectionError("Redis 不可用")
+    news_service = NewsService(ai_service=None, news_repo=runtime.pipeline_repo, cache_repo=cache_repo, timer=timer)
+    return await news_service.warm_cache(briefing_id) is not None
+
+
+@celery_app.task(bind=True, name='tasks.publishing.warm_briefing_cache_task', max_retries=3)
+def warm_briefing_cache_task(self, briefing_id: Optional[int], task_log_id: Optional[int] = None) -> Optional[int]:
+    """把早报写入缓存，原样返回早报ID（缓存失败不阻断推送）"""
+    if briefing_id is None:
+        return None
+    runtime = get_runtime()
+    timer = PhaseTimer()
+    try:
+        if not runtime.run(_warm_async(briefing_id, runtime, timer)):
+            logger.warning(f"早报不存在: {briefing_id}")
+            return None
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=2 ** self.request.retries)
+        logger.warning(f"写入缓存失败（已重试 {self.max_retries} 次）: {e}")
+        timer.fail(PHASE_CACHE, type(e).__name__)
+    _record_metrics(runtime.news_repo, task_log_id, timer)
+    return briefing_id
+
+
+@celery_app.task(bind=True, name='tasks.publishing.push_briefing_task', max_retries=3)
+def push_briefing_task(self, briefing_id: Optional[int], urls: Optional[List[str]] = None,
+                       task_log_id: Optional[int] = None):
+    """
+    通过 Webhook 推送早报
+
+    Args:
+        briefing_id: 早报ID
+        urls: 推送地址（重试时只传入上次失败的地址），默认为 WEBHOOK_URL
+        task_log_id: 记录推送耗时的任务日志ID
+    """
+    if briefing_id is None:
+        return {"status": "skipped"}
+
+    news_repo = NewsRepository()
+    data = news_repo.get_briefing_by_id(briefing_id)
+    if not data:
+        logger.warning(f"早报不存在: {briefing_id}")
+        return {"status": "skipped"}
+    data.pop("article_ids", None)
+
+    webhook = WebhookService(",".join(urls) if urls else None)
+    start = time.perf_counter()
+    results = webhook.send_briefing(data)
+    failed = [url for url, ok in results.items() if not ok]
+
+    # 每次尝试（含重试）的耗时都计入推送阶段
+    timer = PhaseTimer()
+    timer.record(PHASE_PUSH, (time.perf_counter() - start) * 1000, ok=not failed, error="webhook_failed")
+    _record_metrics(news_repo, task_log_id, timer)
+
+    if failed and self.request.retries < self.max_retries:
+        logger.warning(f"{len(failed)} 个地址推送失败，稍后重试")
+        raise self.retry(args=(briefing_id,), kwargs={"urls": failed, "task_log_id": task_log_id},
+                         countdown=30 * 2 ** self.request.retries)
+
+    return {"status": "success" if not failed else "partial", "briefing_id": briefing_id,
+            "succeeded": len(results) - len(failed), "failed": failed}
+
+
+@celery_app.task(bind=True, name='tasks.publishing.push_channel_task', max_retries=6)
+def push_channel_task(self, webhook_url: str, date: Optional[str] = None):
+    """
+    按推送渠道自己的发布时间推送早报（由调度表中的 push 条目触发）
+
+    Args:
+        webhook_url: 渠道的推送地址（多个用逗号、分号或空格分隔）
+        date: 日期（YYYY-MM-DD），默认为今天；早报尚未生成时稍后重试
+    """
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    briefing = NewsRepository().get_daily_briefing(date, include_content=False)
+    if not briefing:
+        if self.request.retries < self.max_retries:
+            logger.info(f"{date} 的早报尚未生成，稍后重试推送")
+            raise self.retry(args=(webhook_url, date), countdown=300)
+        logger.warning(f"{date} 的早报未生成，放弃推送: {webhook_url}")
+        return {"status": "skipped", "date": date}
+
+    push_briefing_task.delay(briefing["id"], urls=WebhookService(webhook_url).webhook_urls)
+    return {"status": "queued", "date": date, "briefing_id": briefing["id"]}
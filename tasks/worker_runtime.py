@@ -0,0 +1,219 @@
+"""
+Worker 进程运行时
+每个 Worker 子进程在 worker_process_init 时创建一个常驻事件循环（后台线程）和可复用的资源：
+Redis 连接、AI 服务（大模型客户端、自适应并发与提供商健康统计）、消息源适配器、数据库引擎。
+任务把协程提交到常驻事件循环执行，不再每次 asyncio.run 并重新建立连接
+"""
+import time
+import asyncio
+import threading
+import logging
+from typing import Optional, Dict, Any, Coroutine, List
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from adapters.factory import AdapterFactory
+from services.ai_summary_service import AISummaryService
+from services.llm_metrics import LLMUsageTracker, track_usage, merge_usage, merge_provider_usage
+from repositories.news_repository import NewsRepository
+from repositories.async_news_repository import AsyncNewsRepository
+from cache.cache_repository import CacheRepository
+from cache.redis_client import RedisClient
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Redis 不可用时，间隔该时间（秒）后再尝试重连
+REDIS_RETRY_INTERVAL = 30
+
+
+class WorkerRuntime:
+    """Worker 进程内常驻的事件循环与共享资源"""
+
+    def __init__(self, settings=None):
+        self.settings = settings or get_settings()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="worker-event-loop", daemon=True)
+        self._thread.start()
+
+        self._lock = threading.Lock()
+        self._ai_service: Optional[AISummaryService] = None
+        self._news_repo: Optional[NewsRepository] = None
+        self._async_news_repo: Optional[AsyncNewsRepository] = None
+        self._adapters: Dict[str, Any] = {}
+        self._redis_client: Optional[RedisClient] = None
+        self._cache_repo: Optional[CacheRepository] = None
+        self._redis_retry_at = 0.0
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None,
+            usage: Optional[LLMUsageTracker] = None) -> Any:
+        """
+        在常驻事件循环中执行协程并等待结果（供同步的任务函数调用）
+
+        传入 usage 时，协程中的大模型调用单独记录到 usage（同一进程中并发执行的任务互不影响）
+        """
+        if usage is not None:
+            coro = _tracked(coro, usage)
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    @property
+    def ai_service(self) -> AISummaryService:
+        """进程共享的 AI 服务（配置错误时抛出 ValueError）"""
+        with self._lock:
+            if self._ai_service is None:
+                self._ai_service = AISummaryService.from_settings(self.settings)
+            return self._ai_service
+
+    @property
+    def news_repo(self) -> NewsRepository:
+        """进程共享的数据访问层（数据库引擎与连接池由 database.base 管理）"""
+        with self._lock:
+            if self._news_repo is None:
+                self._news_repo = NewsRepository()
+            return self._news_repo
+
+    @property
+    def pipeline_repo(self):
+        """
+        异步流程（NewsService）使用的数据访问层
+
+        DATABASE_ASYNC 为 True 时为 AsyncNewsRepository（连接池绑定在常驻事件循环上），否则与 news_repo 相同
+        """
+        if not self.settings.DATABASE_ASYNC:
+            return self.news_repo
+        with self._lock:
+            if self._async_news_repo is None:
+                self._async_news_repo = AsyncNewsRepository()
+            return self._async_news_repo
+
+    def get_adapter(self, source: str):
+        """获取消息源适配器（每个进程每种消息源只创建一次）"""
+        with self._lock:
+            if source not in self._adapters:
+                self._adapters[source] = AdapterFactory.get_adapter(source)
+            return self._adapters[source]
+
+    async def get_cache_repo(self) -> Optional[CacheRepository]:
+        """获取缓存仓储（复用同一个 Redis 连接池，不可用时返回 None 并在一段时间后重试）"""
+        if self._cache_repo:
+            return self._cache_repo
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        try:
+            self._redis_client = RedisClient(
+                host=self.settings.REDIS_HOST,
+                port=self.settings.REDIS_PORT,
+                password=self.settings.REDIS_PASSWORD,
+                db=self.settings.REDIS_DB
+            )
+            await self._redis_client.connect()
+            if await self._redis_client.ping():
+                self._cache_repo = CacheRepository(self._redis_client)
+                logger.info("Redis连接成功")
+                return self._cache_repo
+        except Exception as e:
+            logger.warning(f"Redis连接失败: {e}")
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+        return None
+
+    def warm(self):
+        """预先创建各项资源，让第一个任务也无需等待初始化"""
+        try:
+            self.ai_service
+        except ValueError as e:
+            logger.error(f"AI 配置错误: {e}")
+        if self.settings.DATABASE_URL:
+            try:
+                from database.base import get_db_manager
+                with get_db_manager().engine.connect():
+                    pass
+            except Exception as e:
+                logger.warning(f"数据库连接失败: {e}")
+        self.run(self.get_cache_repo())
+
+    def shutdown(self):
+        """关闭 Redis 连接、异步数据库连接池并停止事件循环"""
+        if self._redis_client:
+            try:
+                self.run(self._redis_client.disconnect(), timeout=5)
+            except Exception:
+                pass
+        if self._async_news_repo is not None:
+            try:
+                from database.base import get_async_db_manager
+                self.run(get_async_db_manager().dispose(), timeout=5)
+            except Exception:
+                pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+async def _tracked(coro: Coroutine, usage: LLMUsageTracker) -> Any:
+    with track_usage(usage):
+        return await coro
+
+
+def log_llm_usage(news_repo, usage: LLMUsageTracker, task_name: str, date: str,
+                  task_log_id: Optional[int] = None, merge_logs: Optional[List[dict]] = None):
+    """
+    记录一次任务的大模型调用统计（没有调用时跳过，记录失败只打印日志）
+
+    Args:
+        merge_logs: 一并计入的其他调用统计记录（分布式模式下各篇文章的总结）
+    """
+    summary = usage.summary()
+    if merge_logs:
+        summaries = [summary, *merge_logs]
+        summary = {**merge_usage(summaries), "providers": merge_provider_usage(summaries)}
+    if not summary["calls"]:
+        return
+    logger.info(
+        f"大模型调用统计: {summary['calls']} 次调用（失败 {summary['failed_calls']}，重试 {summary['retries']}），"
+        f"{summary['total_tokens']} tokens，费用 {summary['cost']}，"
+        f"P50 {summary['latency_p50_ms']}ms / P95 {summary['latency_p95_ms']}ms"
+    )
+    if news_repo:
+        try:
+            news_repo.log_llm_usage(task_name, date, summary, task_log_id=task_log_id)
+        except Exception as e:
+            logger.warning(f"记录大模型调用统计失败: {e}")
+
+
+_runtime: Optional[WorkerRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> WorkerRuntime:
+    """获取当前进程的运行时（solo / threads 等不触发 worker_process_init 的模式下首次调用时创建）"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = WorkerRuntime()
+        return _runtime
+
+
+@worker_process_init.connect
+def init_worker_runtime(**kwargs):
+    """Worker 子进程启动：丢弃从父进程继承的数据库连接，创建运行时并预热资源"""
+    settings = get_settings()
+    if settings.DATABASE_URL:
+        try:
+            from database.base import get_db_manager
+            get_db_manager().engine.dispose(close=False)
+        except Exception as e:
+            logger.warning(f"数据库连接失败: {e}")
+    get_runtime().warm()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_runtime(**kwargs):
+    """Worker 子进程退出：释放运行时资源"""
+    global _runtime
+    with _runtime_lock:
+        runtime, _runtime = _runtime, None
+    if runtime:
+        runtime.shutdown()
@@ -4,7 +4,6 @@
 """
 
 import asyncio
-import os
 from dotenv import load_dotenv
 
 # 加载环境变量
@@ -23,18 +22,13 @@ async def main():
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION}")
     print("=" * 60)
 
-    # 检查API密钥
-    if not settings.ZHIPUAI_API_KEY or settings.ZHIPUAI_API_KEY == "your_api_key_here":
-        print("❌ 错误: 请在 .env 文件中设置 ZHIPUAI_API_KEY")
+    # 初始化服务（未配置 AI 密钥时报错）
+    try:
+        ai_service = AISummaryService.from_settings(settings)
+    except ValueError as e:
+        print(f"❌ 错误: {e}")
         print("   可以复制 .env.example 为 .env 并填入你的API密钥")
         return
-
-    # 初始化服务
-    ai_service = AISummaryService(
-        api_key=settings.ZHIPUAI_API_KEY,
-        base_url=settings.ZHIPUAI_BASE_URL,
-        model=settings.ZHIPUAI_MODEL
-    )
     news_service = NewsService(ai_service)
 
     # 生成早报
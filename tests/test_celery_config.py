@@ -0,0 +1,47 @@
+"""
+调度表测试：配置错误抛出 ValueError，beat 退回默认调度
+
+运行：python -m unittest tests.test_celery_config
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from config import celery_config
+
+
+def make_settings(table):
+    return SimpleNamespace(SCHEDULE_TABLE=table, SCHEDULE_CRONTAB="0 8 * * *", INGESTION_ENABLED=False,
+                           INGESTION_INTERVAL=300, BRIEFING_DISTRIBUTED=False)
+
+
+class ScheduleTableTest(unittest.TestCase):
+    def test_invalid_entries_raise_value_error(self):
+        tables = [
+            '["x"]',
+            '[{"type": "briefing", "interval": "60"}]',
+            '[{"type": "briefing", "crontab": 8}]',
+            '[{"type": "briefing", "interval": 60, "expires": "1h"}]',
+            '[{"type": "ingest", "interval": 60, "sources": "aibase"}]',
+        ]
+        for table in tables:
+            with self.subTest(table=table), self.assertRaises(ValueError):
+                celery_config.parse_schedule_table(make_settings(table))
+
+    def test_valid_table(self):
+        schedule = celery_config.parse_schedule_table(make_settings(
+            '[{"type": "ingest", "interval": 120, "sources": ["aibase"], "limit": 10}]'))
+        entry = schedule["ingest-1"]
+        self.assertEqual(entry["kwargs"], {"sources": ["aibase"], "limit": 10})
+        self.assertEqual(entry["options"]["expires"], 120)
+
+    def test_invalid_table_falls_back_to_default_schedule(self):
+        with mock.patch.object(celery_config, "get_settings", return_value=make_settings('["x"]')), \
+                mock.patch("builtins.print"):
+            schedule = celery_config.get_beat_schedule()
+        self.assertIn("generate-daily-briefing", schedule)
+
+
+if __name__ == "__main__":
+    unittest.main()
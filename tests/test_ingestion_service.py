@@ -0,0 +1,104 @@
+"""
+持续采集服务测试：总结失败的文章在后续轮询中重新请求大模型
+
+运行：python -m unittest tests.test_ingestion_service
+"""
+
+import asyncio
+import unittest
+
+from core.models import Article, ArticleStatus, SourceType
+from services.ingestion_service import IngestionService
+
+URLS = ["https://example.com/a", "https://example.com/b"]
+
+
+class FakeAdapter:
+    async def fetch_article_list(self, limit):
+        return URLS[:limit]
+
+    async def fetch_article(self, url):
+        return Article(title=url, content="正文", source_url=url, source_type=SourceType.AIBASE)
+
+
+class FakeAdapterFactory:
+    def get_adapter(self, source):
+        return FakeAdapter()
+
+
+class FakeRepo:
+    """内存中的数据访问层，只实现轮询用到的方法"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def get_articles_by_urls(self, urls):
+        return [dict(self.rows[url]) for url in urls if url in self.rows]
+
+    def save_article(self, article):
+        row = self.rows.setdefault(article.source_url, {"summary_attempts": 0})
+        row.update(article.to_dict(), id=article.source_url)
+        return article.source_url
+
+    def record_summary_failures(self, article_ids):
+        for article_id in article_ids:
+            self.rows[article_id]["status"] = ArticleStatus.FAILED.value
+            self.rows[article_id]["summary_attempts"] += 1
+        return len(article_ids)
+
+
+class FakeAIService:
+    """available 为 False 时模拟大模型失败（与 batch_generate_summaries 一致：写入本地摘要兜底，状态不变）"""
+
+    def __init__(self):
+        self.available = False
+        self.llm_calls = 0
+
+    async def batch_generate_summaries(self, articles, on_summary=None):
+        for article in articles:
+            if article.summary:
+                continue
+            self.llm_calls += 1
+            if self.available:
+                article.summary = "大模型总结"
+                article.status = ArticleStatus.COMPLETED
+            else:
+                article.summary = "本地摘要"
+            if on_summary:
+                await on_summary(article)
+        return articles
+
+
+class IngestionRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = FakeRepo()
+        self.ai = FakeAIService()
+        self.service = IngestionService(self.ai, self.repo, max_summary_attempts=3,
+                                        adapter_factory=FakeAdapterFactory())
+
+    def poll(self):
+        return asyncio.run(self.service.poll(limit=len(URLS)))
+
+    def test_failed_article_is_resummarized_by_llm(self):
+        self.poll()
+        self.assertEqual(self.ai.llm_calls, 2)
+        self.assertTrue(all(row["status"] == ArticleStatus.FAILED.value for row in self.repo.rows.values()))
+
+        self.ai.available = True
+        result = self.poll()
+        self.assertEqual(self.ai.llm_calls, 4)
+        self.assertEqual(result["summarized"], 2)
+        for row in self.repo.rows.values():
+            self.assertEqual(row["status"], ArticleStatus.COMPLETED.value)
+            self.assertEqual(row["summary"], "大模型总结")
+
+    def test_retries_stop_after_max_attempts(self):
+        for _ in range(5):
+            self.poll()
+        # 每次重试都请求了大模型，失败 3 次后不再重试
+        self.assertEqual(self.ai.llm_calls, 2 * 3)
+        self.assertTrue(all(row["summary_attempts"] == 3 for row in self.repo.rows.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
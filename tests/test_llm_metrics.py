@@ -0,0 +1,43 @@
+"""
+大模型调用统计测试：合并多份统计
+
+运行：python -m unittest tests.test_llm_metrics
+"""
+
+import unittest
+
+from services.llm_metrics import LLMUsageTracker, merge_usage, merge_provider_usage
+
+
+def usage(provider, latency, cost):
+    tracker = LLMUsageTracker()
+    tracker.record(provider, f"{provider}-model", "summary", "success", latency,
+                   prompt_tokens=100, completion_tokens=20, cost=cost)
+    return tracker.summary()
+
+
+class MergeUsageTest(unittest.TestCase):
+    def test_merge_sums_counts_and_weights_latency(self):
+        summaries = [usage("zhipu", 1.0, 0.01), usage("zhipu", 3.0, 0.02), usage("deepseek", 8.0, 0.1)]
+        merged = merge_usage(summaries)
+        self.assertEqual(merged["calls"], 3)
+        self.assertEqual(merged["total_tokens"], 360)
+        self.assertAlmostEqual(merged["cost"], 0.13)
+        self.assertEqual(merged["latency_avg_ms"], 4000.0)
+        self.assertEqual(merged["latency_max_ms"], 8000.0)
+        self.assertEqual(merged["latency_p50_ms"], 5000.0)
+        self.assertEqual(merged["outcomes"], {"success": 3})
+
+        providers = merge_provider_usage(summaries)
+        self.assertEqual(providers["zhipu"]["calls"], 2)
+        self.assertEqual(providers["deepseek"]["model"], "deepseek-model")
+
+    def test_merge_empty(self):
+        merged = merge_usage([])
+        self.assertEqual(merged["calls"], 0)
+        self.assertIsNone(merged["latency_avg_ms"])
+        self.assertEqual(merged["failure_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+日期处理工具
+"""
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+# 绝对日期：2026-01-14、2026/1/14、2026.01.14、2026年1月14日
+_ABSOLUTE_DATE_PATTERN = re.compile(r'(\d{4})\s*[-/.年]\s*(\d{1,2})\s*[-/.月]\s*(\d{1,2})')
+
+# 相对时间：3 分钟前、2 小时前、1 天前
+_RELATIVE_DATE_PATTERN = re.compile(r'(\d+)\s*(秒|分钟|小时|天|周)前')
+
+_RELATIVE_UNITS = {
+    "秒": timedelta(seconds=1),
+    "分钟": timedelta(minutes=1),
+    "小时": timedelta(hours=1),
+    "天": timedelta(days=1),
+    "周": timedelta(weeks=1),
+}
+
+
+def parse_publication_date(text: Optional[str], now: Optional[datetime] = None) -> Optional[str]:
+    """
+    把页面上的发布时间文本解析为日期（YYYY-MM-DD）
+
+    支持绝对日期以及「刚刚 / N 分钟前 / 昨天」等相对时间（相对于 now，默认为当前时间）
+
+    Returns:
+        日期字符串，无法解析时返回 None
+    """
+    if not text:
+        return None
+    now = now or datetime.now()
+
+    match = _ABSOLUTE_DATE_PATTERN.search(text)
+    if match:
+        try:
+            return datetime(*(int(part) for part in match.groups())).strftime("%Y-%m-%d")
+        except ValueError:
+            return None
+
+    match = _RELATIVE_DATE_PATTERN.search(text)
+    if match:
+        return (now - int(match.group(1)) * _RELATIVE_UNITS[match.group(2)]).strftime("%Y-%m-%d")
+    if "刚刚" in text or "今天" in text:
+        return now.strftime("%Y-%m-%d")
+    if "前天" in text:
+        return (now - timedelta(days=2)).strftime("%Y-%m-%d")
+    if "昨天" in text:
+        return (now - timedelta(days=1)).strftime("%Y-%m-%d")
+    return None
+
+
+def date_range(start_date: str, end_date: str) -> List[str]:
+    """返回 [start_date, end_date] 内的所有日期（YYYY-MM-DD，含两端）"""
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
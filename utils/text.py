@@ -0,0 +1,60 @@
+"""
+文本处理工具
+"""
+import re
+from typing import List
+
+# 中日韩统一表意文字及全角标点
+_CJK_PATTERN = re.compile(r'[　-〿㐀-䶿一-鿿豈-﫿＀-￯]')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算文本的 token 数
+
+    中文等 CJK 字符按约 1 token/字 计算，其余字符按约 4 字符/token 计算
+    """
+    if not text:
+        return 0
+    cjk_count = len(_CJK_PATTERN.findall(text))
+    other_count = len(text) - cjk_count
+    return cjk_count + (other_count + 3) // 4
+
+
+# 句子结束符：中文标点直接切分，英文句点/问号/感叹号需后接空白
+_SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[。！？；!?;])|(?<=[.])(?=\s)|\n+')
+
+# 分词：连续的 CJK 字符段，或连续的字母数字段
+_TOKEN_PATTERN = re.compile(r'[㐀-䶿一-鿿豈-﫿]+|[A-Za-z0-9]+')
+
+
+def split_sentences(text: str, min_length: int = 4) -> List[str]:
+    """
+    按中英文标点切分句子
+
+    Args:
+        text: 原文
+        min_length: 过滤掉短于该长度的片段（如孤立的标点、编号）
+    """
+    if not text:
+        return []
+    sentences = [s.strip() for s in _SENTENCE_SPLIT_PATTERN.split(text)]
+    return [s for s in sentences if len(s) >= min_length]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    CJK 友好的分词
+
+    中文等 CJK 字符段切分为重叠的二元组（单字段保留单字），字母数字段转为小写单词
+    """
+    tokens = []
+    for segment in _TOKEN_PATTERN.findall(text or ""):
+        if _CJK_PATTERN.match(segment):
+            if len(segment) == 1:
+                tokens.append(segment)
+            else:
+                tokens.extend(segment[i:i + 2] for i in range(len(segment) - 1))
+        else:
+            tokens.append(segment.lower())
+    return tokens